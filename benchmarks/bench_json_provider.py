@@ -0,0 +1,110 @@
+"""
+Benchmark for encoding GET /v1/jobs responses.
+
+Dumps 100 to 5,000 jobs with 12 members each through JobResponseSchema, as the route does, then
+compares the time to turn the dumped list into a response with:
+ - json: Flask's DefaultJSONProvider (the json module)
+ - orjson: src.json_provider.OrjsonProvider
+
+The schema dump is timed too, for scale, and each time is the best of a few runs.
+No database is needed, the jobs are built in memory.
+
+Run from the project root:
+    python -m benchmarks.bench_json_provider
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import datetime
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from uuid import uuid4
+
+from src.api.models import JobModel, MemberJobModel, MemberModel, RankModel # type: ignore
+from src.api.schemas import JobResponseSchema
+from src.json_provider import OrjsonProvider, orjson
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+JOB_COUNTS = [100, 1_000, 5_000]
+ROSTER = 12
+REPEATS = 5
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def build_jobs(count):
+    """
+    Return `count` jobs with a full roster each, as the route would load them.
+    """
+    ranks = [RankModel(id=uuid4(), name=f"Rank {i}", position=i + 1, share=1.0) for i in range(4)]
+    members = [MemberModel(id=uuid4(), name=f"Member {i}", rank=ranks[i % len(ranks)]) for i in range(ROSTER * 4)]
+    jobs = []
+    for i in range(count):
+        job = JobModel(
+            id=uuid4(),
+            job_name=f"Job {i}",
+            job_description="For Stromgarde, collecting horns for bounty",
+            start_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 365),
+            total_silver=1_000,
+            company_cut_amt=100,
+            remainder_after_payouts=4,
+        )
+        job.members_on_job = [
+            MemberJobModel(member_id=member.id, member=member, member_rank=member.rank.name, member_pay=75)
+            for member in members[i % 4::4][:ROSTER]
+        ]
+        jobs.append(job)
+    return jobs
+
+
+def best_of(function):
+    """
+    Return the fastest of REPEATS runs of function in ms, and its result.
+    """
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    if orjson is None:
+        print("orjson is not installed, install it to compare (uv sync --extra fast)")
+        return
+
+    app = Flask(__name__)
+    providers = {"json": DefaultJSONProvider(app), "orjson": OrjsonProvider(app)}
+
+    print(f"{'jobs':>6} {'dump ms':>9} {'json ms':>9} {'orjson ms':>10} {'speedup':>8} {'body KB':>8}")
+    for count in JOB_COUNTS:
+        jobs = build_jobs(count)
+        dump_ms, data = best_of(lambda: JobResponseSchema(many=True).dump(jobs))
+        json_ms, expected = best_of(lambda: providers["json"].response(data))
+        orjson_ms, response = best_of(lambda: providers["orjson"].response(data))
+        assert response.data == expected.data # everything here is ASCII, so the bodies are the same
+        print(f"{count:>6} {dump_ms:9.1f} {json_ms:9.1f} {orjson_ms:10.1f} {json_ms / orjson_ms:7.1f}x {len(response.data) / 1024:8.0f}")
+
+
+###################################################################################################
+#  Entry point
+###################################################################################################
+
+if __name__ == "__main__":
+    main()
+
+
+###################################################################################################
+#  End of file
+###################################################################################################
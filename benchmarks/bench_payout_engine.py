@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for the payout engine (src/payout_engine.py).
+
+Times a single job's payout for rosters from 5 to 50,000 members with:
+ - legacy: the old per member float multiply + Decimal rounding the route used to do
+ - python: the engine's plain python integer kernel
+ - numpy: the engine's NumPy integer kernel (skipped if NumPy isn't installed)
+
+Run from the project root:
+    python -m benchmarks.bench_payout_engine
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import random
+import timeit
+
+from decimal import Decimal, ROUND_DOWN
+
+from src import payout_engine
+from src.payout_engine import calculate_payouts
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+ROSTER_SIZES = [5, 50, 500, 5_000, 50_000]
+SHARES = [1.0, 1.0, 0.75, 0.5] # the spread of shares in our ranks
+COMPANY_CUT = 0.1
+TOTAL_SILVER = 1_000_000
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def legacy_payout(total, shares, company_cut):
+    """
+    The calculation as it was done in JobWithPaymentsById.get before the engine existed.
+    """
+    cut = total * company_cut
+    value_per_share = (total - cut) / sum(shares)
+    pays = [int(Decimal(share * value_per_share).to_integral_value(rounding=ROUND_DOWN)) for share in shares]
+    return cut, pays, total - cut - sum(pays)
+
+
+def time_call(func, repeat=5):
+    """
+    Return the best time per call in microseconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1_000_000
+
+
+def main():
+    random.seed(42)
+    print(f"{'members':>8} {'legacy µs':>12} {'python µs':>12} {'numpy µs':>12}")
+
+    for size in ROSTER_SIZES:
+        shares = [random.choice(SHARES) for _ in range(size)]
+        job_index = [0] * size
+
+        legacy = time_call(lambda: legacy_payout(TOTAL_SILVER, shares, COMPANY_CUT))
+        python = time_call(lambda: calculate_payouts([TOTAL_SILVER], shares, job_index, COMPANY_CUT, use_numpy=False))
+        if payout_engine.np is not None:
+            numpy = time_call(lambda: calculate_payouts([TOTAL_SILVER], shares, job_index, COMPANY_CUT, use_numpy=True))
+            numpy_col = f"{numpy:12.1f}"
+        else:
+            numpy_col = f"{'n/a':>12}"
+
+        print(f"{size:>8} {legacy:12.1f} {python:12.1f} {numpy_col}")
+
+
+###################################################################################################
+#  Entry point
+###################################################################################################
+
+if __name__ == "__main__":
+    main()
+
+
+###################################################################################################
+#  End of file
+###################################################################################################
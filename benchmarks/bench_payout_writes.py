@@ -0,0 +1,130 @@
+"""
+Benchmark for writing a job's payouts to the db.
+
+Compares, for rosters of 10 to 5,000 members:
+ - orm: the old path, setting member_pay on each MemberJobModel and letting the flush send an UPDATE per member
+ - unnest: store_payouts, one UPDATE ... FROM unnest(<arrays>) for all of the members
+
+and reports the statements the db receives (an executemany counts once per row, as that's
+what psycopg2 sends) and the time taken.
+
+It needs a database: the app is created with the config named by FLASK_ENV (default development),
+everything runs inside a transaction that is rolled back at the end, so nothing is kept.
+
+Run from the project root:
+    python -m benchmarks.bench_payout_writes
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import os
+import time
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker, scoped_session
+from uuid import uuid4
+
+from src import create_app
+from src.api.models import JobModel, MemberJobModel, MemberModel, RankModel # type: ignore
+from src.api.payments import store_payouts
+from src.extensions import db
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+ROSTER_SIZES = [10, 100, 1_000, 5_000]
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def seed_job(size):
+    """
+    Insert a rank, a job and `size` members on it, returning the job id.
+    """
+    rank_id, job_id = uuid4(), uuid4()
+    db.session.execute(insert(RankModel).values(id=rank_id, name=f"bench-{rank_id.hex[:8]}", position=10_000 + size, share=1.0))
+    db.session.execute(insert(JobModel).values(id=job_id, job_name="bench", total_silver=1_000_000))
+
+    member_ids = [uuid4() for _ in range(size)]
+    db.session.execute(insert(MemberModel), [
+        {"id": member_id, "name": f"bench-{member_id}", "rank_id": rank_id, "active": True}
+        for member_id in member_ids
+    ])
+    db.session.execute(insert(MemberJobModel), [
+        {"job_id": job_id, "member_id": member_id, "member_rank": "bench"}
+        for member_id in member_ids
+    ])
+    db.session.flush()
+    return job_id
+
+
+def write_orm(job):
+    for jm in job.members_on_job:
+        jm.member_pay = 7
+    job.company_cut_amt = 1
+    job.remainder_after_payouts = 2
+    db.session.flush()
+
+
+def write_unnest(job):
+    store_payouts(
+        job_rows=[(job.id, 1, 2, None)],
+        member_rows=[(job.id, jm.member_id, 7) for jm in job.members_on_job],
+    )
+
+
+def measure(connection, write, job):
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += len(parameters) if executemany else 1
+
+    event.listen(connection, "before_cursor_execute", count)
+    start = time.perf_counter()
+    write(job)
+    elapsed = time.perf_counter() - start
+    event.remove(connection, "before_cursor_execute", count)
+    return statements, elapsed * 1000
+
+
+def main():
+    app = create_app(os.getenv("FLASK_ENV", "development"))
+
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        db.session = scoped_session(sessionmaker(bind=connection))
+
+        print(f"{'members':>8} {'orm stmts':>10} {'orm ms':>9} {'unnest stmts':>13} {'unnest ms':>10}")
+        try:
+            for size in ROSTER_SIZES:
+                job_id = seed_job(size)
+                job = db.session.get(JobModel, job_id)
+                job.members_on_job # load the roster before timing either path
+
+                orm = measure(connection, write_orm, job)
+                unnest = measure(connection, write_unnest, job)
+                print(f"{size:>8} {orm[0]:>10} {orm[1]:9.1f} {unnest[0]:>13} {unnest[1]:10.1f}")
+        finally:
+            transaction.rollback()
+            connection.close()
+
+
+###################################################################################################
+#  Entry point
+###################################################################################################
+
+if __name__ == "__main__":
+    main()
+
+
+###################################################################################################
+#  End of file
+###################################################################################################
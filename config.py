@@ -44,6 +44,13 @@ class BaseConfig:
     SQLALCHEMY_DATABASE_URI = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    ## API Config
+    # build the JSON for GET /v1/jobs and GET /v1/job/<id> in Postgres rather than through JobResponseSchema
+    # see src/api/job_json.py
+    JOB_JSON_FROM_SQL = os.getenv("JOB_JSON_FROM_SQL", "false").lower() == "true"
+    # orjson (when installed) or json, the module that encodes responses, see src/json_provider.py
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
 class TestingConfig(BaseConfig):
     """
     Testing configuration settings.
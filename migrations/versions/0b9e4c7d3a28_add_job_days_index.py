@@ -0,0 +1,36 @@
+"""Add job days range index
+
+Revision ID: 0b9e4c7d3a28
+Revises: f8a3d61b2c95
+Create Date: 2026-10-18 15:48:02.617730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b9e4c7d3a28'
+down_revision = 'f8a3d61b2c95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # must be the same expression as models.job_days or the planner won't use it
+    # CONCURRENTLY so jobs can still be written while it builds, see f8a3d61b2c95
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_days',
+            'job',
+            [sa.text("daterange(start_date, GREATEST(start_date, end_date), '[]')")],
+            unique=False,
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_job_days', table_name='job', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Make rank position unique constraint deferrable
+
+Revision ID: e2b7c5a9d013
+Revises: c6d1e8a2f4b7
+Create Date: 2026-10-18 14:22:37.915204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c5a9d013'
+down_revision = 'c6d1e8a2f4b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # a constraint can't be altered to DEFERRABLE, it has to be recreated
+    # INITIALLY IMMEDIATE keeps it checked at the end of every statement, PUT /ranks/order relies on
+    # that to rewrite every position in one UPDATE
+    with op.batch_alter_table('ranks', schema=None) as batch_op:
+        batch_op.drop_constraint('ranks_position_key', type_='unique')
+        batch_op.create_unique_constraint('ranks_position_key', ['position'], deferrable=True, initially='IMMEDIATE')
+
+
+def downgrade():
+    with op.batch_alter_table('ranks', schema=None) as batch_op:
+        batch_op.drop_constraint('ranks_position_key', type_='unique')
+        batch_op.create_unique_constraint('ranks_position_key', ['position'])
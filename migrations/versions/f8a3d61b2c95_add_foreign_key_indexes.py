@@ -0,0 +1,34 @@
+"""Add indexes on members.rank_id and member_job.job_id
+
+Revision ID: f8a3d61b2c95
+Revises: e2b7c5a9d013
+Create Date: 2026-10-18 15:05:48.371026
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a3d61b2c95'
+down_revision = 'e2b7c5a9d013'
+branch_labels = None
+depends_on = None
+
+# member_job.member_id is already covered by the (member_id, job_id) primary key and
+# job.start_date by ix_job_start_date_id, these are the foreign keys nothing indexes yet
+
+
+def upgrade():
+    # CONCURRENTLY so members and member_job can still be written while the indexes build,
+    # it can't run inside a transaction, so these run in an autocommit block
+    # if a build fails it leaves an INVALID index behind, drop it and run the upgrade again
+    with op.get_context().autocommit_block():
+        op.create_index('ix_members_rank_id', 'members', ['rank_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_member_job_job_id', 'member_job', ['job_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_member_job_job_id', table_name='member_job', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_members_rank_id', table_name='members', postgresql_concurrently=True, if_exists=True)
@@ -17,9 +17,12 @@ from flask_smorest import Api # type: ignore
 # from logging.handlers import RotatingFileHandler # used if we want to log to file
 
 from config import config
+from src.commands import members_cli, payments_cli
 from src.extensions import db
+from src.json_provider import create_json_provider
 from .api.v1.job_routes import blp as JobBlueprint
 from .api.v1.member_routes import blp as MemberBlueprint
+from .api.v1.payout_routes import blp as PayoutBlueprint
 from .api.v1.rank_routes import blp as RankBlueprint
 
 ###################################################################################################
@@ -29,7 +32,13 @@ from .api.v1.rank_routes import blp as RankBlueprint
 def register_blueprints(api):
     api.register_blueprint(JobBlueprint)
     api.register_blueprint(MemberBlueprint)
+    api.register_blueprint(PayoutBlueprint)
     api.register_blueprint(RankBlueprint)
+
+
+def register_commands(app):
+    app.cli.add_command(members_cli)
+    app.cli.add_command(payments_cli)
     
 
 ###################################################################################################
@@ -72,12 +81,16 @@ def create_app(config_name):
     ## only use in development debugging and never in production
     # app.logger.debug(f"Config settings: {vars(config[config_name])}")
 
+    # encode responses with orjson when it's installed, see src/json_provider.py
+    app.json = create_json_provider(app)
+
     # initialise and connect Flask app to SQLAlchemy
     db.init_app(app) 
     migrate = Migrate(app, db)
     api = Api(app)
 
     register_blueprints(api)
+    register_commands(app)
     app.logger.info("---------- create_app finished ----------")
     app.logger.info("Swagger UI available at http://localhost:5000/api/swagger-ui")
     app.logger.info(f"App running in {config_name} mode")
@@ -0,0 +1,116 @@
+"""
+Database side of the payout export.
+
+The rows are read through a server-side cursor a batch at a time and turned into text as they
+arrive, so GET /v1/payouts/export holds one batch in memory however long the date range is.
+No ORM objects are built, each row is a plain tuple of the columns below.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from src.api.models import JobModel, MemberJobModel, MemberModel # type: ignore
+from src.extensions import db
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+EXPORT_COLUMNS = ["job_id", "job_name", "start_date", "member_id", "member_name", "member_rank", "member_pay"]
+YIELD_PER = 1000 # rows fetched from the server-side cursor at a time
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def select_payouts(date_from=None, date_to=None):
+    """
+    Return the query for every stored member payout on jobs starting in the range (inclusive).
+
+    member_rank is the rank the member held on the job, not their current one.
+    Members whose pay hasn't been calculated yet are left out.
+    """
+    query = (
+        select(
+            JobModel.id.label("job_id"),
+            JobModel.job_name,
+            JobModel.start_date,
+            MemberJobModel.member_id,
+            MemberModel.name.label("member_name"),
+            MemberJobModel.member_rank,
+            MemberJobModel.member_pay,
+        )
+        .join(MemberJobModel, MemberJobModel.job_id == JobModel.id)
+        .join(MemberModel, MemberModel.id == MemberJobModel.member_id)
+        .where(MemberJobModel.member_pay.is_not(None))
+        .order_by(JobModel.start_date, JobModel.job_name, JobModel.id, MemberModel.name)
+    )
+    if date_from is not None:
+        query = query.where(JobModel.start_date >= date_from)
+    if date_to is not None:
+        query = query.where(JobModel.start_date <= date_to)
+    return query
+
+
+def stream_payouts(date_from=None, date_to=None):
+    """
+    Yield the rows of select_payouts in lists of up to YIELD_PER rows.
+    """
+    # yield_per makes psycopg2 use a named (server-side) cursor instead of fetching every row up front
+    result = db.session.execute(select_payouts(date_from, date_to), execution_options={"yield_per": YIELD_PER})
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def to_csv(batches):
+    """
+    Yield a CSV header, then one chunk of CSV text per batch of rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # the header on its own when there are no rows
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def to_ndjson(batches):
+    """
+    Yield one chunk of newline delimited JSON (a JSON object per row) per batch of rows.
+    """
+    for batch in batches:
+        yield "".join(
+            json.dumps({
+                "job_id": str(row.job_id),
+                "job_name": row.job_name,
+                "start_date": row.start_date.isoformat(),
+                "member_id": str(row.member_id),
+                "member_name": row.member_name,
+                "member_rank": row.member_rank,
+                "member_pay": row.member_pay,
+            }) + "\n"
+            for row in batch
+        )
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
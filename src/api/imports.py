@@ -0,0 +1,281 @@
+"""
+Database side of the bulk imports (POST /v1/jobs/import and POST /v1/members/import).
+
+The rows are validated in python and every lookup the validation needs is made once for the
+whole upload, so however many rows are imported it's a fixed handful of statements and one
+commit, where POSTing them one at a time costs a request and a commit per row.
+ - jobs and their rosters are streamed into temporary staging tables with COPY and merged into
+   job and member_job with one INSERT ... SELECT each
+ - members are inserted with one INSERT ... ON CONFLICT (name) DO NOTHING
+
+Rows that fail validation are reported back with their row number and the rest are imported.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import csv
+import io
+import json
+
+from uuid import UUID
+
+from marshmallow import ValidationError # type: ignore
+from sqlalchemy import any_, cast, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+
+from constants import DEFAULT_RANK # type: ignore
+from src.api.models import MemberModel # type: ignore
+from src.api.payments import enqueue_recalculation, refresh_member_earnings
+from src.api.rank_cache import get_ranks
+from src.api.schemas import JobImportSchema, MemberImportSchema
+from src.extensions import db
+from src.ids import uuid7
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+}
+CSV_MEMBER_SEPARATOR = ";" # the members column of a CSV holds the member ids separated by this
+
+JOB_COLUMNS = ["id", "job_name", "job_description", "start_date", "end_date", "total_silver"]
+ROSTER_COLUMNS = ["job_id", "member_id"]
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def read_rows(body, import_format):
+    """
+    Yield (row_number, data, error) for each row of an NDJSON or CSV body, numbered from 1.
+    data is a dict for the schema, or None with a message in error if the row can't be read.
+    """
+    if import_format == "ndjson":
+        yield from _read_ndjson(body)
+    else:
+        yield from _read_csv(body)
+
+
+def _read_ndjson(body):
+    for row_number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            yield row_number, None, "Invalid JSON."
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, "Each line must be a JSON object."
+            continue
+        yield row_number, data, None
+
+
+def _read_csv(body):
+    for row_number, row in enumerate(csv.DictReader(io.StringIO(body)), start=1):
+        if None in row:
+            yield row_number, None, "Row has more values than the header."
+            continue
+        # empty cells are missing values, as if the key was left out of the JSON
+        data = {key: value for key, value in row.items() if value not in ("", None)}
+        if "members" in data:
+            data["members"] = [member.strip() for member in data["members"].split(CSV_MEMBER_SEPARATOR) if member.strip()]
+        yield row_number, data, None
+
+
+def validate_jobs(rows):
+    """
+    Validate rows from read_rows.
+
+    Returns (jobs, errors):
+     - jobs: a dict per valid job with a new id and its (de-duplicated) members
+     - errors: {"row": row_number, "errors": {field: [messages]}} per invalid row
+
+    The job fields are checked with the same rules as POST /job. Every member in the batch is
+    looked up in one query: a row with a member that doesn't exist, or still has the DEFAULT rank,
+    is rejected as PATCH add_members would reject it.
+    """
+    schema = JobImportSchema()
+    loaded = []
+    errors = []
+    for row_number, data, error in rows:
+        if error is not None:
+            errors.append({"row": row_number, "errors": {"_schema": [error]}})
+            continue
+        try:
+            loaded.append((row_number, schema.load(data)))
+        except ValidationError as e:
+            errors.append({"row": row_number, "errors": e.messages})
+
+    member_ids = {member_id for _, job in loaded for member_id in job["members"]}
+    found = {
+        member.id: member
+        for member in db.session.execute(
+            select(MemberModel.id, MemberModel.name, MemberModel.rank_id).where(MemberModel.id.in_(list(member_ids)))
+        )
+    } if member_ids else {}
+
+    jobs = []
+    for row_number, job in loaded:
+        members = list(dict.fromkeys(job.pop("members")))
+        member_errors = []
+        for member_id in members:
+            member = found.get(member_id)
+            if member is None:
+                member_errors.append(f"Member {member_id} not found")
+            elif member.rank_id == DEFAULT_RANK["id"]:
+                member_errors.append(f"Member {member.name} ({member.id}) has DEFAULT rank, you must update them before adding to a job")
+        if member_errors:
+            errors.append({"row": row_number, "errors": {"members": member_errors}})
+            continue
+
+        jobs.append({**job, "id": uuid7(), "members": members})
+
+    errors.sort(key=lambda error: error["row"])
+    return jobs, errors
+
+
+def import_jobs(jobs):
+    """
+    Insert validated jobs (from validate_jobs) and their rosters, without committing.
+
+    The rows are COPYed into temporary staging tables and merged with INSERT ... SELECT, the
+    member_rank of each roster row is filled from the member's current rank in the same statement.
+    Members' earnings are refreshed and jobs with a roster are queued for the payments worker.
+    """
+    if not jobs:
+        return
+
+    db.session.execute(text("CREATE TEMPORARY TABLE job_import (LIKE job INCLUDING DEFAULTS) ON COMMIT DROP"))
+    db.session.execute(text("CREATE TEMPORARY TABLE member_job_import (job_id uuid NOT NULL, member_id uuid NOT NULL) ON COMMIT DROP"))
+
+    # COPY isn't available through SQLAlchemy, use the DBAPI (psycopg2) cursor of the session's connection
+    cursor = db.session.connection().connection.dbapi_connection.cursor()
+    try:
+        _copy(cursor, "job_import", JOB_COLUMNS, ([job.get(column) for column in JOB_COLUMNS] for job in jobs))
+        _copy(cursor, "member_job_import", ROSTER_COLUMNS, ((job["id"], member_id) for job in jobs for member_id in job["members"]))
+    finally:
+        cursor.close()
+
+    columns = ", ".join(JOB_COLUMNS)
+    db.session.execute(text(f"INSERT INTO job ({columns}) SELECT {columns} FROM job_import"))
+    db.session.execute(text("""
+        INSERT INTO member_job (member_id, job_id, member_rank)
+        SELECT member_job_import.member_id, member_job_import.job_id, ranks.name
+        FROM member_job_import
+        JOIN members ON members.id = member_job_import.member_id
+        JOIN ranks ON ranks.id = members.rank_id
+    """))
+    db.session.execute(text("DROP TABLE job_import, member_job_import"))
+
+    refresh_member_earnings([member_id for job in jobs for member_id in job["members"]])
+    enqueue_recalculation([job["id"] for job in jobs if job["members"]])
+
+
+def validate_members(rows):
+    """
+    Validate rows from read_rows.
+
+    Returns (members, errors):
+     - members: a dict per valid member, with the row number and the rank resolved to rank_id
+     - errors: {"row": row_number, "errors": {field: [messages]}} per invalid row
+
+    Each row's rank is matched by name or id against the rank cache. The names are checked
+    against the members table in one query, and a name repeated in the upload is only taken once.
+    """
+    schema = MemberImportSchema()
+    loaded = []
+    errors = []
+    for row_number, data, error in rows:
+        if error is not None:
+            errors.append({"row": row_number, "errors": {"_schema": [error]}})
+            continue
+        try:
+            loaded.append((row_number, schema.load(data)))
+        except ValidationError as e:
+            errors.append({"row": row_number, "errors": e.messages})
+
+    ranks = get_ranks()
+
+    names = [member["name"] for _, member in loaded]
+    taken = set(db.session.scalars(
+        select(MemberModel.name).where(MemberModel.name == any_(cast(names, ARRAY(MemberModel.name.type))))
+    )) if names else set()
+
+    members = []
+    first_row = {}
+    for row_number, member in loaded:
+        rank = member.pop("rank")
+        cached = ranks.by_name.get(rank) or ranks.by_id.get(_as_uuid(rank))
+        member_errors = {}
+        if cached is None:
+            member_errors["rank"] = [f"Rank {rank} does not exist"]
+        if member["name"] in taken:
+            member_errors["name"] = [f"There is already a member with name {member['name']}."]
+        elif member["name"] in first_row:
+            member_errors["name"] = [f"Name {member['name']} is already used on row {first_row[member['name']]}."]
+        if member_errors:
+            errors.append({"row": row_number, "errors": member_errors})
+            continue
+
+        first_row[member["name"]] = row_number
+        members.append({**member, "row": row_number, "id": uuid7(), "rank_id": cached.id})
+
+    errors.sort(key=lambda error: error["row"])
+    return members, errors
+
+
+def import_members(members):
+    """
+    Insert validated members (from validate_members) in one statement, without committing.
+
+    A name taken since validate_members checked it (by another import or POST /member) isn't an
+    IntegrityError, the row is skipped by ON CONFLICT and returned in the errors.
+    Returns (created, errors) in the shape of validate_members.
+    """
+    if not members:
+        return [], []
+
+    statement = pg_insert(MemberModel.__table__).values([
+        {"id": member["id"], "name": member["name"], "rank_id": member["rank_id"], "active": member.get("active", True)}
+        for member in members
+    ]).on_conflict_do_nothing(index_elements=["name"]).returning(MemberModel.id)
+    inserted = set(db.session.scalars(statement))
+
+    created = [member for member in members if member["id"] in inserted]
+    errors = [
+        {"row": member["row"], "errors": {"name": [f"There is already a member with name {member['name']}."]}}
+        for member in members if member["id"] not in inserted
+    ]
+    return created, errors
+
+
+def _as_uuid(value):
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+def _copy(cursor, table, columns, rows):
+    """
+    COPY rows (sequences of values in columns order) into table.
+    """
+    buffer = io.StringIO()
+    # QUOTE_NOTNULL leaves None as a bare empty value, which COPY reads as NULL,
+    # and quotes everything else so empty strings stay empty strings
+    csv.writer(buffer, quoting=csv.QUOTE_NOTNULL).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
@@ -0,0 +1,136 @@
+"""
+Job responses rendered as JSON by Postgres.
+
+GET /v1/jobs and GET /v1/job/<id> normally load JobModel, MemberJobModel, MemberModel and RankModel
+objects, dump them with JobResponseSchema and sort each roster in its post_dump. With
+JOB_JSON_FROM_SQL on, the query builds the same JSON text instead, one string per job with the
+members already in rank position then name order, and the route joins them into the response
+body without building any objects.
+
+The text has to be byte for byte what JobResponseSchema and the app's JSON provider produce
+(tests/routes/v1/test_job_json.py checks it), so:
+ - keys are in sorted order, as the provider writes them (sort_keys)
+ - it's compact, so it's built from to_json() of each value rather than with json_build_object
+   and json_agg, which put spaces and newlines in their output
+ - names sort with COLLATE "C" (code point order, as Python sorts them), not the db's collation
+ - non-ASCII characters are escaped afterwards when the provider escapes them (ensure_ascii)
+When the provider indents or doesn't sort keys (e.g. in debug mode) the routes use the schema.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import json
+import re
+
+from flask import current_app
+from sqlalchemy import Text, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from src.api.models import JobModel, MemberJobModel, MemberModel, RankModel # type: ignore
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+# what json.dumps escapes with ensure_ascii, DEL included, which Postgres leaves as it is
+NOT_ASCII = re.compile(r"[^\x00-\x7e]+")
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def sql_json_enabled():
+    """
+    Whether to render jobs in SQL: JOB_JSON_FROM_SQL is on and the JSON provider writes compact
+    JSON with sorted keys, the only form the SQL builds.
+    """
+    provider = current_app.json
+    compact = getattr(provider, "compact", None)
+    if compact is None:
+        compact = not current_app.debug # the default provider indents in debug mode
+    return bool(current_app.config.get("JOB_JSON_FROM_SQL")) and getattr(provider, "sort_keys", False) and compact
+
+
+def json_value(expression):
+    """
+    SQL for the JSON text of a single value, null included.
+    """
+    return func.coalesce(cast(func.to_json(expression), Text), "null")
+
+
+def json_object(values):
+    """
+    SQL for a compact JSON object from {key: SQL expression for the value's JSON text}, keys sorted.
+    """
+    parts = []
+    for key in sorted(values):
+        parts += [literal(("," if parts else "{") + json.dumps(key) + ":"), values[key]]
+    return func.concat(*parts, literal("}"))
+
+
+def members_json():
+    """
+    SQL for a job's members_on_job as MemberJobResponseSchema dumps them, correlated to JobModel.
+
+    Sorted as JobResponseSchema.sort_members sorts them: by their current rank's position, then name.
+    """
+    member = json_object({
+        "member_id": json_value(MemberJobModel.member_id),
+        "member_name": json_value(MemberModel.name),
+        "member_pay": json_value(MemberJobModel.member_pay),
+        "member_rank": json_value(MemberJobModel.member_rank),
+        "member_rank_position": json_value(RankModel.position),
+    })
+    members = func.string_agg(
+        member,
+        aggregate_order_by(literal_column("','"), RankModel.position, MemberModel.name.collate("C")),
+    )
+    return (
+        select(func.concat(literal("["), members, literal("]"))) # string_agg of no rows is null, which concat leaves out
+        .select_from(MemberJobModel)
+        .join(MemberModel, MemberModel.id == MemberJobModel.member_id)
+        .join(RankModel, RankModel.id == MemberModel.rank_id)
+        .where(MemberJobModel.job_id == JobModel.id)
+        .correlate(JobModel)
+        .scalar_subquery()
+    )
+
+
+def job_json():
+    """
+    SQL for the JSON text of a job as JobResponseSchema dumps it, select it with JobModel.
+    """
+    return json_object({
+        "company_cut_amt": json_value(JobModel.company_cut_amt),
+        "end_date": json_value(JobModel.end_date),
+        "id": json_value(JobModel.id),
+        "job_description": json_value(JobModel.job_description),
+        "job_name": json_value(JobModel.job_name),
+        "members_on_job": members_json(),
+        "remainder_after_payouts": json_value(JobModel.remainder_after_payouts),
+        "start_date": json_value(JobModel.start_date),
+        "total_silver": json_value(JobModel.total_silver),
+    })
+
+
+def json_response(body, headers=None):
+    """
+    Return a 200 response with JSON text from the db as its body, finished as the provider would.
+    """
+    if getattr(current_app.json, "ensure_ascii", False) and not body.isascii():
+        # non-ASCII can only be inside strings, so each run is escaped as json.dumps escapes it
+        body = NOT_ASCII.sub(lambda match: json.dumps(match.group())[1:-1], body)
+    return current_app.response_class(
+        (body + "\n").encode(),
+        mimetype=getattr(current_app.json, "mimetype", "application/json"),
+        headers=headers,
+    )
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
@@ -0,0 +1,106 @@
+"""
+Eager loading options derived from the response schemas.
+
+A schema field that reads through a relationship, e.g. member_rank_position with
+attribute="member.rank.position", makes marshmallow touch MemberJobModel.member and then
+MemberModel.rank on every row it dumps. Without eager loading each of those is a lazy load,
+so a list of 50 jobs with 20 members each costs over a thousand queries.
+
+eager_load walks a schema's fields (following Nested fields into their schemas) and returns
+the loader options that load every relationship the schema will read, up front:
+ - selectinload for collections (one extra query per level, and safe with LIMIT)
+ - joinedload for many-to-one (joined into the query that loads the parent)
+
+Usage:
+    JobModel.query.options(*eager_load(JobModel, JobResponseSchema))
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+from functools import lru_cache
+
+from marshmallow import Schema, fields # type: ignore
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def eager_load(model, schema):
+    """
+    Return the loader options for dumping instances of model with schema (a class or instance).
+    """
+    schema_class = schema if isinstance(schema, type) else type(schema)
+    return list(_eager_load(model, schema_class))
+
+
+@lru_cache(maxsize=None)
+def _eager_load(model, schema_class):
+    # the options only depend on the model and schema definitions, so work them out once
+    options = []
+    for path in _relationship_paths(inspect(model), schema_class()):
+        option = None
+        for relationship in path:
+            loader = selectinload if relationship.uselist else joinedload
+            attribute = relationship.class_attribute
+            option = loader(attribute) if option is None else getattr(option, loader.__name__)(attribute)
+        options.append(option)
+    return tuple(options)
+
+
+def _relationship_paths(mapper, schema):
+    """
+    Return the chains of relationships the schema reads, longest first, leaving out any chain
+    that is the start of a longer one (loading the longer one loads it too).
+    """
+    paths = set()
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+
+        # follow the dotted attribute through relationships, e.g. member.rank.position
+        parts = attribute.split(".")
+        path = []
+        current = mapper
+        for part in parts:
+            relationship = current.relationships.get(part)
+            if relationship is None:
+                break
+            path.append(relationship)
+            current = relationship.mapper
+
+        if not path:
+            continue
+
+        # a Nested field on a relationship reads whatever its own schema reads from the related rows
+        nested = _nested_schema(field)
+        if nested is not None and len(path) == len(parts):
+            for nested_path in _relationship_paths(current, nested) or [()]:
+                paths.add(tuple(path) + tuple(nested_path))
+        else:
+            paths.add(tuple(path))
+
+    return sorted(
+        (path for path in paths if not any(other[:len(path)] == path and other != path for other in paths)),
+        key=len,
+        reverse=True,
+    )
+
+
+def _nested_schema(field):
+    """
+    Return the schema of a Nested field, or a List of Nested, else None.
+    """
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested) and isinstance(field.schema, Schema):
+        return field.schema
+    return None
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
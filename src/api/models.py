@@ -9,10 +9,10 @@ SQLAlchemy models for the API.
 ###################################################################################################
 
 from datetime import date
-from uuid import uuid4
 from sqlalchemy.dialects.postgresql import UUID as pgUUID # type: ignore
 
 from src.extensions import db
+from src.ids import uuid7
 
 ###################################################################################################
 # Classes
@@ -42,6 +42,8 @@ class MemberJobModel(db.Model):
     :member_pay: Calculated and patched in when user runs the 'calculate pay' endpoint (not yet written)
     """
     __tablename__ = 'member_job'
+    # the primary key (member_id, job_id) covers lookups by member, this covers loading a job's roster
+    __table_args__ = (db.Index('ix_member_job_job_id', 'job_id'),)
     member_id = db.Column(db.UUID, db.ForeignKey('members.id'), primary_key=True)
     job_id = db.Column(db.UUID, db.ForeignKey('job.id'), primary_key=True)
 
@@ -60,16 +62,21 @@ class RankModel(db.Model):
     :share: The number of shares (in x.xx format) that rank receives from the total pay.
     """
     __tablename__ = 'ranks'
+    # deferrable so PUT /ranks/order can swap positions in one statement (it's checked at the end of the
+    # statement, not row by row), but still checked straight away by default
+    __table_args__ = (
+        db.UniqueConstraint('position', name='ranks_position_key', deferrable=True, initially='IMMEDIATE'),
+    )
 
     id = db.Column(
         pgUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7, # time-ordered, see src/ids.py
         unique=True,
         nullable=False
     )
     name = db.Column(db.String(20), unique=True, nullable=False)
-    position = db.Column(db.Integer, unique=True, nullable=False)
+    position = db.Column(db.Integer, nullable=False)
     share = db.Column(db.Float(precision=2), nullable=False)
 
     members = db.relationship('MemberModel', back_populates='rank')
@@ -93,11 +100,13 @@ class MemberModel(db.Model):
     """
         
     __tablename__ = 'members'
+    # filtering members by rank, and moving them to the default rank when theirs is deleted
+    __table_args__ = (db.Index('ix_members_rank_id', 'rank_id'),)
 
     id = db.Column(
         pgUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7, # time-ordered, see src/ids.py
         unique=True,
         nullable=False
     )
@@ -122,15 +131,31 @@ class MemberModel(db.Model):
         return f"<{self.__class__.__name__}(id={self.id}, name={self.name!r}, rank={self.rank})>"
         # !r means apply the repr() function to the value. Effectively it's apply '' to follow the repr formatting
 
+def job_days(job):
+    """
+    The days a job runs as an inclusive daterange, for filtering jobs by period.
+
+    A job without an end_date runs on its start_date only: GREATEST skips the NULL (and an
+    end_date before the start_date). Pass JobModel in queries, or JobModel.__table__.c for the index.
+    """
+    return db.func.daterange(job.start_date, db.func.greatest(job.start_date, job.end_date), db.literal_column("'[]'"))
+
+
 class JobModel(ReprMixin, db.Model):
     """
     SQLAlchemy model for a jobs table.
     """
     __tablename__ = 'job'
+    __table_args__ = (
+        # the GET /jobs sort order, so each page of keyset pagination is an index range scan
+        db.Index('ix_job_start_date_id', 'start_date', 'id'),
+        # and the order=created one
+        db.Index('ix_job_created_at_id', 'created_at', 'id'),
+    )
     id = db.Column(
         pgUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7, # time-ordered, see src/ids.py
         unique=True,
         nullable=False
     )
@@ -141,11 +166,75 @@ class JobModel(ReprMixin, db.Model):
     total_silver = db.Column(db.Integer)
     company_cut_amt = db.Column(db.Integer)
     remainder_after_payouts = db.Column(db.Integer)
+    # fingerprint of the total, roster and shares the stored payments were calculated from
+    # see payout_engine.payment_fingerprint
+    payment_fingerprint = db.Column(db.String(64))
+    # when the job was added, for GET /jobs?order=created
+    # clock_timestamp() rather than now() so jobs added in one transaction still come in order,
+    # jobs from before the column (UUIDv4 ids) were backfilled with the epoch
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.clock_timestamp(), nullable=False)
     
     # relationship to association object
     members_on_job = db.relationship("MemberJobModel", back_populates="job", lazy="joined")  # <-- lazy="joined" ensures it loads with Job
     members = db.relationship("MemberModel", secondary="member_job", back_populates="jobs", viewonly=True)
 
+
+# GET /jobs?from=&to=&ends_before= compare job_days with && and <<, which a GiST index can answer,
+# so a month's view only reads that month's jobs
+db.Index('ix_job_days', job_days(JobModel.__table__.c), postgresql_using='gist')
+
+
+class PaymentRecalcQueueModel(db.Model):
+    """
+    SQLAlchemy model for the payment recalculation queue.
+
+    A job is queued when PATCH resets its payments, and the `flask payments worker` command
+    recalculates and removes it. The job_id primary key means a job is only ever queued once
+    however many times it's reset before the worker gets to it.
+
+    :job_id: From the Job table, the queued row is removed if the job is deleted.
+    :requested_at: When the job was first queued, the worker takes the oldest first.
+    """
+    __tablename__ = 'payment_recalc_queue'
+    job_id = db.Column(db.UUID, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    requested_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now(), nullable=False)
+
+
+class MemberEarningsModel(db.Model):
+    """
+    SQLAlchemy model for each member's lifetime earnings.
+
+    This is an aggregate of member_job and job kept up to date by the code that changes them
+    (see payments.refresh_member_earnings), so reports don't have to scan every job.
+
+    :member_id: From the Member table, the row is removed if the member is deleted.
+    :total_silver: The sum of the member's stored member_pay across all jobs.
+    :job_count: The number of jobs the member is on, paid or not.
+    :last_job_date: The latest start_date of those jobs, None if they haven't been on one.
+    """
+    __tablename__ = 'member_earnings'
+    member_id = db.Column(db.UUID, db.ForeignKey('members.id', ondelete='CASCADE'), primary_key=True)
+    total_silver = db.Column(db.BigInteger, default=0, nullable=False)
+    job_count = db.Column(db.Integer, default=0, nullable=False)
+    last_job_date = db.Column(db.Date)
+
+
+class RankCacheVersionModel(db.Model):
+    """
+    SQLAlchemy model for the version of the ranks table, a single row.
+
+    Each process keeps its own copy of the ranks (see rank_cache.py). Anything that changes the
+    ranks bumps the version in the same transaction, so every process sees the change and reloads
+    on its next request.
+
+    :id: Always 1, the check constraint keeps it to one row.
+    :version: Incremented on every change to the ranks.
+    """
+    __tablename__ = 'rank_cache_version'
+    __table_args__ = (db.CheckConstraint('id = 1', name='rank_cache_version_single_row'),)
+    id = db.Column(db.SmallInteger, primary_key=True, default=1)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+
     
 ###################################################################################################
 # End of file
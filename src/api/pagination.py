@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor holds the sort key of the last row on a page. The next page starts after it with
+WHERE (sort key) < (cursor), which an index on the sort key answers directly, so every page
+costs the same however deep it is (unlike OFFSET, which has to walk past every skipped row).
+
+Cursors are opaque to clients: the sort key values as a JSON list, base64 encoded.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import base64
+import binascii
+import json
+
+from datetime import datetime
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row on a page, values are sent as their str().
+    """
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, *parsers):
+    """
+    Decode a cursor from encode_cursor, converting each value with the matching parser
+    (e.g. date.fromisoformat, UUID).
+
+    Raises ValueError if the cursor wasn't made by encode_cursor with the same number of values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    # encode_cursor only writes strings, anything else would reach the parsers as the wrong type
+    if not isinstance(values, list) or len(values) != len(parsers) or not all(isinstance(value, str) for value in values):
+        raise ValueError("Invalid cursor")
+    try:
+        return tuple(parser(value) for parser, value in zip(parsers, values))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def aware_datetime(value: str) -> datetime:
+    """
+    datetime.fromisoformat for cursor values, rejecting a date or datetime without a timezone.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError(f"{value} has no timezone")
+    return parsed
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
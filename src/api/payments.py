@@ -0,0 +1,338 @@
+"""
+Database side of the payment calculations.
+
+The functions in here work on a set of jobs at once, so callers settling many jobs
+(e.g. POST /v1/jobs/payments) pay for a handful of statements in total rather than
+a round trip per job. The maths itself lives in src/payout_engine.py.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, String, any_, bindparam, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as pgUUID, insert # type: ignore
+from constants import COMPANY_CUT # type: ignore
+from src.api.loaders import eager_load
+from src.api.models import JobModel, MemberEarningsModel, MemberJobModel, MemberModel, PaymentRecalcQueueModel, RankModel # type: ignore
+from src.api.rank_cache import get_ranks
+from src.api.schemas import JobResponseSchema
+from src.extensions import db
+from src.payout_engine import calculate_payouts, payment_fingerprint
+
+
+###################################################################################################
+#  Classes
+###################################################################################################
+
+class MemberShare(NamedTuple):
+    job_id: UUID
+    member_id: UUID
+    share: float
+
+
+###################################################################################################
+#  Statements
+###################################################################################################
+# Built once at import so SQLAlchemy can cache their compiled form, see store_payouts
+
+def _array_param(name, item_type):
+    return cast(bindparam(name, type_=ARRAY(item_type)), ARRAY(item_type))
+
+
+_pays = func.unnest(
+    _array_param("job_ids", pgUUID(as_uuid=True)),
+    _array_param("member_ids", pgUUID(as_uuid=True)),
+    _array_param("member_pays", Integer),
+).table_valued("job_id", "member_id", "member_pay").render_derived(name="pays")
+
+_UPDATE_MEMBER_PAYS = (
+    update(MemberJobModel)
+    .values(member_pay=_pays.c.member_pay)
+    .where(
+        MemberJobModel.job_id == _pays.c.job_id,
+        MemberJobModel.member_id == _pays.c.member_id,
+    )
+    .execution_options(synchronize_session=False)
+)
+
+_totals = func.unnest(
+    _array_param("job_ids", pgUUID(as_uuid=True)),
+    _array_param("company_cuts", Integer),
+    _array_param("remainders", Integer),
+    _array_param("fingerprints", String),
+).table_valued("id", "company_cut_amt", "remainder_after_payouts", "payment_fingerprint").render_derived(name="totals")
+
+_UPDATE_JOB_TOTALS = (
+    update(JobModel)
+    .values(
+        company_cut_amt=_totals.c.company_cut_amt,
+        remainder_after_payouts=_totals.c.remainder_after_payouts,
+        payment_fingerprint=_totals.c.payment_fingerprint,
+    )
+    .where(JobModel.id == _totals.c.id)
+    .execution_options(synchronize_session=False)
+)
+
+# members with no jobs left still get a row, with zeros, via the outer joins
+_earnings = (
+    select(
+        MemberModel.id,
+        func.coalesce(func.sum(MemberJobModel.member_pay), 0),
+        func.count(MemberJobModel.job_id),
+        func.max(JobModel.start_date),
+    )
+    .outerjoin(MemberJobModel, MemberJobModel.member_id == MemberModel.id)
+    .outerjoin(JobModel, JobModel.id == MemberJobModel.job_id)
+    .where(MemberModel.id == any_(_array_param("member_ids", pgUUID(as_uuid=True))))
+    .group_by(MemberModel.id)
+    # every writer (PATCH, PUT roster, the batch and the worker) locks the members' rows in id order,
+    # so two of them sharing members can't each hold a row the other is waiting for
+    .order_by(MemberModel.id)
+)
+# built on the table, the ORM's bulk insert doesn't take from_select with on_conflict_do_update
+_upsert_earnings = insert(MemberEarningsModel.__table__).from_select(
+    ["member_id", "total_silver", "job_count", "last_job_date"], _earnings
+)
+_REFRESH_MEMBER_EARNINGS = _upsert_earnings.on_conflict_do_update(
+    index_elements=[MemberEarningsModel.member_id],
+    set_={
+        "total_silver": _upsert_earnings.excluded.total_silver,
+        "job_count": _upsert_earnings.excluded.job_count,
+        "last_job_date": _upsert_earnings.excluded.last_job_date,
+    },
+)
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def select_job_ids(job_ids=None, date_from=None, date_to=None):
+    """
+    Return the ids of the jobs matching a list of ids and/or a start_date range (inclusive).
+    """
+    query = select(JobModel.id)
+    if job_ids:
+        query = query.where(JobModel.id.in_(job_ids))
+    if date_from is not None:
+        query = query.where(JobModel.start_date >= date_from)
+    if date_to is not None:
+        query = query.where(JobModel.start_date <= date_to)
+
+    return list(db.session.execute(query).scalars())
+
+
+def load_payment_inputs(job_ids):
+    """
+    Return one row per job with what we need to check it can be paid:
+    (id, total_silver, payment_fingerprint, member_count, total_shares).
+
+    Jobs without members are still returned (with a member_count of 0) so the caller
+    can report them.
+    """
+    query = (
+        select(
+            JobModel.id,
+            JobModel.total_silver,
+            JobModel.payment_fingerprint,
+            func.count(MemberJobModel.member_id).label("member_count"),
+            func.sum(cast(RankModel.share, Float)).label("total_shares"),
+        )
+        .outerjoin(MemberJobModel, MemberJobModel.job_id == JobModel.id)
+        .outerjoin(MemberModel, MemberModel.id == MemberJobModel.member_id)
+        .outerjoin(RankModel, RankModel.id == MemberModel.rank_id)
+        .where(JobModel.id.in_(job_ids))
+        .group_by(JobModel.id)
+    )
+    return db.session.execute(query).all()
+
+
+def load_member_shares(job_ids):
+    """
+    Return (job_id, member_id, share) for every member on the given jobs.
+    The shares come from the rank cache rather than a join to ranks.
+    """
+    ranks = get_ranks().by_id
+    query = (
+        select(MemberJobModel.job_id, MemberJobModel.member_id, MemberModel.rank_id)
+        .join(MemberModel, MemberModel.id == MemberJobModel.member_id)
+        .where(MemberJobModel.job_id.in_(job_ids))
+    )
+    return [
+        MemberShare(member.job_id, member.member_id, ranks[member.rank_id].share)
+        for member in db.session.execute(query)
+    ]
+
+
+def apply_payments(jobs):
+    """
+    Calculate and store member_pay, company_cut_amt, remainder_after_payouts and the
+    payment_fingerprint for every job in jobs (rows from load_payment_inputs).
+
+    The inputs for the whole batch are read in one statement and handed to the payout engine,
+    the results are written back with one statement per table (see store_payouts).
+    Jobs whose fingerprint matches the stored one already hold these results and are not written.
+    Callers must have checked every job has a total_silver and members with shares.
+
+    Returns the ids of the jobs that were written.
+    """
+    position = {job.id: index for index, job in enumerate(jobs)}
+    members = load_member_shares(list(position))
+
+    payouts = calculate_payouts(
+        totals=[job.total_silver for job in jobs],
+        shares=[member.share for member in members],
+        job_index=[position[member.job_id] for member in members],
+        company_cut=COMPANY_CUT,
+    )
+
+    roster = {job.id: [] for job in jobs}
+    for member in members:
+        roster[member.job_id].append((member.member_id, member.share))
+    fingerprints = {
+        job.id: payment_fingerprint(job.total_silver, roster[job.id], COMPANY_CUT)
+        for job in jobs
+    }
+    changed = {job.id for job in jobs if job.payment_fingerprint != fingerprints[job.id]}
+    if not changed:
+        return []
+
+    store_payouts(
+        job_rows=[
+            (job.id, company_cut, remainder, fingerprints[job.id])
+            for job, company_cut, remainder in zip(jobs, payouts.company_cuts, payouts.remainders)
+            if job.id in changed
+        ],
+        member_rows=[
+            (member.job_id, member.member_id, member_pay)
+            for member, member_pay in zip(members, payouts.member_pays)
+            if member.job_id in changed
+        ],
+    )
+    return [job.id for job in jobs if job.id in changed]
+
+
+def store_payouts(job_rows, member_rows):
+    """
+    Write calculated payouts with one UPDATE per table, however many jobs and members there are.
+
+    :job_rows: (job_id, company_cut_amt, remainder_after_payouts, payment_fingerprint) per job.
+    :member_rows: (job_id, member_id, member_pay) per member.
+
+    The rows are sent as one array per column and unnested into a derived table in the db, i.e.
+    UPDATE member_job ... FROM unnest(:job_ids, :member_ids, :member_pays) AS pays(...)
+    so the statement has the same three parameters (and is cached) whatever the size of the roster.
+    The paid members' member_earnings are refreshed in the same transaction.
+
+    NOTE: these are core statements, objects already loaded in the session are not updated,
+    use set_committed_value or reload them if they are needed afterwards.
+    """
+    if member_rows:
+        job_ids, member_ids, member_pays = zip(*member_rows)
+        db.session.execute(
+            _UPDATE_MEMBER_PAYS,
+            {"job_ids": list(job_ids), "member_ids": list(member_ids), "member_pays": list(member_pays)},
+        )
+        refresh_member_earnings(member_ids)
+
+    if job_rows:
+        job_ids, company_cuts, remainders, fingerprints = zip(*job_rows)
+        db.session.execute(
+            _UPDATE_JOB_TOTALS,
+            {
+                "job_ids": list(job_ids),
+                "company_cuts": list(company_cuts),
+                "remainders": list(remainders),
+                "fingerprints": list(fingerprints),
+            },
+        )
+
+
+def refresh_member_earnings(member_ids):
+    """
+    Recalculate the member_earnings rows of the given members from member_job and job.
+
+    Call it in the same transaction as anything that changes a member's pay, jobs or job dates,
+    only the members passed in are recalculated so it costs one statement however big the tables get.
+    Pending ORM changes are flushed first so they are counted.
+    """
+    member_ids = list(set(member_ids))
+    if not member_ids:
+        return
+    db.session.flush()
+    db.session.execute(_REFRESH_MEMBER_EARNINGS, {"member_ids": member_ids})
+
+
+def enqueue_recalculation(job_ids):
+    """
+    Queue jobs for the payment worker to recalculate, see `flask payments worker`.
+
+    A job that is already queued keeps its place, so resetting it again doesn't add more work.
+    The row is added in the caller's transaction so it is only queued if the reset is committed.
+    """
+    if not job_ids:
+        return
+    db.session.execute(
+        insert(PaymentRecalcQueueModel)
+        .values([{"job_id": job_id} for job_id in job_ids])
+        .on_conflict_do_nothing(index_elements=[PaymentRecalcQueueModel.job_id])
+    )
+
+
+def process_recalc_queue(batch_size=50):
+    """
+    Recalculate and store the payments of up to batch_size queued jobs, oldest first, then commit.
+
+    The queued rows are claimed with FOR UPDATE SKIP LOCKED so several workers can run at once
+    without picking up the same job. Jobs that can't be paid (no members, total_silver or shares)
+    are removed from the queue without being calculated, GET /payments will report why.
+
+    The jobs' own rows are locked in the same statement. The routes that reset payments lock the
+    job row before they change anything, so a reset can't land between the claim and the commit:
+    one that starts after the claim waits for the commit, then queues the job again, and a job
+    that is being reset is skipped until the reset is committed.
+
+    Returns the number of jobs taken off the queue, 0 when it's empty.
+    """
+    job_ids = list(db.session.execute(
+        select(PaymentRecalcQueueModel.job_id)
+        .join(JobModel, JobModel.id == PaymentRecalcQueueModel.job_id)
+        .order_by(PaymentRecalcQueueModel.requested_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=[PaymentRecalcQueueModel, JobModel])
+    ).scalars())
+    if not job_ids:
+        db.session.commit() # nothing to do, end the transaction
+        return 0
+
+    payable = [
+        job for job in load_payment_inputs(job_ids)
+        if job.member_count and job.total_silver is not None and job.total_shares
+    ]
+    apply_payments(payable)
+
+    db.session.execute(delete(PaymentRecalcQueueModel).where(PaymentRecalcQueueModel.job_id.in_(job_ids)))
+    db.session.commit()
+    return len(job_ids)
+
+
+def load_jobs_with_payments(job_ids):
+    """
+    Load the jobs (with members and ranks) fresh from the db, newest first, for the response.
+    """
+    return (
+        JobModel.query.options(*eager_load(JobModel, JobResponseSchema))
+        .filter(JobModel.id.in_(job_ids))
+        .order_by(JobModel.start_date.desc())
+        .populate_existing()
+        .all()
+    )
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
@@ -0,0 +1,132 @@
+"""
+Process-local cache of the ranks table.
+
+Ranks are a handful of rows that hardly ever change, but payment calculations, adding members
+to jobs and member imports all need them. Rather than join or load RankModel each time they read
+a frozen snapshot of every rank, keyed by id, name and position, kept by each process.
+
+Gunicorn runs several workers (see entrypoint.sh), each with its own snapshot, so every change to
+the ranks bumps the single row in rank_cache_version in the same transaction (bump_rank_version).
+A snapshot is tagged with the version it was loaded at, and the version is checked once per
+request (once per call outside of a request, e.g. the payments worker): if another process has
+changed the ranks the next request reloads them.
+
+Usage:
+    ranks = get_ranks()
+    ranks.by_id[member.rank_id].share
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import threading
+
+from types import MappingProxyType
+from typing import NamedTuple
+from uuid import UUID
+
+from flask import has_request_context, request
+from sqlalchemy import select, update
+
+from src.api.models import RankCacheVersionModel, RankModel # type: ignore
+from src.extensions import db
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+_snapshot = None # this process's RankSnapshot
+_lock = threading.Lock()
+
+# the snapshot a request has checked is kept in its WSGI environ rather than flask.g: g belongs to
+# the app context, which is shared by every request when one is already pushed (e.g. in the tests)
+SNAPSHOT_KEY = "sgr.rank_snapshot"
+
+
+###################################################################################################
+#  Classes
+###################################################################################################
+
+class CachedRank(NamedTuple):
+    """
+    A read-only copy of a RankModel row, safe to share between requests and threads.
+    """
+    id: UUID
+    name: str
+    position: int
+    share: float
+
+
+class RankSnapshot:
+    """
+    Every rank as of one version of the ranks table.
+
+    :by_id, by_name, by_position: read-only dicts of CachedRank.
+    """
+    def __init__(self, version, ranks):
+        self.version = version
+        self.by_id = MappingProxyType({rank.id: rank for rank in ranks})
+        self.by_name = MappingProxyType({rank.name: rank for rank in ranks})
+        self.by_position = MappingProxyType({rank.position: rank for rank in ranks})
+
+    def __repr__(self):
+        return f"<RankSnapshot(version={self.version}, ranks={len(self.by_id)})>"
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def get_ranks():
+    """
+    Return the RankSnapshot for the current version of the ranks table, reloading it if it changed.
+
+    Don't call this after bump_rank_version in the same transaction: the session would see its
+    own uncommitted version and cache ranks that may yet be rolled back.
+    """
+    if has_request_context() and SNAPSHOT_KEY in request.environ:
+        return request.environ[SNAPSHOT_KEY]
+
+    global _snapshot
+    version = db.session.scalar(select(RankCacheVersionModel.version))
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                # read the version before the ranks, a change committed between the two is newer than
+                # the version we tag it with so it's only loaded again, never missed
+                ranks = db.session.execute(select(RankModel.id, RankModel.name, RankModel.position, RankModel.share))
+                _snapshot = RankSnapshot(version, [CachedRank(*rank) for rank in ranks])
+            snapshot = _snapshot
+
+    if has_request_context():
+        request.environ[SNAPSHOT_KEY] = snapshot
+    return snapshot
+
+
+def bump_rank_version():
+    """
+    Tell every process the ranks have changed, call it in the transaction that changes them.
+
+    The row lock it takes is held until commit, so concurrent rank changes are applied one at a time.
+    """
+    db.session.execute(update(RankCacheVersionModel).values(version=RankCacheVersionModel.version + 1))
+    invalidate_rank_cache()
+
+
+def invalidate_rank_cache():
+    """
+    Drop this process's snapshot, it is reloaded on the next get_ranks.
+    """
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    if has_request_context():
+        request.environ.pop(SNAPSHOT_KEY, None)
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
@@ -7,7 +7,7 @@ This defines the Marshmallow schemas for the API.
 #  Imports
 ###################################################################################################
 
-from marshmallow import Schema, fields, post_dump, validates, ValidationError # type: ignore
+from marshmallow import Schema, fields, post_dump, validate, validates, validates_schema, ValidationError # type: ignore
 from marshmallow_sqlalchemy import SQLAlchemySchema, auto_field 
 from sqlalchemy import select, exists
 # TODO: refactor schemas to use the marshmallow_sqlalchemy meta pattern (see JobMemberSchema)
@@ -16,6 +16,12 @@ from sqlalchemy import select, exists
 from src.api.models import JobModel, MemberJobModel, MemberModel, RankModel # type: ignore
 from src.extensions import db
 
+###################################################################################################
+#  Config
+###################################################################################################
+
+MAX_TOTAL_SILVER = 2**31 - 1 # job.total_silver is an int4 column
+
 ###################################################################################################
 #  Schemas
 ###################################################################################################
@@ -41,6 +47,22 @@ class WholeNumber(fields.Field):
         except (ValueError, TypeError):
             raise ValidationError("Value must be a whole number.")
 
+def run_db_checks(checks):
+    """
+    Run every check a payload needs against the db in one query.
+
+    checks is {field: (condition, message)}, each condition a SQL boolean (e.g. an EXISTS) that is
+    true when the field is invalid. Raises a ValidationError with the message for each failed field,
+    in the same shape the field validators return them.
+    """
+    if not checks:
+        return
+    result = db.session.execute(select(*(condition.label(field) for field, (condition, _) in checks.items()))).one()
+    errors = {field: [message] for field, (_, message) in checks.items() if getattr(result, field)}
+    if errors:
+        raise ValidationError(errors)
+
+
 ## RANKS
 class RankSchema(Schema):
     id = fields.UUID(dump_only=True)
@@ -56,22 +78,21 @@ class RankSchema(Schema):
             raise ValidationError("Name must not be empty.")
         if len(value) > 20:
             raise ValidationError("Name must not exceed 20 characters.")
-        # Check DB for existing record using SQLAlchemy 2.0 style
-        # Build a subquery that selects *something* from RankModel
-        subq_exists = select(RankModel.id).where(RankModel.name == value).exists()
-        # Wrap the EXISTS in a SELECT and execute
-        exists_flag = db.session.execute(select(subq_exists)).scalar()
-        if exists_flag:
-            raise ValidationError(f"There is already a rank with name {value}.")
         
     @validates('position')
     def validate_position(self, value, **kwargs):
         if value <= 0:
             raise ValidationError("Position must be a positive integer.")
-        # Check DB for existing record : easier to read way, but less performant
-        exists = db.session.query(RankModel).filter_by(position=value).first() is not None
-        if exists:
-            raise ValidationError(f"There is already a rank at position {value}.")
+
+    @validates_schema(skip_on_field_errors=False)
+    def validate_unique(self, data, **kwargs):
+        # name and position are checked against the db in one query, once their own validators have passed
+        checks = {}
+        if "name" in data:
+            checks["name"] = (exists().where(RankModel.name == data["name"]), f"There is already a rank with name {data['name']}.")
+        if "position" in data:
+            checks["position"] = (exists().where(RankModel.position == data["position"]), f"There is already a rank at position {data['position']}.")
+        run_db_checks(checks)
         
     @validates('share')
     def validate_share(self, value, **kwargs):
@@ -79,6 +100,10 @@ class RankSchema(Schema):
             raise ValidationError("Share must be a non-negative float.")
         
            
+class RankOrderSchema(Schema):
+    ranks = fields.List(fields.UUID(), required=True, metadata={"description": "The id of every rank except the default, highest first"})
+
+
 class RankQueryArgsSchema(Schema):
     name = fields.String(required=False, metadata={"description": "Filter by rank name"})
     position = fields.Integer(required=False,  metadata={"description": "Filter by rank position"})
@@ -96,13 +121,17 @@ class BaseMemberSchema(Schema):
             raise ValidationError("Name must not be empty.")
         if len(value) > 256:
             raise ValidationError("Name must not exceed 256 characters.")
-        # Check DB for existing record using SQLAlchemy 2.0 style
-        # Build a subquery that selects *something* from RankModel
-        subq_exists = select(MemberModel.id).where(MemberModel.name == value).exists()
-        # Wrap the EXISTS in a SELECT and execute
-        exists_flag = db.session.execute(select(subq_exists)).scalar()
-        if exists_flag:
-            raise ValidationError(f"There is already a member with name {value}.")
+
+    @validates_schema(skip_on_field_errors=False)
+    def validate_against_db(self, data, **kwargs):
+        # everything db_checks returns is checked in one query, once the fields' own validators have passed
+        run_db_checks(self.db_checks(data))
+
+    def db_checks(self, data):
+        checks = {}
+        if "name" in data:
+            checks["name"] = (exists().where(MemberModel.name == data["name"]), f"There is already a member with name {data['name']}.")
+        return checks
 
 
 class MemberSchema(BaseMemberSchema):
@@ -112,19 +141,54 @@ class MemberSchema(BaseMemberSchema):
     include_fk = True
     include_relationships = False   # prevent auto-adding rank again
 
-    @validates('rank_id')
-    def validate_rank_exists(self, value, **kwargs):
-        subq_exists = select(RankModel.id).where(RankModel.id == value).exists()
-        # Wrap the EXISTS in a SELECT and execute
-        exists_flag = db.session.execute(select(subq_exists)).scalar()
-        if not exists_flag:
-            raise ValidationError(f"Rank {value} does not exist")
+    def db_checks(self, data):
+        checks = super().db_checks(data)
+        if "rank_id" in data:
+            # checked in the same query as the name, rather than costing the rank cache's version check
+            checks["rank_id"] = (~exists().where(RankModel.id == data["rank_id"]), f"Rank {data['rank_id']} does not exist")
+        return checks
 
 
 class MemberQueryArgsSchema(Schema):
     rank = fields.UUID(required=False, metadata={"description": "Filter by rank id"})
 
 
+class MemberImportSchema(Schema):
+    """
+    A member for POST /members/import, with their rank given by name or id.
+    The name isn't checked against the db here, import_members checks the whole upload in one query.
+    """
+    name = fields.Str(required=True, metadata={"description": "The character name", "example": "John Doe"})
+    rank = fields.Str(required=True, metadata={"description": "The name or id of the member's rank", "example": "Private"})
+    active = fields.Bool(metadata={"description": "The member's active", "example": True})
+
+    @validates('name')
+    def validate_name(self, value, **kwargs):
+        if not value.strip():
+            raise ValidationError("Name must not be empty.")
+        if len(value) > 256:
+            raise ValidationError("Name must not exceed 256 characters.")
+
+
+class MemberImportCreatedSchema(Schema):
+    row = fields.Integer(metadata={"description": "The row number in the upload, from 1 (not counting a CSV header)"})
+    id = fields.UUID()
+    name = fields.Str()
+    rank_id = fields.UUID()
+
+
+class MemberImportResultSchema(Schema):
+    created = fields.List(fields.Nested(MemberImportCreatedSchema), metadata={"description": "The members that were imported"})
+    errors = fields.List(fields.Nested("ImportErrorSchema"), metadata={"description": "The rows that were not imported"})
+
+
+class MemberEarningsSchema(Schema):
+    member_id = fields.UUID(dump_only=True)
+    total_silver = fields.Integer(dump_only=True, metadata={"description": "Silver paid to the member across all jobs", "example": 1250})
+    job_count = fields.Integer(dump_only=True, metadata={"description": "Jobs the member has been on", "example": 4})
+    last_job_date = fields.Date(dump_only=True, allow_none=True, metadata={"description": "Start date of the member's latest job", "example": "2025-04-30"})
+
+
 # JOBS
 class MemberJobRequestSchema(SQLAlchemySchema):
     class Meta:
@@ -142,20 +206,18 @@ class MemberJobResponseSchema(SQLAlchemySchema):
         load_instance = True
         include_fk = True  # include foreign keys if needed
         # NOTE
-        # Without include_fk=True, Marshmallow sometimes wraps or replaces the instance when dumping fields that it doesn’t know about (like member_id), which can break fields.Method that accesses obj.member.
+        # Without include_fk=True, Marshmallow sometimes wraps or replaces the instance when dumping fields that it doesn’t know about (like member_id), which can break fields that read through obj.member.
         # With include_fk=True, Marshmallow knows member_id and job_id are columns, so it can serialize them directly without interfering with the model instance.
 
     # auto_field will map columns from the model
     member_id = auto_field()
     member_rank = auto_field(dump_only=True)
     # fields not in the model
-    member_name = fields.Method("get_member_name", dump_only=True)
+    # these read through relationships by attribute (not fields.Method) so loaders.eager_load can see what to load
+    member_name = fields.String(attribute="member.name", dump_only=True)
     member_pay = auto_field()
     member_rank_position = fields.Integer(attribute="member.rank.position")
 
-    def get_member_name(self, obj):
-        return obj.member.name if hasattr(obj, "member") and obj.member else None
-
 
 class BaseJobSchema(Schema):
     id = fields.UUID(dump_only=True)
@@ -181,6 +243,8 @@ class BaseJobSchema(Schema):
     def validate_total_silver(self, value, **kwargs):
         if value < 0:
             raise ValidationError("total_silver cannot be a negative value.")
+        if value > MAX_TOTAL_SILVER:
+            raise ValidationError(f"total_silver must not exceed {MAX_TOTAL_SILVER}.")
 
 
 class JobUpdateSchema(BaseJobSchema):
@@ -211,8 +275,76 @@ class JobResponseSchema(BaseJobSchema):
         return data
 
 
+class JobImportSchema(BaseJobSchema):
+    """
+    A job as POST /job takes it, plus the ids of the members on it, for POST /jobs/import.
+    """
+    members = fields.List(fields.UUID(), load_default=list)
+
+
+class ImportErrorSchema(Schema):
+    row = fields.Integer(metadata={"description": "The row number in the upload, from 1 (not counting a CSV header)"})
+    errors = fields.Dict(metadata={"description": "The messages for each field, as a 422 would return them"})
+
+
+class JobImportResultSchema(Schema):
+    created = fields.Integer(metadata={"description": "How many jobs were imported", "example": 2})
+    job_ids = fields.List(fields.UUID(), metadata={"description": "The ids of the imported jobs, in upload order"})
+    errors = fields.List(fields.Nested(ImportErrorSchema), metadata={"description": "The rows that were not imported"})
+
+
+class JobRosterSchema(Schema):
+    members = fields.List(fields.UUID(), required=True, metadata={"description": "Every member who should be on the job, anyone else is removed"})
+
+
+class JobSummarySchema(BaseJobSchema):
+    """
+    A job without its roster, for GET /jobs?view=summary.
+    """
+    company_cut_amt = fields.Integer(dump_only=True)
+    remainder_after_payouts = fields.Integer(dump_only=True)
+    member_count = fields.Integer(dump_only=True, metadata={"description": "How many members are on the job", "example": 3})
+
+
 class JobQueryArgsSchema(Schema):
     start_date = fields.Date(required=False, metadata={"description": "Filter by start date"})
+    date_from = fields.Date(data_key="from", required=False, metadata={"description": "Jobs running on or after this date, a multiday job that ends on it counts", "example": "2025-04-01"})
+    date_to = fields.Date(data_key="to", required=False, metadata={"description": "Jobs running on or before this date, a multiday job that starts on it counts", "example": "2025-04-30"})
+    ends_before = fields.Date(required=False, metadata={"description": "Jobs that have finished before this date (their end_date, or start_date for one day jobs)", "example": "2025-04-01"})
+    view = fields.String(load_default="full", validate=validate.OneOf(["full", "summary"]), metadata={"description": "summary leaves out members_on_job and adds a member_count"})
+    order = fields.String(load_default="start_date", validate=validate.OneOf(["start_date", "created"]), metadata={"description": "Newest start_date first, or most recently created first (jobs from before created_at was recorded come last)"})
+    limit = fields.Integer(required=False, validate=validate.Range(min=1, max=500), metadata={"description": "Return at most this many jobs, the X-Next-Cursor header has the cursor for the next page"})
+    cursor = fields.String(required=False, metadata={"description": "The X-Next-Cursor of the previous page"})
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise ValidationError("from must be on or before to.", field_name="from")
+
+
+class JobPaymentsRequestSchema(Schema):
+    job_ids = fields.List(fields.UUID(), required=False, metadata={"description": "The jobs to calculate payments for"})
+    # `from` is a python keyword so we use data_key to keep the field name in the payload
+    date_from = fields.Date(data_key="from", required=False, metadata={"description": "Calculate jobs starting on or after this date", "example": "2025-04-01"})
+    date_to = fields.Date(data_key="to", required=False, metadata={"description": "Calculate jobs starting on or before this date", "example": "2025-04-30"})
+
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        if not data.get("job_ids") and "date_from" not in data and "date_to" not in data:
+            raise ValidationError("Provide job_ids and/or a from/to date range.")
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise ValidationError("from must be on or before to.", field_name="from")
+
+
+class PayoutExportArgsSchema(Schema):
+    date_from = fields.Date(data_key="from", required=False, metadata={"description": "Export jobs starting on or after this date", "example": "2025-04-01"})
+    date_to = fields.Date(data_key="to", required=False, metadata={"description": "Export jobs starting on or before this date", "example": "2025-04-30"})
+    format = fields.String(load_default="csv", validate=validate.OneOf(["csv", "ndjson"]), metadata={"description": "csv or ndjson (one JSON object per line)"})
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise ValidationError("from must be on or before to.", field_name="from")
         
 
 
@@ -11,10 +11,27 @@ Endpoints:
 - /jobs:
     - GET: Get all jobs
 
+- /job/<job_id>/members:
+    - PUT: Replace a job's members with the given roster
+
+- /job/<job_id>/payments:
+    - GET: Get a job with its payments, stored or (when they are out of date) calculated without storing
+    - POST: Calculate and store the payments for a job
+
+- /jobs/payments:
+    - POST: Calculate the payments for many jobs at once
+
+- /jobs/import:
+    - POST: Import many jobs, with their members, from NDJSON or CSV
+
 Classes:
  - JobResource: Resource for creating a job.
  - JobByIdResource: Resource for managing a job by ID.
  - AllJobssResource: Resource for getting all jobs.
+ - JobMembersResource: Resource for replacing a job's roster.
+ - JobWithPaymentsById: Resource for calculating a job's payments.
+ - AllJobsWithPayments: Resource for calculating payments for a batch of jobs.
+ - JobsImportResource: Resource for importing jobs in bulk.
 
 """
 
@@ -23,19 +40,37 @@ Classes:
 ###################################################################################################
 
 from constants import COMPANY_CUT, DEFAULT_RANK # type: ignore
-from decimal import Decimal, ROUND_DOWN
-from flask import current_app
+from flask import current_app, jsonify, request
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort # type: ignore
-from sqlalchemy import desc
+from datetime import date
+from sqlalchemy import all_, any_, cast, delete, desc, exists, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as pgUUID # type: ignore
 from sqlalchemy.exc import SQLAlchemyError # to catch db errors
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, lazyload
+from sqlalchemy.orm.attributes import set_committed_value
+from types import SimpleNamespace
 from uuid import UUID
 
-from src.api.models import JobModel, MemberJobModel, MemberModel # type: ignore
-from src.api.schemas import JobQueryArgsSchema, BaseJobSchema, JobResponseSchema, JobUpdateSchema, MemberJobResponseSchema, MemberSchema, MessageSchema
+from src.api.imports import CSV_MEMBER_SEPARATOR, IMPORT_FORMATS, import_jobs, read_rows, validate_jobs
+from src.api.job_json import job_json, json_response, sql_json_enabled
+from src.api.loaders import eager_load
+from src.api.models import JobModel, MemberJobModel, MemberModel, job_days # type: ignore
+from src.api.pagination import NEXT_CURSOR_HEADER, aware_datetime, decode_cursor, encode_cursor
+from src.api.payments import (
+    apply_payments,
+    enqueue_recalculation,
+    load_jobs_with_payments,
+    load_payment_inputs,
+    refresh_member_earnings,
+    select_job_ids,
+    store_payouts,
+)
+from src.api.rank_cache import get_ranks
+from src.api.schemas import JobQueryArgsSchema, BaseJobSchema, JobImportResultSchema, JobPaymentsRequestSchema, JobResponseSchema, JobRosterSchema, JobSummarySchema, JobUpdateSchema, MemberJobResponseSchema, MemberSchema, MessageSchema
 
 from src.extensions import db
+from src.payout_engine import calculate_job_payout, payment_fingerprint
 
 
 ###################################################################################################
@@ -92,26 +127,114 @@ class AllJobsResource(MethodView):
     Resource for getting all jobs.
     """
     @blp.arguments(JobQueryArgsSchema, location="query")
-    @blp.response(200, JobResponseSchema(many=True))
+    @blp.response(
+        200,
+        JobResponseSchema(many=True),
+        headers={NEXT_CURSOR_HEADER: {"description": "Pass as cursor to get the next page, missing on the last page", "schema": {"type": "string"}}},
+    )
+    # view=summary returns JobSummarySchema rows instead, so the 200 schema is one or the other
+    @blp.doc(responses={200: {
+        "description": "Jobs with their members, or with view=summary their member_count instead",
+        "content": {"application/json": {"schema": {"oneOf": [JobResponseSchema(many=True), JobSummarySchema(many=True)]}}},
+    }})
     def get(self, args):
         """
-        Get all Jobs
+        Get all Jobs, newest first
+
+        Pass from and/or to for the jobs running in that period (inclusive), or ends_before for the jobs finished before a date.
+        Pass limit to page through them, each page's X-Next-Cursor header is the cursor for the next one.
+        Pass view=summary for the jobs without their members, with a member_count instead.
+        Pass order=created for the most recently created jobs first rather than the latest start_date,
+        jobs added before their creation time was recorded come last.
         """
         current_app.logger.debug("---------------- STARTING GET ALL JOBS --------------")
         current_app.logger.debug(f"Getting jobs with args: {args}")
-        query = JobModel.query
+        summary = args["view"] == "summary"
+        from_sql = not summary and sql_json_enabled()
+        if summary:
+            # columns only, so members_on_job (lazy="joined") is never joined or loaded
+            query = db.session.query(*self.summary_columns())
+        elif from_sql:
+            # each job's JSON built by the db (see src/api/job_json.py), plus the columns for the cursor
+            query = db.session.query(JobModel.id, JobModel.start_date, JobModel.created_at, job_json().label("json"))
+        else:
+            query = JobModel.query.options(*eager_load(JobModel, JobResponseSchema))
 
         # Apply filter if exists
-        date = args.get("start_date")  # Matches the schema field name
-        if date is not None:
-            query = query.filter(JobModel.start_date == date)
-
-        # Apply sorting
-        jobs = query.order_by(JobModel.start_date.desc()).all()
+        start_date = args.get("start_date")  # Matches the schema field name
+        if start_date is not None:
+            query = query.filter(JobModel.start_date == start_date)
+
+        # Period filters, a multiday job counts if any of its days are in the period
+        # written as range operators on job_days so ix_job_days (GiST) can answer them
+        if "date_from" in args or "date_to" in args:
+            period = func.daterange(args.get("date_from"), args.get("date_to"), literal_column("'[]'")) # a missing end is unbounded
+            query = query.filter(job_days(JobModel).op("&&")(period))
+        if "ends_before" in args:
+            query = query.filter(job_days(JobModel).op("<<")(func.daterange(args["ends_before"], None)))
+
+        # Keyset pagination, carry on after the last job of the previous page
+        # (start_date, id) is unique and matches ix_job_start_date_id so any page is an index range scan,
+        # for order=created it's (created_at, id) and ix_job_created_at_id
+        by_created = args["order"] == "created"
+        sort_key = (JobModel.created_at, JobModel.id) if by_created else (JobModel.start_date, JobModel.id)
+        if "cursor" in args:
+            try:
+                after = decode_cursor(args["cursor"], aware_datetime if by_created else date.fromisoformat, UUID)
+            except ValueError:
+                abort(400, message="Invalid cursor")
+            query = query.filter(tuple_(*sort_key) < after)
+
+        # Apply sorting, id breaks ties between jobs on the same day (or created at the same time) so pages don't overlap
+        query = query.order_by(*(column.desc() for column in sort_key))
+
+        limit = args.get("limit")
+        headers = {}
+        if limit is None:
+            jobs = query.all()
+        else:
+            # fetch one extra job to know whether there is another page
+            jobs = query.limit(limit + 1).all()
+            if len(jobs) > limit:
+                jobs = jobs[:limit]
+                last = jobs[-1].created_at if by_created else jobs[-1].start_date
+                headers[NEXT_CURSOR_HEADER] = encode_cursor(last.isoformat(), jobs[-1].id)
 
         current_app.logger.debug(f"Returning jobs: {jobs}")
         current_app.logger.debug("---------------- FINISHED GET ALL JOBS --------------")
-        return jobs
+        if from_sql:
+            return json_response("[" + ",".join(job.json for job in jobs) + "]", headers)
+        if summary:
+            # the rows don't fit JobResponseSchema so we dump them ourselves,
+            # smorest returns a Response as is
+            response = jsonify(JobSummarySchema(many=True).dump(jobs))
+            response.headers.update(headers)
+            return response
+        return jobs, 200, headers
+
+    @staticmethod
+    def summary_columns():
+        """
+        The columns for view=summary, the job's own fields plus its member count counted in SQL.
+        """
+        member_count = (
+            select(func.count())
+            .where(MemberJobModel.job_id == JobModel.id)
+            .scalar_subquery()
+            .label("member_count")
+        )
+        return [
+            JobModel.id,
+            JobModel.job_name,
+            JobModel.job_description,
+            JobModel.start_date,
+            JobModel.end_date,
+            JobModel.total_silver,
+            JobModel.company_cut_amt,
+            JobModel.remainder_after_payouts,
+            JobModel.created_at, # for the order=created cursor, JobSummarySchema leaves it out
+            member_count,
+        ]
     
 
 @blp.route("/job/<job_id>")
@@ -131,7 +254,15 @@ class JobByIdResource(MethodView):
         except ValueError:
             abort(400, message="Invalid job id")
 
-        job = JobModel.query.get_or_404(data)
+        if sql_json_enabled():
+            # the job's JSON built by the db (see src/api/job_json.py)
+            job_text = db.session.scalar(select(job_json()).where(JobModel.id == data))
+            if job_text is None:
+                abort(404)
+            current_app.logger.debug("---------------- FINISHED GET JOB BY ID --------------")
+            return json_response(job_text)
+
+        job = JobModel.query.options(*eager_load(JobModel, JobResponseSchema)).get_or_404(data)
 
         current_app.logger.debug(f"Returning job: {job}")
         current_app.logger.debug("---------------- FINISHED GET JOB BY ID --------------")
@@ -158,9 +289,11 @@ class JobByIdResource(MethodView):
             abort(400, message="Invalid job id")
 
         # Eager-load members_on_job and associated members
+        # the job row is locked first so the payments worker can't store payouts from before this change
+        # (see payments.process_recalc_queue)
         job = JobModel.query.options(
             joinedload(JobModel.members_on_job).joinedload(MemberJobModel.member)
-        ).get_or_404(job_uuid)
+        ).with_for_update(of=JobModel).get_or_404(job_uuid)
 
         ## ORDERING
         # Bad UUIDs or other value formats are checked by Marshmallow/smorest as part of deserialization
@@ -177,52 +310,43 @@ class JobByIdResource(MethodView):
         # we ran the reset payment? check it may get missed because job.total_silver would equal updated_data.total_silver
         total_members_to_add = 0
         total_members_to_remove = 0
+        removed_member_ids = []
         total_silver_different = "total_silver" in update_data and job.total_silver != update_data["total_silver"]
         total_job_changes = 0
 
         # Add members
         if "add_members" in update_data:
-            for member_id in update_data.get("add_members", []):
-                member_uuid = UUID(str(member_id))
-
-                # check if already exists on MemberJob table and ignore if it does
-                if not any(jm.member_id == member_id for jm in job.members_on_job):
-                    # if doesn't exist yet get the member model
-                    member = MemberModel.query.get(member_uuid)
-                    # if we find a member and it has a default rank do not add it & prompt user to update rank first
-                    # otherwise append it
-                    if member:
-                        if member.rank.id == DEFAULT_RANK["id"]:
-                            abort(400, message=f"At least one member {member.name} ({member.id}) has DEFAULT rank, you must update them before adding to a job")
-                        else:
-                            job.members_on_job.append(
-                                MemberJobModel(
-                                    member_id=member.id,
-                                    job_id=job.id,
-                                    member_rank=member.rank.name,
-                                )
-                            )
-                            # update our counter so we know how many members were added
-                            total_members_to_add += 1
-                    else:
-                        # error out if they're trying to add a member that doesn't exist
-                        abort(404, message=f"Member {member_uuid} not found")
+            member_uuids = [UUID(str(member_id)) for member_id in update_data.get("add_members", [])]
+            new_rows = self.new_member_rows(job.id, member_uuids)
+
+            if new_rows:
+                # one INSERT for all of them, then reload the roster when it's next used
+                db.session.execute(insert(MemberJobModel), new_rows)
+                db.session.expire(job, ["members_on_job"])
+                # update our counter so we know how many members were added
+                total_members_to_add = len(new_rows)
 
         # Remove members
         if "remove_members" in update_data:
-            for member_id in update_data.get("remove_members", []):
-                member_uuid = UUID(str(member_id))
-
-                # Check member is on the association object
-                job_member = db.session.query(MemberJobModel).filter_by(
-                    job_id=job.id,
-                    member_id=member_uuid
-                ).first()
-
-                if job_member:
-                    db.session.delete(job_member) # remove from session but not yet from db
-                    total_members_to_remove += 1
-        
+            member_uuids = [UUID(str(member_id)) for member_id in update_data.get("remove_members", [])]
+
+            # one DELETE for all of them, ids that aren't on the job just don't match a row
+            # RETURNING tells us which were actually removed
+            removed_member_ids = list(db.session.execute(
+                delete(MemberJobModel)
+                .where(
+                    MemberJobModel.job_id == job.id,
+                    MemberJobModel.member_id == any_(cast(member_uuids, ARRAY(pgUUID(as_uuid=True)))),
+                )
+                .returning(MemberJobModel.member_id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+
+            if removed_member_ids:
+                # the loaded roster still has the removed rows, reload it when it's next used
+                db.session.expire(job, ["members_on_job"])
+                total_members_to_remove = len(removed_member_ids)
+
         # Update job details 
         job_fields = {field.name for field in JobModel.__table__.columns if field.name != "id"}
         for key, value in update_data.items():
@@ -232,11 +356,11 @@ class JobByIdResource(MethodView):
 
         # Reset payments
         if total_members_to_add > 0 or total_members_to_remove > 0 or total_silver_different:
-            current_app.logger.info("------- RESETTING PAYMENT DATA ------")
-            job.company_cut_amt = None
-            job.remainder_after_payouts = None
-            for jm in job.members_on_job:
-                jm.member_pay = None
+            self.reset_payments(job)
+
+        # Keep the members' earnings in line with their pay and job dates
+        if total_members_to_add > 0 or total_members_to_remove > 0 or total_silver_different or "start_date" in update_data:
+            refresh_member_earnings([jm.member_id for jm in job.members_on_job] + removed_member_ids)
         
         try:
             # NOTE:
@@ -248,7 +372,8 @@ class JobByIdResource(MethodView):
             # db.session.add(job) isn’t required — it’s already known to the session.
             # TODO: review other code and check if db.session.add() is needed
             db.session.commit()
-            db.session.refresh(job)
+            # reload the job with everything the response reads
+            job = db.session.get(JobModel, job.id, options=eager_load(JobModel, JobResponseSchema), populate_existing=True)
         except SQLAlchemyError as sqle:
             db.session.rollback()
             import traceback
@@ -264,6 +389,70 @@ class JobByIdResource(MethodView):
         current_app.logger.debug("---------------- FINISHED PATCH JOB --------------")
         return job
 
+    @staticmethod
+    def new_member_rows(job_id, member_uuids):
+        """
+        Check members can be added to a job and return the member_job rows for those not on it yet.
+
+        Every member and whether they're already on the job is read in one query, their rank's name comes from the rank cache.
+        They're checked in the order given so the first bad member is the one reported:
+        404 if the member doesn't exist, 400 if it still has the DEFAULT rank.
+        Members already on the job (or earlier in the list) are skipped.
+        """
+        on_job = (
+            exists()
+            .where(MemberJobModel.job_id == job_id, MemberJobModel.member_id == MemberModel.id)
+            .label("on_job")
+        )
+        found = {
+            member.id: member
+            for member in db.session.execute(
+                select(MemberModel.id, MemberModel.name, MemberModel.rank_id, on_job)
+                .where(MemberModel.id.in_(set(member_uuids)))
+            )
+        }
+        ranks = get_ranks().by_id
+
+        new_rows = []
+        seen = set()
+        for member_uuid in member_uuids:
+            if member_uuid in seen:
+                continue
+            seen.add(member_uuid)
+
+            member = found.get(member_uuid)
+            if member is None:
+                # error out if they're trying to add a member that doesn't exist
+                abort(404, message=f"Member {member_uuid} not found")
+            if member.on_job:
+                continue
+            # if the member has a default rank do not add it & prompt user to update rank first
+            if member.rank_id == DEFAULT_RANK["id"]:
+                abort(400, message=f"At least one member {member.name} ({member.id}) has DEFAULT rank, you must update them before adding to a job")
+
+            new_rows.append({"member_id": member.id, "job_id": job_id, "member_rank": ranks[member.rank_id].name})
+        return new_rows
+
+    @staticmethod
+    def reset_payments(job):
+        """
+        Clear a job's stored payments and queue it for the payments worker to recalculate.
+        """
+        current_app.logger.info("------- RESETTING PAYMENT DATA ------")
+        job.company_cut_amt = None
+        job.remainder_after_payouts = None
+        job.payment_fingerprint = None
+        # one UPDATE for the whole roster rather than one per member on flush
+        db.session.execute(
+            update(MemberJobModel)
+            .where(MemberJobModel.job_id == job.id)
+            .values(member_pay=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(job, ["members_on_job"])
+        # have the payments worker recalculate them so the next reader finds them ready
+        enqueue_recalculation([job.id])
+
     @blp.response(200, MessageSchema)
     def delete(self, job_id):
         """
@@ -277,9 +466,11 @@ class JobByIdResource(MethodView):
             abort(400, message="Invalid job id")
 
         job = JobModel.query.get_or_404(data)
+        member_ids = [jm.member_id for jm in job.members_on_job]
 
         try:
             db.session.delete(job)
+            refresh_member_earnings(member_ids)
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -293,7 +484,69 @@ class JobByIdResource(MethodView):
         return { "message": f"job id {job_id} deleted" }, 200
 
 
-# TODO: refactor this to make less repetitive esp around validating we have all required details
+@blp.route("/job/<job_id>/members")
+class JobMembersResource(MethodView):
+    """
+    Resource for replacing a job's roster.
+    """
+    @blp.arguments(JobRosterSchema)
+    @blp.response(200, JobResponseSchema)
+    def put(self, roster, job_id):
+        """
+        Replace a job's members with the full roster given
+
+        Members not in the roster are removed and members not on the job yet are added, everyone else
+        is left as they are. It's all one transaction, and payments are only reset if something changed.
+        """
+        current_app.logger.debug("---------------- STARTING PUT JOB MEMBERS --------------")
+        current_app.logger.debug(f"Replacing members of job with id: {job_id}")
+        current_app.logger.debug(f"With roster: {roster}")
+        try:
+            job_uuid = UUID(job_id)  # converts string to UUID object
+        except ValueError:
+            abort(400, message="Invalid job id")
+
+        # the roster isn't needed here, the diff is done in the db
+        # the job row is locked first, as PATCH does, see payments.process_recalc_queue
+        job = JobModel.query.options(lazyload(JobModel.members_on_job)).with_for_update(of=JobModel).get_or_404(job_uuid)
+        member_uuids = roster["members"]
+
+        # same checks (and errors) as PATCH add_members, before anything is changed
+        new_rows = JobByIdResource.new_member_rows(job.id, member_uuids)
+
+        try:
+            # the diff is worked out by the db, remove anyone who isn't in the roster...
+            removed_member_ids = list(db.session.execute(
+                delete(MemberJobModel)
+                .where(
+                    MemberJobModel.job_id == job.id,
+                    MemberJobModel.member_id != all_(cast(member_uuids, ARRAY(pgUUID(as_uuid=True)))),
+                )
+                .returning(MemberJobModel.member_id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+            # ...and add anyone who isn't on the job yet
+            if new_rows:
+                db.session.execute(insert(MemberJobModel), new_rows)
+
+            current_app.logger.debug(f"Added {len(new_rows)} and removed {len(removed_member_ids)} members")
+            if new_rows or removed_member_ids:
+                JobByIdResource.reset_payments(job)
+                refresh_member_earnings(member_uuids + removed_member_ids)
+
+            db.session.commit()
+            # reload the job with everything the response reads
+            job = db.session.get(JobModel, job.id, options=eager_load(JobModel, JobResponseSchema), populate_existing=True)
+        except SQLAlchemyError as sqle:
+            current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+
+        current_app.logger.debug(f"Returning job: {job}")
+        current_app.logger.debug("---------------- FINISHED PUT JOB MEMBERS --------------")
+        return job
+
+
 @blp.route("/job/<job_id>/payments")
 class JobWithPaymentsById(MethodView):
     """
@@ -302,51 +555,101 @@ class JobWithPaymentsById(MethodView):
     @blp.response(200, JobResponseSchema)
     def get(self, job_id):
         """
-        Get job by id and calculate its payment amounts
+        Get job by id with its payment amounts
+
+        Nothing is written to the db: the stored payments are returned when they are up to date, otherwise
+        they are calculated in memory. POST stores them.
         """
         current_app.logger.debug("---------------- STARTING GET JOB PAYMENTS --------------")
         current_app.logger.debug(f"Getting payments for job with id: {job_id}")
+        job = self.load_job(job_id)
+        _, payout = self.calculate(job)
+
+        current_app.logger.debug(f"Returning payments for job: {job}, stored: {payout is None}")
+        current_app.logger.debug("---------------- FINISH GET JOB PAYMENTS --------------")
+        return self.preview(job, payout)
+
+    @blp.response(200, JobResponseSchema)
+    def post(self, job_id):
+        """
+        Calculate and store the payment amounts for a job by id
+        """
+        current_app.logger.debug("---------------- STARTING POST JOB PAYMENTS --------------")
+        current_app.logger.debug(f"Storing payments for job with id: {job_id}")
+        job = self.load_job(job_id)
+        fingerprint, payout = self.calculate(job)
+        self.store(job, fingerprint, payout)
+
+        current_app.logger.debug(f"Returning payments for job: {job}")
+        current_app.logger.debug("---------------- FINISH POST JOB PAYMENTS --------------")
+        return job
+
+    @staticmethod
+    def load_job(job_id):
+        """
+        Load a job with its members and their ranks, or abort if there isn't one.
+        """
         try:
             job_uuid = UUID(job_id)  # checks it is a valid UUID format & rejects early
         except ValueError:
             abort(400, message=f"Invalid job -> {job_id}")
 
-        # Eager-load members_on_job, member, and rank
-        job = JobModel.query.options(
-            joinedload(JobModel.members_on_job)
-            .joinedload(MemberJobModel.member)
-            .joinedload(MemberModel.rank)
-        ).get_or_404(job_uuid)
+        # Eager-load members_on_job, member, and rank (the calculation needs rank.share too)
+        return JobModel.query.options(*eager_load(JobModel, JobResponseSchema)).get_or_404(job_uuid)
+
+    @staticmethod
+    def calculate(job):
+        """
+        Work out a job's payments without changing anything.
 
+        Returns (fingerprint, payout), payout is None when the stored payments are already up to date,
+        otherwise it's (company_cut, member_pays, remainder) with member_pays in members_on_job order.
+        """
         if not job.members_on_job:
             abort(400, message="Job has no members, you must PATCH some to the job before requesting payment")
+        if job.total_silver is None:
+            abort(400, message="Job has no total_silver, you must PATCH it before requesting payment")
+
+        shares = [jm.member.rank.share if jm.member and jm.member.rank else 0 for jm in job.members_on_job]
+        if not any(shares):
+            abort(400, message="Job has no member with a share to pay")
+
+        # If nothing the payments depend on has changed since they were stored we can use them as they are
+        # so polling this endpoint doesn't write to the db
+        fingerprint = payment_fingerprint(
+            job.total_silver,
+            zip((jm.member_id for jm in job.members_on_job), shares),
+            COMPANY_CUT
+        )
+        if job.payment_fingerprint == fingerprint:
+            current_app.logger.debug("Payment inputs unchanged, using stored payments")
+            return fingerprint, None
 
         current_app.logger.debug("--------- CALCULATING TOTALS ----------")
+        payout = calculate_job_payout(job.total_silver, shares, COMPANY_CUT)
+        current_app.logger.debug(f"Company cut [{payout[0]}] of job.total_silver [{job.total_silver}] at [{COMPANY_CUT}], remainder [{payout[2]}]")
+        return fingerprint, payout
+
+    @staticmethod
+    def store(job, fingerprint, payout):
+        """
+        Write a payout from calculate() to the job and its members and commit it.
+        """
+        if payout is None:
+            return
 
-        company_cut = job.total_silver * COMPANY_CUT
-        payable_to_members = job.total_silver - company_cut
-        current_app.logger.debug(f"Company cut -> payable_to_members [{payable_to_members}] = job.total_silver [{job.total_silver}] - (job.total_silver [{job.total_silver}] * company_cut [{COMPANY_CUT}]")
+        company_cut, member_pays, remainder = payout
 
-        total_shares = sum(jm.member.rank.share for jm in job.members_on_job if jm.member and jm.member.rank)
-        current_app.logger.debug(f"Total shares -> {total_shares}")
-        
-        value_per_share = payable_to_members / total_shares
-        current_app.logger.debug(f"Value per share [{value_per_share}] -> payable_to_members [{payable_to_members}] / total_shares [{total_shares}]")
-
-        total_paid = 0 # starts at 0
-
-        # Dynamically calculate pay for each member-job
-        for jm in job.members_on_job:
-            jm.member_pay = self.calculate_member_pay(jm.member, value_per_share)
-            current_app.logger.debug(f"Paid to {jm.member.name} -> {jm.member_pay}")
-            current_app.logger.debug(f"value type is {type(jm.member_pay)}")
-            total_paid += jm.member_pay
-        current_app.logger.debug(f"Total Paid -> {total_paid}")
-        
         # Commit the job.company_cut, job.remainder_after_payouts, and member.member_pay to the database
+        # all the member pays go in one statement rather than an UPDATE per member on flush
         try:
-            job.company_cut_amt = company_cut
-            job.remainder_after_payouts = job.total_silver - company_cut - total_paid
+            store_payouts(
+                job_rows=[(job.id, company_cut, remainder, fingerprint)],
+                member_rows=[
+                    (job.id, jm.member_id, member_pay)
+                    for jm, member_pay in zip(job.members_on_job, member_pays)
+                ],
+            )
             db.session.commit()
         except SQLAlchemyError as sqle:
             current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
@@ -357,25 +660,161 @@ class JobWithPaymentsById(MethodView):
             db.session.rollback()
             abort(500, message=str(e))
 
+        # store_payouts doesn't touch the loaded objects, so bring them in line with the db
+        # without marking them as changed
+        set_committed_value(job, "company_cut_amt", company_cut)
+        set_committed_value(job, "remainder_after_payouts", remainder)
+        set_committed_value(job, "payment_fingerprint", fingerprint)
+        for jm, member_pay in zip(job.members_on_job, member_pays):
+            set_committed_value(jm, "member_pay", member_pay)
+            current_app.logger.debug(f"Paid to {jm.member.name} -> {member_pay}")
 
-        current_app.logger.debug(f"Returning payments for job: {job}")
-        current_app.logger.debug("---------------- FINISH GET JOB PAYMENTS --------------")
-        return job
-    
     @staticmethod
-    def calculate_member_pay(member, value_per_share):
+    def preview(job, payout):
         """
-        Calculate a member's pay based on their rank's share.
+        Return a copy of the job with a payout from calculate() applied, for JobResponseSchema to dump.
+
+        The copy is a plain object so the session never sees a change to flush.
         """
-        current_app.logger.debug("--------- CALCULATING PAY FOR MEMBER ----------")
-        current_app.logger.debug(f"Member -> {getattr(member, "name", None)} with {getattr(getattr(member, "rank", None), "share", None)} shares")
-        if not member or not member.rank or not member.rank.share:
-            current_app.logger.debug(f"member or member.rank.share not found")
-            return 0.0
-        
-        member_share = member.rank.share
-        raw_value = Decimal(member_share * value_per_share)
-        return int(raw_value.to_integral_value(rounding=ROUND_DOWN))  # <-- ensures 0 decimals, as we pay only silver not silver copper
+        if payout is None:
+            return job
+
+        company_cut, member_pays, remainder = payout
+        return SimpleNamespace(
+            id=job.id,
+            job_name=job.job_name,
+            job_description=job.job_description,
+            start_date=job.start_date,
+            end_date=job.end_date,
+            total_silver=job.total_silver,
+            company_cut_amt=company_cut,
+            remainder_after_payouts=remainder,
+            members_on_job=[
+                SimpleNamespace(
+                    member_id=jm.member_id,
+                    member_rank=jm.member_rank,
+                    member_pay=member_pay,
+                    member=jm.member,
+                )
+                for jm, member_pay in zip(job.members_on_job, member_pays)
+            ],
+        )
+
+
+@blp.route("/jobs/payments")
+class AllJobsWithPayments(MethodView):
+    """
+    Resource for calculating the payments of many jobs in one request.
+    """
+    @blp.arguments(JobPaymentsRequestSchema)
+    @blp.response(200, JobResponseSchema(many=True))
+    def post(self, selection):
+        """
+        Calculate and store the payments for a list of jobs and/or every job in a date range
+
+        Returns each job as GET /v1/job/<job_id>/payments would, newest first.
+        The whole batch is read and written with a fixed number of statements, and nothing is
+        stored if any job in it cannot be paid. Jobs whose payment inputs haven't changed since
+        they were last calculated are returned as stored and not written again.
+        """
+        current_app.logger.debug("---------------- STARTING POST JOBS PAYMENTS --------------")
+        current_app.logger.debug(f"Calculating payments for: {selection}")
+
+        requested_ids = selection.get("job_ids", [])
+        job_ids = select_job_ids(
+            job_ids=requested_ids,
+            date_from=selection.get("date_from"),
+            date_to=selection.get("date_to"),
+        )
+
+        # only report missing ids when the user didn't also narrow by date
+        # otherwise a job outside the range is expected to be missing
+        if "date_from" not in selection and "date_to" not in selection:
+            found = set(job_ids)
+            missing = [job_id for job_id in requested_ids if job_id not in found]
+            if missing:
+                abort(404, message=f"Job {missing[0]} not found")
+
+        if not job_ids:
+            current_app.logger.debug("No jobs found to calculate")
+            return []
+
+        # Check every job can be paid before we write anything
+        jobs = load_payment_inputs(job_ids)
+        for job in jobs:
+            if job.member_count == 0:
+                abort(400, message=f"Job {job.id} has no members, you must PATCH some to the job before requesting payment")
+            if job.total_silver is None:
+                abort(400, message=f"Job {job.id} has no total_silver, you must PATCH it before requesting payment")
+            if not job.total_shares:
+                abort(400, message=f"Job {job.id} has no member with a share to pay")
+
+        current_app.logger.debug(f"--------- CALCULATING TOTALS FOR {len(job_ids)} JOBS ----------")
+        try:
+            changed = apply_payments(jobs)
+            current_app.logger.debug(f"Stored payments for {len(changed)} changed jobs")
+            db.session.commit()
+        except SQLAlchemyError as sqle:
+            current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+        except Exception as e:
+            current_app.logger.debug(f"500 Exception -> {e}")
+            db.session.rollback()
+            abort(500, message=str(e))
+
+        jobs = load_jobs_with_payments(job_ids)
+
+        current_app.logger.debug(f"Returning payments for jobs: {job_ids}")
+        current_app.logger.debug("---------------- FINISHED POST JOBS PAYMENTS --------------")
+        return jobs
+
+
+@blp.route("/jobs/import")
+class JobsImportResource(MethodView):
+    """
+    Resource for importing jobs in bulk.
+    """
+    @blp.doc(requestBody={
+        "description": (
+            "One job per line (NDJSON) or row (CSV, with a header), with the same fields as POST /job "
+            f"plus members: a list of member ids (in CSV separated by '{CSV_MEMBER_SEPARATOR}')"
+        ),
+        "content": {mimetype: {"schema": {"type": "string"}} for mimetype in IMPORT_FORMATS},
+    })
+    @blp.response(200, JobImportResultSchema)
+    def post(self):
+        """
+        Import jobs, with their members, from NDJSON or CSV
+
+        Every row is validated as POST /job and PATCH add_members would validate it. The valid rows are
+        imported together in one transaction and the invalid ones are returned in errors with their row number.
+        Imported jobs with members are queued for the payments worker.
+        """
+        current_app.logger.debug("---------------- STARTING POST JOBS IMPORT --------------")
+        import_format = IMPORT_FORMATS.get(request.mimetype)
+        if import_format is None:
+            abort(415, message=f"Send the jobs as {' or '.join(IMPORT_FORMATS)}")
+
+        jobs, errors = validate_jobs(read_rows(request.get_data(as_text=True), import_format))
+        current_app.logger.debug(f"Importing {len(jobs)} jobs, {len(errors)} rows rejected")
+
+        try:
+            import_jobs(jobs)
+            db.session.commit()
+        except SQLAlchemyError as sqle:
+            current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+        except Exception as e:
+            # COPY goes through the DBAPI cursor so its errors aren't SQLAlchemyErrors,
+            # and their text (the rows' values) isn't sent back
+            current_app.logger.debug(f"500 Exception -> {e}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+
+        current_app.logger.debug("---------------- FINISHED POST JOBS IMPORT --------------")
+        return {"created": len(jobs), "job_ids": [job["id"] for job in jobs], "errors": errors}
 
 
 ###################################################################################################
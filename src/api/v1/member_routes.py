@@ -8,13 +8,21 @@ Endpoints:
    - PATCH: Update a member with parital or full data
    - DELETE: Delete a member
 
+- /member/<member_id>/earnings:
+    - GET: Get a member's lifetime earnings
+
 - /members:
     - GET: Get all members
 
+- /members/import:
+    - POST: Import many members from NDJSON or CSV
+
 Classes:
  - MemberResource: Resource for creating a member.
  - MemberByIdResource: Resource for managing a specific member by ID.
+ - MemberEarningsResource: Resource for getting a member's earnings.
  - AllMembersResource: Resource for getting all members.
+ - MembersImportResource: Resource for importing members in bulk.
 
 """
 
@@ -24,15 +32,18 @@ Classes:
 #  Imports
 ###################################################################################################
 
-from flask import current_app
+from flask import current_app, request
 from flask.views import MethodView
 from sqlalchemy import asc
 from sqlalchemy.exc import SQLAlchemyError # to catch db errors
+from sqlalchemy.orm import contains_eager
 from flask_smorest import Blueprint, abort # type: ignore
 from uuid import UUID
 
-from src.api.models import MemberModel, RankModel # type: ignore
-from src.api.schemas import MemberSchema, MessageSchema, MemberQueryArgsSchema
+from src.api.imports import IMPORT_FORMATS, import_members, read_rows, validate_members
+from src.api.loaders import eager_load
+from src.api.models import MemberEarningsModel, MemberModel, RankModel # type: ignore
+from src.api.schemas import MemberEarningsSchema, MemberImportResultSchema, MemberSchema, MessageSchema, MemberQueryArgsSchema
 
 from src.extensions import db
 
@@ -95,7 +106,8 @@ class MemberByIdResource(MethodView):
         except ValueError:
             abort(400, message="Invalid member id")
 
-        member = MemberModel.query.get_or_404(data)
+        # load the rank MemberSchema nests with the member, rather than in a second query when it's dumped
+        member = MemberModel.query.options(*eager_load(MemberModel, MemberSchema)).get_or_404(data)
 
         current_app.logger.debug(f"Getting member: {member}")
         current_app.logger.debug("---------------- FINISHED GET MEMBER BY ID --------------")
@@ -169,6 +181,36 @@ class MemberByIdResource(MethodView):
         return { "message": f"Member id {member_id} deleted" }, 200
 
 
+@blp.route("/member/<member_id>/earnings")
+class MemberEarningsResource(MethodView):
+    """
+    Resource for getting a member's lifetime earnings.
+    """
+    @blp.response(200, MemberEarningsSchema)
+    def get(self, member_id):
+        """
+        Get the silver a member has been paid, how many jobs they've been on and when the last one was
+        """
+        current_app.logger.debug("---------------- STARTING GET MEMBER EARNINGS --------------")
+        current_app.logger.debug(f"Getting earnings for member id: {member_id}")
+        try:
+            data = UUID(member_id)  # converts string to UUID object
+        except ValueError:
+            abort(400, message="Invalid member id")
+
+        member = MemberModel.query.get_or_404(data)
+
+        # the aggregate is kept up to date as jobs change, see payments.refresh_member_earnings
+        # a member who has never been on a job doesn't have a row yet
+        earnings = db.session.get(MemberEarningsModel, member.id)
+        if earnings is None:
+            earnings = MemberEarningsModel(member_id=member.id, total_silver=0, job_count=0, last_job_date=None)
+
+        current_app.logger.debug(f"Returning earnings: {earnings.total_silver} silver from {earnings.job_count} jobs")
+        current_app.logger.debug("---------------- FINISHED GET MEMBER EARNINGS --------------")
+        return earnings
+
+
 @blp.route("/members")
 class AllMemberssResource(MethodView):
     """
@@ -182,7 +224,9 @@ class AllMemberssResource(MethodView):
         """
         current_app.logger.debug("---------------- STARTING GET ALL MEMBERS --------------")
         current_app.logger.debug(f"Getting members with args: {args}")
-        query = MemberModel.query.join(MemberModel.rank)
+        # we join rank for the ordering anyway, so fill member.rank from that join
+        # otherwise MemberSchema lazy loads each member's rank as it dumps them
+        query = MemberModel.query.join(MemberModel.rank).options(contains_eager(MemberModel.rank))
 
         # Apply filter if provided
         # Apply filter only if the argument exists
@@ -201,6 +245,43 @@ class AllMemberssResource(MethodView):
         current_app.logger.debug("---------------- FINISHED GET ALL MEMBERS --------------")
         return members
 
+
+@blp.route("/members/import")
+class MembersImportResource(MethodView):
+    """
+    Resource for importing members in bulk.
+    """
+    @blp.doc(requestBody={
+        "description": "One member per line (NDJSON) or row (CSV, with a header) with name, rank (the rank's name or id) and optionally active",
+        "content": {mimetype: {"schema": {"type": "string"}} for mimetype in IMPORT_FORMATS},
+    })
+    @blp.response(200, MemberImportResultSchema)
+    def post(self):
+        """
+        Import members from NDJSON or CSV
+
+        The valid rows are imported together in one transaction and the invalid ones, e.g. an unknown rank
+        or a name that's already taken, are returned in errors with their row number.
+        """
+        current_app.logger.debug("---------------- STARTING POST MEMBERS IMPORT --------------")
+        import_format = IMPORT_FORMATS.get(request.mimetype)
+        if import_format is None:
+            abort(415, message=f"Send the members as {' or '.join(IMPORT_FORMATS)}")
+
+        members, errors = validate_members(read_rows(request.get_data(as_text=True), import_format))
+        current_app.logger.debug(f"Importing {len(members)} members, {len(errors)} rows rejected")
+
+        try:
+            created, conflicts = import_members(members)
+            db.session.commit()
+        except SQLAlchemyError as sqle:
+            current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+
+        current_app.logger.debug("---------------- FINISHED POST MEMBERS IMPORT --------------")
+        return {"created": created, "errors": sorted(errors + conflicts, key=lambda error: error["row"])}
+
 ###################################################################################################
 #  End of File
 ###################################################################################################
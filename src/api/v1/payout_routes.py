@@ -0,0 +1,74 @@
+"""
+This module defines flask-smorest resources for endpoints.
+
+Endpoints:
+ - /payouts/export:
+   - GET: Stream every stored member payout for jobs in a date range as CSV or NDJSON
+
+Classes:
+ - PayoutExportResource: Resource for exporting payouts.
+
+"""
+
+## Detailed commentary is on the rank_routes.py file, check there if anything is unclear.
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+from flask import Response, current_app, stream_with_context
+from flask.views import MethodView
+from flask_smorest import Blueprint # type: ignore
+
+from src.api.exports import stream_payouts, to_csv, to_ndjson
+from src.api.schemas import PayoutExportArgsSchema
+
+
+###################################################################################################
+#  Config
+###################################################################################################
+
+blp = Blueprint("payout", __name__, url_prefix="/v1", description="Operations on payouts")
+
+EXPORT_FORMATS = {
+    "csv": (to_csv, "text/csv"),
+    "ndjson": (to_ndjson, "application/x-ndjson"),
+}
+
+
+###################################################################################################
+#  Classes (flask-smorest resources)
+###################################################################################################
+
+@blp.route("/payouts/export")
+class PayoutExportResource(MethodView):
+    """
+    Resource for exporting payouts.
+    """
+    @blp.arguments(PayoutExportArgsSchema, location="query")
+    def get(self, args):
+        """
+        Export payouts for jobs starting between from and to (inclusive)
+
+        One row per paid member per job: job_id, job_name, start_date, member_id, member_name, member_rank, member_pay.
+        The response is streamed from a server-side cursor, so it starts straight away and memory use
+        doesn't grow with the size of the range.
+        """
+        current_app.logger.debug("---------------- STARTING GET PAYOUTS EXPORT --------------")
+        current_app.logger.debug(f"Exporting payouts with args: {args}")
+
+        render, mimetype = EXPORT_FORMATS[args["format"]]
+        chunks = render(stream_payouts(args.get("date_from"), args.get("date_to")))
+
+        current_app.logger.debug("---------------- STREAMING PAYOUTS EXPORT --------------")
+        # stream_with_context keeps the app context (and so the db session) alive while the rows are sent
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=payouts.{args['format']}"},
+        )
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
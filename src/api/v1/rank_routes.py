@@ -11,10 +11,14 @@ Endpoints:
 - /ranks:
     - GET: Get all ranks
 
+- /ranks/order:
+    - PUT: Reorder every rank at once
+
 Classes:
  - RankResource: Resource for CRUD a rank.
  - RankByIdResource: Resource for getting a rank by ID.
  - AllRanksResource: Resource for getting all ranks.
+ - RanksOrderResource: Resource for reordering the ranks.
 
 """
 
@@ -24,12 +28,15 @@ Classes:
 
 from flask import current_app
 from flask.views import MethodView
+from sqlalchemy import cast, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as pgUUID # type: ignore
 from sqlalchemy.exc import SQLAlchemyError # to catch db errors
 from flask_smorest import Blueprint, abort # type: ignore
 from uuid import UUID
 
 from src.api.models import MemberModel, RankModel # type: ignore
-from src.api.schemas import MessageSchema, RankQueryArgsSchema, RankSchema
+from src.api.rank_cache import bump_rank_version
+from src.api.schemas import MessageSchema, RankOrderSchema, RankQueryArgsSchema, RankSchema
 from src.constants import DEFAULT_RANK
 
 from src.extensions import db
@@ -66,6 +73,7 @@ class RankResource(MethodView):
         try:
             rank = RankModel(**new_data) # can do this as we've validated data with .arguments above
             db.session.add(rank)
+            bump_rank_version() # so every worker reloads its cached ranks
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -155,6 +163,7 @@ class RankByIdResource(MethodView):
 
         try:
             db.session.add(rank)
+            bump_rank_version() # so every worker reloads its cached ranks
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -191,6 +200,7 @@ class RankByIdResource(MethodView):
     
         try:
             db.session.delete(rank)
+            bump_rank_version() # so every worker reloads its cached ranks
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -221,6 +231,70 @@ class AllRanksResource(MethodView):
         current_app.logger.debug("---------------- FINISHED GET ALL RANKS --------------")
         return ranks
 
+
+@blp.route("/ranks/order")
+class RanksOrderResource(MethodView):
+    """
+    Resource for reordering the ranks.
+    """
+    @blp.arguments(RankOrderSchema)
+    @blp.response(200, RankSchema(many=True))
+    def put(self, order_data):
+        """
+        Reorder the ranks
+
+        Takes the id of every rank except the default, highest first, and gives them positions 1, 2, 3...
+        All the positions are rewritten together, so a rank can be put in the middle of the ladder in one call.
+        """
+        current_app.logger.debug("---------------- STARTING PUT RANKS ORDER --------------")
+        current_app.logger.debug(f"Ordering ranks: {order_data}")
+        rank_ids = order_data["ranks"]
+
+        if DEFAULT_RANK["id"] in rank_ids:
+            abort(400, message="The default rank always comes last, leave it out of the order")
+        if len(rank_ids) >= DEFAULT_RANK["position"]:
+            abort(400, message=f"There can be at most {DEFAULT_RANK['position'] - 1} ranks above the default rank")
+
+        seen = set()
+        for rank_id in rank_ids:
+            if rank_id in seen:
+                abort(400, message=f"Rank {rank_id} is listed more than once")
+            seen.add(rank_id)
+
+        existing = set(db.session.scalars(select(RankModel.id).where(RankModel.id != DEFAULT_RANK["id"])))
+        for rank_id in rank_ids:
+            if rank_id not in existing:
+                abort(404, message=f"Rank {rank_id} not found")
+        missing = existing - seen
+        if missing:
+            abort(400, message=f"Every rank must be in the order, missing: {', '.join(sorted(str(rank_id) for rank_id in missing))}")
+
+        # position is each id's place in the list, one UPDATE for all of them
+        # ranks_position_key is deferrable so it's checked once the statement has finished, not for each row
+        # (otherwise swapping two ranks fails on whichever is updated first)
+        order = func.unnest(cast(rank_ids, ARRAY(pgUUID(as_uuid=True)))).table_valued("id", with_ordinality="position").render_derived(name="rank_order")
+        try:
+            db.session.execute(
+                update(RankModel)
+                .values(position=order.c.position)
+                .where(RankModel.id == order.c.id)
+                .execution_options(synchronize_session=False)
+            )
+            bump_rank_version() # so every worker reloads its cached ranks
+            db.session.commit()
+        except SQLAlchemyError as sqle:
+            current_app.logger.debug(f"500 SQLAlchemyError -> {sqle}")
+            db.session.rollback()
+            abort(500, message="An error occurred when inserting to db")
+
+        ranks = db.session.scalars(
+            select(RankModel).order_by(RankModel.position.asc()).execution_options(populate_existing=True)
+        ).all()
+
+        current_app.logger.debug(f"Returning ranks: {ranks}")
+        current_app.logger.debug("---------------- FINISHED PUT RANKS ORDER --------------")
+        return ranks
+
 ###################################################################################################
 #  End of File
 ###################################################################################################
@@ -0,0 +1,100 @@
+"""
+Flask CLI commands.
+
+Each group is registered on the app in create_app (see register_commands in __init__.py) and
+run with the flask command, e.g.
+
+    uv run flask --app run:app payments worker
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import os
+import time
+
+import click
+
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.api.imports import IMPORT_FORMATS, import_members, read_rows, validate_members
+from src.api.payments import process_recalc_queue
+from src.extensions import db
+
+###################################################################################################
+#  Commands
+###################################################################################################
+
+payments_cli = AppGroup("payments", help="Payment commands.")
+
+
+@payments_cli.command("worker")
+@click.option("--batch-size", default=50, show_default=True, help="Jobs to recalculate per transaction.")
+@click.option("--poll-interval", default=2.0, show_default=True, help="Seconds to wait when the queue is empty.")
+@click.option("--once", is_flag=True, help="Empty the queue then exit, rather than waiting for more.")
+def payments_worker(batch_size, poll_interval, once):
+    """
+    Recalculate the payments of jobs queued by PATCH /v1/job/<job_id>.
+
+    Any number of workers can run at once, each claims its own jobs from the queue.
+    """
+    current_app.logger.info("---------- starting payments worker ----------")
+    total = 0
+    while True:
+        try:
+            processed = process_recalc_queue(batch_size)
+        except SQLAlchemyError as sqle:
+            # leave the jobs queued to be tried again on the next poll
+            current_app.logger.error(f"Payments worker failed to process a batch -> {sqle}")
+            db.session.rollback()
+            processed = 0
+
+        total += processed
+        if processed:
+            current_app.logger.info(f"Recalculated payments for {processed} queued jobs")
+            continue
+        if once:
+            break
+        time.sleep(poll_interval)
+
+    click.echo(f"Recalculated payments for {total} jobs")
+
+
+members_cli = AppGroup("members", help="Member commands.")
+
+
+@members_cli.command("import")
+@click.argument("file", type=click.File("r", encoding="utf-8"))
+@click.option("--format", "import_format", type=click.Choice(sorted(IMPORT_FORMATS.values())),
+              help="The file's format, by default from its extension (.csv or .ndjson).")
+def members_import(file, import_format):
+    """
+    Import the members in FILE, as POST /v1/members/import would.
+
+    Each row has a name, a rank (the rank's name or id) and optionally active.
+    """
+    if import_format is None:
+        import_format = os.path.splitext(file.name)[1].lstrip(".").lower()
+        if import_format not in IMPORT_FORMATS.values():
+            raise click.UsageError("Can't tell the format from the file name, use --format.")
+
+    members, errors = validate_members(read_rows(file.read(), import_format))
+    try:
+        created, conflicts = import_members(members)
+        db.session.commit()
+    except SQLAlchemyError as sqle:
+        db.session.rollback()
+        raise click.ClickException(f"Import failed, no members were added -> {sqle}")
+
+    for error in sorted(errors + conflicts, key=lambda error: error["row"]):
+        messages = "; ".join(f"{field}: {' '.join(message)}" for field, message in error["errors"].items())
+        click.echo(f"Row {error['row']} rejected: {messages}", err=True)
+    click.echo(f"Imported {len(created)} members, rejected {len(errors) + len(conflicts)} rows")
+
+
+###################################################################################################
+#  End of file
+###################################################################################################
@@ -0,0 +1,92 @@
+"""
+Time-ordered ids.
+
+Primary keys default to UUIDv7 (RFC 9562) rather than the random UUIDv4: the first 48 bits are
+the creation time in milliseconds, so new rows go in at the right-hand edge of the primary key
+and foreign key B-trees instead of all over them.
+
+Ids from this process are strictly increasing: within the same millisecond the 12 bits after the
+timestamp count up from a random start, and if they run out the timestamp is moved on by 1ms.
+
+Existing UUIDv4 ids stay valid, they're still UUIDs in the same columns, but they sort by their
+random bits rather than when they were made. Nothing should rely on id order for creation order,
+jobs have created_at for that (GET /jobs?order=created).
+
+Python 3.14 has uuid.uuid7 in the standard library, it's used when available.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import os
+import threading
+import time
+
+from uuid import UUID
+
+
+###################################################################################################
+#  Constants
+###################################################################################################
+
+COUNTER_BITS = 12 # rand_a in RFC 9562, used as a counter for ids made in the same millisecond
+COUNTER_START_MAX = 1 << (COUNTER_BITS - 1) # start at a random point in the lower half to leave room to count up
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _uuid7() -> UUID:
+    """
+    Return a new UUIDv7, later than any this process has returned before.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) % COUNTER_START_MAX
+        else:
+            # same millisecond (or the clock went back): count on from the last id
+            _counter += 1
+            if _counter >> COUNTER_BITS:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76 # version
+        | counter << 64
+        | 0b10 << 62 # variant
+        | rand_b
+    )
+    return UUID(int=value)
+
+
+try:
+    from uuid import uuid7 # type: ignore # Python 3.14+
+except ImportError:
+    uuid7 = _uuid7
+
+
+def uuid7_time_ms(value: UUID) -> int | None:
+    """
+    The creation time (unix milliseconds) held in a UUIDv7, None for any other version.
+    """
+    if value.version != 7:
+        return None
+    return value.int >> 80
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
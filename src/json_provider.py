@@ -0,0 +1,86 @@
+"""
+JSON provider for the app's responses.
+
+Every response body (smorest dumps with marshmallow, then jsonify) is encoded by app.json. Flask's
+DefaultJSONProvider uses the json module, whose pure-Python encoder shows up in profiles of large
+job lists. OrjsonProvider encodes with orjson (written in Rust) straight to bytes instead.
+
+orjson is optional: create_json_provider falls back to Flask's provider when it isn't installed,
+or when JSON_PROVIDER is set to "json".
+
+The output is the same as the default provider's except that non-ASCII characters are written as
+UTF-8 rather than escaped as \\uXXXX, orjson has no ensure_ascii. Keys are still sorted, dates and
+datetimes still go through Flask's default (HTTP dates) and it's still compact unless in debug mode.
+dumps() is compact too, where the json module puts a space after each , and :.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError: # optional, the json module is used without it
+    orjson = None
+
+
+###################################################################################################
+#  Classes
+###################################################################################################
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider encoding with orjson.
+    """
+    ensure_ascii = False # orjson always writes UTF-8, read by job_json.json_response
+
+    def _options(self, indent=False):
+        # dates and dataclasses are passed to default so they come out as the default provider writes them
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # json module options (e.g. indent for the OpenAPI spec), leave those to it
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options(indent)) + b"\n",
+            mimetype=self.mimetype,
+        )
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def create_json_provider(app):
+    """
+    Return the JSON provider for app: orjson's unless JSON_PROVIDER is "json" or orjson isn't installed.
+    """
+    name = app.config.get("JSON_PROVIDER", "orjson")
+    if name == "orjson" and orjson is None:
+        app.logger.info("orjson is not installed, using the json module for responses")
+        name = "json"
+    app.logger.debug(f"JSON provider: {name}")
+    return OrjsonProvider(app) if name == "orjson" else DefaultJSONProvider(app)
+
+
+###################################################################################################
+#  End of file
+###################################################################################################
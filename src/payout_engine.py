@@ -0,0 +1,180 @@
+"""
+Payout engine.
+
+Works out the company cut, each member's pay and what is left over for one or many jobs.
+It has no Flask or SQLAlchemy imports so it can be used (and benchmarked) outside of a
+request, e.g. by the payment routes, bulk jobs and benchmarks/bench_payout_engine.py.
+
+All the maths is done in whole numbers:
+ - the company cut is held in basis points (0.1 -> 1000) and rounded down to whole silver
+ - shares are held in hundredths (they are stored in x.xx format, 0.75 -> 75)
+ - each member gets floor(payable_to_members * member_share / total_shares)
+so the results are exact and don't depend on float rounding.
+
+If NumPy is installed it is used for large batches, otherwise everything runs in plain python.
+"""
+
+###################################################################################################
+#  Imports
+###################################################################################################
+
+import hashlib
+
+from typing import Iterable, NamedTuple, Sequence
+
+try:
+    import numpy as np # type: ignore
+except ImportError: # NumPy is optional
+    np = None
+
+
+###################################################################################################
+#  Constants
+###################################################################################################
+
+CUT_SCALE = 10_000 # company cut is held in basis points
+SHARE_SCALE = 100 # shares are held in hundredths
+NUMPY_THRESHOLD = 128 # below this many members plain python is quicker than NumPy's overhead (see benchmarks/)
+
+
+###################################################################################################
+#  Classes
+###################################################################################################
+
+class Payouts(NamedTuple):
+    """
+    The result of a payout calculation.
+
+    :company_cuts: The company cut for each job, in the order of the totals passed in.
+    :member_pays: The pay for each member, in the order of the shares passed in.
+    :remainders: What is left for each job after the company cut and member pay.
+    """
+    company_cuts: list[int]
+    member_pays: list[int]
+    remainders: list[int]
+
+
+###################################################################################################
+#  Functions
+###################################################################################################
+
+def cut_to_basis_points(company_cut) -> int:
+    """
+    Convert a company cut fraction (0.1, or "0.1" when read from the env) to basis points.
+    """
+    return int(round(float(company_cut) * CUT_SCALE))
+
+
+def share_to_units(share) -> int:
+    """
+    Convert a rank share (e.g. 0.75) to whole hundredths, treating a missing share as 0.
+    """
+    return int(round((share or 0) * SHARE_SCALE))
+
+
+def calculate_payouts(
+    totals: Sequence[int],
+    shares: Sequence[float],
+    job_index: Sequence[int],
+    company_cut,
+    use_numpy: bool | None = None,
+) -> Payouts:
+    """
+    Calculate the payouts for a batch of jobs.
+
+    :totals: The total_silver of each job.
+    :shares: The rank share of every member, across all of the jobs.
+    :job_index: For each member, the position of their job in totals.
+    :company_cut: The fraction of each total the company keeps, e.g. 0.1.
+    :use_numpy: Force (True) or skip (False) NumPy, by default it's used for large batches when installed.
+
+    A job whose members have no shares pays nobody and keeps everything in its remainder.
+    """
+    if len(shares) != len(job_index):
+        raise ValueError("shares and job_index must be the same length")
+
+    if use_numpy is None:
+        use_numpy = np is not None and len(shares) >= NUMPY_THRESHOLD
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+
+    cut_bp = cut_to_basis_points(company_cut)
+    if use_numpy:
+        return _calculate_payouts_numpy(totals, shares, job_index, cut_bp)
+    return _calculate_payouts_python(totals, shares, job_index, cut_bp)
+
+
+def calculate_job_payout(total: int, shares: Sequence[float], company_cut) -> tuple[int, list[int], int]:
+    """
+    Calculate the payout for a single job.
+
+    Returns (company_cut_amt, member_pays, remainder_after_payouts), member_pays in the order of shares.
+    """
+    payouts = calculate_payouts([total], shares, [0] * len(shares), company_cut)
+    return payouts.company_cuts[0], payouts.member_pays, payouts.remainders[0]
+
+
+def payment_fingerprint(total: int, member_shares: Iterable[tuple[object, float]], company_cut) -> str:
+    """
+    Return a fingerprint of everything a job's payout depends on.
+
+    :total: The job's total_silver.
+    :member_shares: (member_id, share) for each member on the job, in any order.
+    :company_cut: The company cut the payout is calculated with.
+
+    If the fingerprint matches the one stored with the last payout, recalculating would give the same answer.
+    """
+    roster = ",".join(sorted(f"{member_id}:{share_to_units(share)}" for member_id, share in member_shares))
+    key = f"{total}|{cut_to_basis_points(company_cut)}|{roster}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _calculate_payouts_python(totals, shares, job_index, cut_bp):
+    company_cuts = [total * cut_bp // CUT_SCALE for total in totals]
+    payable = [total - cut for total, cut in zip(totals, company_cuts)]
+
+    units = [share_to_units(share) for share in shares]
+    job_units = [0] * len(totals)
+    for job, member_units in zip(job_index, units):
+        job_units[job] += member_units
+
+    member_pays = [
+        payable[job] * member_units // job_units[job] if job_units[job] else 0
+        for job, member_units in zip(job_index, units)
+    ]
+
+    paid = [0] * len(totals)
+    for job, pay in zip(job_index, member_pays):
+        paid[job] += pay
+
+    remainders = [pay_left - total_paid for pay_left, total_paid in zip(payable, paid)]
+    return Payouts(company_cuts, member_pays, remainders)
+
+
+def _calculate_payouts_numpy(totals, shares, job_index, cut_bp):
+    totals_arr = np.asarray(totals, dtype=np.int64)
+    company_cuts = totals_arr * cut_bp // CUT_SCALE
+    payable = totals_arr - company_cuts
+
+    # None shares become nan, which we treat as 0 units
+    shares_arr = np.asarray(shares, dtype=np.float64)
+    units = np.rint(np.nan_to_num(shares_arr) * SHARE_SCALE).astype(np.int64)
+    index = np.asarray(job_index, dtype=np.intp)
+
+    # NOTE: bincount sums in float64, which is exact for anything below 2**53
+    job_units = np.bincount(index, weights=units, minlength=len(totals_arr)).astype(np.int64)
+    member_units = job_units[index]
+    member_pays = np.where(
+        member_units > 0,
+        payable[index] * units // np.maximum(member_units, 1),
+        0,
+    )
+
+    paid = np.bincount(index, weights=member_pays, minlength=len(totals_arr)).astype(np.int64)
+    remainders = payable - paid
+    return Payouts(company_cuts.tolist(), member_pays.tolist(), remainders.tolist())
+
+
+###################################################################################################
+#  End of File
+###################################################################################################
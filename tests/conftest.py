@@ -19,6 +19,7 @@ from sqlalchemy import inspect
 from constants import DEFAULT_RANK # type: ignore
 from src import create_app, db as _db
 from src.api.models import JobModel, MemberModel, RankModel # type: ignore
+from src.api.rank_cache import invalidate_rank_cache
 
 
 ###################################################################################################
@@ -95,6 +96,18 @@ def session(app):
     session.remove()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def rank_cache():
+    """
+    Start each test with an empty rank cache.
+    The ranks are rolled back after each test but the version they were cached at is too,
+    so the cache can't tell the next test's ranks from the last one's.
+    """
+    invalidate_rank_cache()
+    yield
+    invalidate_rank_cache()
+
+
 ###################################################################################################
 # Seeds
 ###################################################################################################
@@ -188,6 +201,22 @@ def job_with_members(client, sample_jobs, sample_members):
     }
 
 
+@pytest.fixture
+def two_jobs_with_members(client, job_with_members, sample_jobs, sample_members):
+    """
+    Adds members to the second job too, so there are two payable jobs and five roster rows.
+    Returns the two jobs.
+    """
+    second_job = sample_jobs[1]
+    response = client.patch(
+        f"/v1/job/{second_job.id}",
+        json={"add_members": [str(sample_members[1].id), str(sample_members[3].id)]}
+    )
+    assert response.status_code == 200
+
+    return [job_with_members["job"], second_job]
+
+
 ###################################################################################################
 #  END OF FILE
 ###################################################################################################
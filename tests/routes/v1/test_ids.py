@@ -0,0 +1,133 @@
+"""
+Tests for the UUIDv7 ids (src/ids.py) and GET /v1/jobs?order=created
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import datetime
+import time
+import uuid
+
+from src import ids
+from src.api.models import JobModel, MemberModel # type: ignore
+from src.ids import uuid7, uuid7_time_ms
+from tests.test_helpers import job_names, walk_pages
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestUuid7:
+    def test_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = ids._uuid7()
+        after = time.time_ns() // 1_000_000
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert before <= uuid7_time_ms(value) <= after + 1
+
+    def test_increasing(self):
+        """
+        Tests ids made one after another sort in the order they were made, even in the same millisecond.
+        """
+        values = [ids._uuid7() for _ in range(5000)]
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_counter_overflow(self, monkeypatch):
+        """
+        Tests running out of counter in one millisecond moves the timestamp on rather than repeating.
+        """
+        monkeypatch.setattr(ids.time, "time_ns", lambda: 4_102_444_800_000 * 1_000_000) # a fixed clock
+        values = [ids._uuid7() for _ in range(1 << ids.COUNTER_BITS)]
+        assert values == sorted(values)
+        assert uuid7_time_ms(values[-1]) == uuid7_time_ms(values[0]) + 1
+
+    def test_clock_going_back(self, monkeypatch):
+        first = ids._uuid7()
+        monkeypatch.setattr(ids.time, "time_ns", lambda: 0)
+        assert ids._uuid7() > first
+
+    def test_time_of_v4(self):
+        assert uuid7_time_ms(uuid.uuid4()) is None
+
+    def test_model_defaults(self, db, sample_members, sample_jobs, sample_ranks):
+        for row in sample_members + sample_jobs + sample_ranks:
+            assert row.id.version == 7
+        assert isinstance(uuid7(), uuid.UUID)
+
+
+class TestJobsOrderCreated:
+    def test_newest_created_first(self, client, sample_jobs):
+        """
+        Tests order=created ignores start_date.
+        """
+        response = client.post("/v1/job", json={"job_name": "Last made", "start_date": "2020-01-01"})
+        assert response.status_code == 201
+        assert job_names(client.get("/v1/jobs?order=created")) == [
+            "Last made",
+            "Adhoc troll tusks",
+            "Grace artifact",
+            "Ogres in Hinterlands",
+        ]
+
+    def test_pages(self, client, sample_jobs):
+        """
+        Tests paging in order=created, pages don't overlap.
+        """
+        pages = walk_pages(client, "/v1/jobs?order=created&limit=2")
+        assert [len(page) for page in pages] == [2, 1]
+        assert [job["job_name"] for page in pages for job in page] == ["Adhoc troll tusks", "Grace artifact", "Ogres in Hinterlands"]
+
+    def test_v4_and_v7_ids(self, client, db):
+        """
+        Tests creation order doesn't come from the ids, a UUIDv4 job made first is still listed after a UUIDv7 one.
+        """
+        for _ in range(5):
+            db.session.add(JobModel(id=uuid.uuid4(), job_name="Old style id"))
+            db.session.flush()
+            db.session.add(JobModel(job_name="New style id"))
+            db.session.flush()
+        db.session.commit()
+        expected = ["New style id", "Old style id"] * 5
+        assert job_names(client.get("/v1/jobs?order=created")) == expected
+        pages = walk_pages(client, "/v1/jobs?order=created&limit=3")
+        assert [job["job_name"] for page in pages for job in page] == expected
+
+    def test_backfilled_jobs_last(self, client, db, sample_jobs):
+        """
+        Tests jobs from before created_at (backfilled with the epoch) come after every newer job, on any page.
+        """
+        epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+        db.session.add_all([JobModel(id=uuid.uuid4(), job_name=f"Legacy {i}", created_at=epoch) for i in range(3)])
+        db.session.commit()
+        names = [job["job_name"] for page in walk_pages(client, "/v1/jobs?order=created&limit=2") for job in page]
+        assert names[:3] == ["Adhoc troll tusks", "Grace artifact", "Ogres in Hinterlands"]
+        assert sorted(names[3:]) == ["Legacy 0", "Legacy 1", "Legacy 2"]
+
+    def test_start_date_cursor_rejected(self, client, sample_jobs):
+        cursor = client.get("/v1/jobs?limit=1").headers["X-Next-Cursor"]
+        response = client.get(f"/v1/jobs?order=created&limit=1&cursor={cursor}")
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "Invalid cursor"
+
+    def test_v4_ids_still_work(self, client, db, sample_ranks):
+        """
+        Tests rows made before the switch, with UUIDv4 ids, are still found and listed.
+        """
+        job = JobModel(id=uuid.uuid4(), job_name="Legacy", start_date=datetime.date(2024, 1, 1))
+        member = MemberModel(id=uuid.uuid4(), name="Old timer", rank_id=sample_ranks[0].id)
+        db.session.add_all([job, member])
+        db.session.commit()
+
+        assert client.get(f"/v1/job/{job.id}").status_code == 200
+        assert client.patch(f"/v1/job/{job.id}", json={"add_members": [str(member.id)]}).status_code == 200
+        assert "Legacy" in job_names(client.get("/v1/jobs?order=created"))
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
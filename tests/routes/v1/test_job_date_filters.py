@@ -0,0 +1,94 @@
+"""
+Tests for the from, to and ends_before filters on GET /v1/jobs
+
+The sample jobs are Ogres (2025-04-23 to 2025-04-28), Grace (2025-04-29) and Trolls (2025-05-03).
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import datetime
+
+import pytest
+
+from src.api.models import JobModel # type: ignore
+from tests.test_helpers import job_names
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestJobDateFilters:
+    @pytest.mark.parametrize("query, expected", [
+        ("from=2025-04-28", ["Adhoc troll tusks", "Grace artifact", "Ogres in Hinterlands"]),
+        ("from=2025-04-29", ["Adhoc troll tusks", "Grace artifact"]),
+        ("to=2025-04-23", ["Ogres in Hinterlands"]),
+        ("to=2025-04-22", []),
+        ("from=2025-04-24&to=2025-04-27", ["Ogres in Hinterlands"]),
+        ("from=2025-04-28&to=2025-04-29", ["Grace artifact", "Ogres in Hinterlands"]),
+        ("from=2025-05-01&to=2025-05-31", ["Adhoc troll tusks"]),
+        ("from=2025-04-30&to=2025-05-02", []),
+    ])
+    def test_period(self, client, sample_jobs, query, expected):
+        """
+        Tests a multiday job is in any period that overlaps any of its days.
+        """
+        assert job_names(client.get(f"/v1/jobs?{query}")) == expected
+
+    @pytest.mark.parametrize("ends_before, expected", [
+        ("2025-04-28", []),
+        ("2025-04-29", ["Ogres in Hinterlands"]),
+        ("2025-05-03", ["Grace artifact", "Ogres in Hinterlands"]),
+        ("2025-05-04", ["Adhoc troll tusks", "Grace artifact", "Ogres in Hinterlands"]),
+    ])
+    def test_ends_before(self, client, sample_jobs, ends_before, expected):
+        """
+        Tests a job has ended before a date when its last day is before it.
+        """
+        assert job_names(client.get(f"/v1/jobs?ends_before={ends_before}")) == expected
+
+    def test_combined_with_ends_before(self, client, sample_jobs):
+        assert job_names(client.get("/v1/jobs?from=2025-04-25&ends_before=2025-05-01")) == ["Grace artifact", "Ogres in Hinterlands"]
+
+    def test_end_date_before_start_date(self, client, db, sample_jobs):
+        """
+        Tests a job whose end_date is before its start_date is treated as a one day job rather than an error.
+        """
+        db.session.add(JobModel(job_name="Backwards", start_date=datetime.date(2025, 6, 10), end_date=datetime.date(2025, 6, 1)))
+        db.session.commit()
+        assert job_names(client.get("/v1/jobs?from=2025-06-05&to=2025-06-10")) == ["Backwards"]
+        assert job_names(client.get("/v1/jobs?from=2025-06-01&to=2025-06-09")) == []
+
+    def test_summary_view(self, client, sample_jobs):
+        response = client.get("/v1/jobs?from=2025-04-29&view=summary")
+        assert job_names(response) == ["Adhoc troll tusks", "Grace artifact"]
+
+    def test_pages(self, client, sample_jobs):
+        """
+        Tests paging through a period only returns jobs in the period.
+        """
+        first = client.get("/v1/jobs?to=2025-04-30&limit=1")
+        assert job_names(first) == ["Grace artifact"]
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/v1/jobs?to=2025-04-30&limit=1&cursor={cursor}")
+        assert job_names(second) == ["Ogres in Hinterlands"]
+        assert "X-Next-Cursor" not in second.headers
+
+
+class TestJobDateFilterErrors:
+    def test_from_after_to(self, client, sample_jobs):
+        response = client.get("/v1/jobs?from=2025-05-01&to=2025-04-01")
+        assert response.status_code == 422
+        assert response.get_json()["errors"]["query"] == {"from": ["from must be on or before to."]}
+
+    @pytest.mark.parametrize("query", ["from=yesterday", "to=2025-13-01", "ends_before=soon"])
+    def test_invalid_dates(self, client, query):
+        response = client.get(f"/v1/jobs?{query}")
+        assert response.status_code == 422
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
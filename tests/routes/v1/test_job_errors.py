@@ -226,6 +226,23 @@ class TestPostJobErrors:
         assert data == expected_response
 
 
+    def test_post_job_total_silver_too_large(self, client):
+        """
+        Tests that a total_silver too large for the db column is rejected rather than failing the insert
+        """
+        new_job = {
+            "job_name": "Ogres in Hinterlands",
+            "start_date": "2025-04-23",
+            "total_silver": 3_000_000_000
+        }
+        response = client.post("/v1/job", json=new_job)
+
+        assert response.status_code == 422
+        assert response.get_json()["errors"]["json"] == {
+            "total_silver": ["total_silver must not exceed 2147483647."]
+        }
+
+
     def test_post_job_sqlalchemy_error(self, client, monkeypatch):
         """
         Tests that a 500 response with a message is returned if the POST raises a SQLAlchemyError.
@@ -0,0 +1,187 @@
+"""
+Tests for POST /v1/jobs/import
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import json
+import uuid
+
+from constants import DEFAULT_RANK # type: ignore
+from src.api import imports
+from src.api.models import PaymentRecalcQueueModel # type: ignore
+from src.extensions import db
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def post_ndjson(client, rows):
+    body = "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+    return client.post("/v1/jobs/import", data=body, content_type="application/x-ndjson")
+
+
+def post_csv(client, body):
+    return client.post("/v1/jobs/import", data=body, content_type="text/csv")
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestJobImport:
+    def test_ndjson_import(self, client, sample_members):
+        """
+        Tests jobs and their rosters are imported and can be read back.
+        """
+        bob, charlie = sample_members[0], sample_members[1]
+        response = post_ndjson(client, [
+            {"job_name": "Raid one", "start_date": "2025-01-02", "total_silver": 1000, "members": [str(bob.id), str(charlie.id)]},
+            {"job_name": "Raid two", "job_description": "No roster yet", "start_date": "2025-01-03", "end_date": "2025-01-04"},
+        ])
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["created"] == 2
+        assert result["errors"] == []
+
+        first = client.get(f"/v1/job/{result['job_ids'][0]}").get_json()
+        assert first["job_name"] == "Raid one"
+        assert first["total_silver"] == 1000
+        assert sorted((jm["member_name"], jm["member_rank"]) for jm in first["members_on_job"]) == [
+            ("Bob", "Captain"),
+            ("Charlie", "Lieutenant"),
+        ]
+
+        second = client.get(f"/v1/job/{result['job_ids'][1]}").get_json()
+        assert second["job_description"] == "No roster yet"
+        assert second["end_date"] == "2025-01-04"
+        assert second["members_on_job"] == []
+
+    def test_csv_import(self, client, sample_members):
+        """
+        Tests a CSV with members separated by ; and empty cells for missing values.
+        """
+        bob, sue = sample_members[0], sample_members[2]
+        body = (
+            "job_name,job_description,start_date,end_date,total_silver,members\n"
+            f"Ogres,\"Horns, tusks\",2025-02-01,,300,{bob.id};{sue.id}\n"
+            "Trolls,,2025-02-02,,,\n"
+        )
+        response = post_csv(client, body)
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["created"] == 2
+
+        first = client.get(f"/v1/job/{result['job_ids'][0]}").get_json()
+        assert first["job_description"] == "Horns, tusks"
+        assert first["end_date"] is None
+        assert len(first["members_on_job"]) == 2
+
+        second = client.get(f"/v1/job/{result['job_ids'][1]}").get_json()
+        assert second["total_silver"] is None
+        assert second["job_description"] is None
+
+    def test_bad_rows_are_reported_and_the_rest_imported(self, client, sample_members):
+        """
+        Tests each invalid row is reported with its row number without stopping the valid ones.
+        """
+        default_member = next(member for member in sample_members if member.rank_id == DEFAULT_RANK["id"])
+        missing = uuid.uuid4()
+        response = post_ndjson(client, [
+            {"job_name": "Good", "start_date": "2025-03-01"},
+            {"start_date": "2025-03-02"},
+            "{not json",
+            {"job_name": "Decimals", "start_date": "2025-03-04", "total_silver": 10.5},
+            {"job_name": "Unknown member", "start_date": "2025-03-05", "members": [str(missing)]},
+            {"job_name": "Default member", "start_date": "2025-03-06", "members": [str(default_member.id)]},
+            {"job_name": "Also good", "start_date": "2025-03-07"},
+        ])
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["created"] == 2
+        assert result["errors"] == [
+            {"row": 2, "errors": {"job_name": ["Missing data for required field."]}},
+            {"row": 3, "errors": {"_schema": ["Invalid JSON."]}},
+            {"row": 4, "errors": {"total_silver": ["Value cannot have decimals."]}},
+            {"row": 5, "errors": {"members": [f"Member {missing} not found"]}},
+            {"row": 6, "errors": {"members": [
+                f"Member {default_member.name} ({default_member.id}) has DEFAULT rank, you must update them before adding to a job"
+            ]}},
+        ]
+        names = {job["job_name"] for job in client.get("/v1/jobs").get_json()}
+        assert {"Good", "Also good"} <= names
+        assert "Unknown member" not in names
+
+    def test_total_silver_out_of_range_is_reported(self, client):
+        """
+        Tests a total_silver too large for the db column is a row error, not a failed import.
+        """
+        response = post_ndjson(client, [
+            {"job_name": "Good", "start_date": "2025-03-01", "total_silver": 2147483647},
+            {"job_name": "Too much", "start_date": "2025-03-02", "total_silver": 3000000000},
+            {"job_name": "Also good", "start_date": "2025-03-03", "total_silver": 100},
+        ])
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["created"] == 2
+        assert result["errors"] == [
+            {"row": 2, "errors": {"total_silver": ["total_silver must not exceed 2147483647."]}},
+        ]
+        names = {job["job_name"] for job in client.get("/v1/jobs").get_json()}
+        assert {"Good", "Also good"} <= names
+        assert "Too much" not in names
+
+    def test_copy_error_message_is_generic(self, client, monkeypatch):
+        """
+        Tests an error from COPY, which isn't a SQLAlchemyError, doesn't send its text back.
+        """
+        def bad_copy(cursor, table, columns, rows):
+            raise RuntimeError('invalid input for column "total_silver": secret row')
+
+        monkeypatch.setattr(imports, "_copy", bad_copy)
+
+        response = post_ndjson(client, [{"job_name": "Good", "start_date": "2025-03-01"}])
+        assert response.status_code == 500
+        assert response.get_json()["message"] == "An error occurred when inserting to db"
+
+    def test_jobs_with_members_are_queued(self, client, sample_members):
+        response = post_ndjson(client, [
+            {"job_name": "Paid", "start_date": "2025-01-02", "total_silver": 100, "members": [str(sample_members[0].id)]},
+            {"job_name": "Empty", "start_date": "2025-01-03"},
+        ])
+        job_ids = response.get_json()["job_ids"]
+        assert [str(row.job_id) for row in db.session.query(PaymentRecalcQueueModel)] == [job_ids[0]]
+
+    def test_statements_dont_grow_with_rows(self, client, sample_members):
+        """
+        Tests importing fifty jobs takes as many statements as importing two.
+        """
+        member_ids = [str(member.id) for member in sample_members[:3]]
+
+        def job(i):
+            return {"job_name": f"Job {i}", "start_date": "2025-01-01", "total_silver": i, "members": member_ids}
+
+        counts = []
+        for size in (2, 50):
+            with capture_queries() as queries:
+                assert post_ndjson(client, [job(i) for i in range(size)]).get_json()["created"] == size
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+
+    def test_empty_upload(self, client):
+        response = post_ndjson(client, [])
+        assert response.status_code == 200
+        assert response.get_json() == {"created": 0, "job_ids": [], "errors": []}
+
+    def test_unsupported_content_type(self, client):
+        response = client.post("/v1/jobs/import", json=[{"job_name": "Raid", "start_date": "2025-01-01"}])
+        assert response.status_code == 415
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,203 @@
+"""
+Tests for building the job JSON in Postgres (JOB_JSON_FROM_SQL, src/api/job_json.py)
+
+Each request is made with the flag off (JobResponseSchema) and on (SQL) and the bodies must be the same bytes,
+with each of the JSON providers (src/json_provider.py).
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import datetime
+import uuid
+
+import pytest
+
+from flask.json.provider import DefaultJSONProvider
+
+from src.api.job_json import sql_json_enabled
+from src.api.models import JobModel, MemberJobModel, MemberModel # type: ignore
+from src.json_provider import OrjsonProvider, orjson
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+@pytest.fixture
+def sql_json(app, monkeypatch):
+    monkeypatch.setitem(app.config, "JOB_JSON_FROM_SQL", True)
+
+
+@pytest.fixture(params=["json", "orjson"])
+def json_provider(request, app, monkeypatch):
+    if request.param == "orjson" and orjson is None:
+        pytest.skip("orjson is not installed")
+    provider = OrjsonProvider if request.param == "orjson" else DefaultJSONProvider
+    monkeypatch.setattr(app, "json", provider(app))
+
+
+@pytest.fixture
+def awkward_job(db, sample_ranks):
+    """
+    A job whose text needs escaping, and members whose names sort differently in code point order
+    and in most db collations (upper case before lower case).
+    """
+    members = [
+        MemberModel(name=name, rank_id=sample_ranks[2].id)
+        for name in ["bobby", "Zed", "Émile", "Bobby", "zoë 🐉"]
+    ]
+    members.append(MemberModel(name='Quote " back \\ slash', rank_id=sample_ranks[0].id))
+    job = JobModel(
+        job_name="Tab\tnewline\n bell\x07 del\x7f",
+        job_description="Søren's «haul» / ½ price",
+        start_date=datetime.date(2025, 6, 1),
+        end_date=datetime.date(2025, 6, 3),
+        total_silver=901,
+        company_cut_amt=90,
+        remainder_after_payouts=1,
+    )
+    db.session.add_all(members + [job])
+    db.session.flush()
+    db.session.add_all([
+        MemberJobModel(job_id=job.id, member_id=member.id, member_rank="Blagguard", member_pay=index * 10)
+        for index, member in enumerate(members)
+    ])
+    db.session.commit()
+    return job
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def both(app, client, url):
+    """
+    Return the responses for url with the schema and then with the SQL.
+    """
+    app.config["JOB_JSON_FROM_SQL"] = False
+    from_schema = client.get(url)
+    app.config["JOB_JSON_FROM_SQL"] = True
+    from_sql = client.get(url)
+    return from_schema, from_sql
+
+
+def assert_same(app, client, url):
+    from_schema, from_sql = both(app, client, url)
+    assert from_sql.status_code == from_schema.status_code
+    assert from_sql.mimetype == from_schema.mimetype
+    assert from_sql.headers.get("X-Next-Cursor") == from_schema.headers.get("X-Next-Cursor")
+    assert from_sql.data == from_schema.data
+    return from_sql
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+@pytest.mark.usefixtures("json_provider")
+class TestJobJsonConformance:
+    @pytest.mark.parametrize("url", [
+        "/v1/jobs",
+        "/v1/jobs?order=created",
+        "/v1/jobs?from=2025-04-29",
+        "/v1/jobs?start_date=2020-01-01",
+    ])
+    def test_jobs(self, app, client, sql_json, job_with_members, awkward_job, url):
+        assert_same(app, client, url)
+
+    def test_pages(self, app, client, sql_json, job_with_members, awkward_job):
+        url = "/v1/jobs?limit=2"
+        pages = 0
+        while url:
+            response = assert_same(app, client, url)
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"/v1/jobs?limit=2&cursor={cursor}" if cursor else None
+        assert pages == 2
+
+    def test_job(self, app, client, sql_json, job_with_members, awkward_job):
+        for job_id in [job_with_members["job_id"], awkward_job.id]:
+            response = assert_same(app, client, f"/v1/job/{job_id}")
+            assert response.get_json()["id"] == str(job_id)
+
+    def test_escaping(self, app, client, sql_json, awkward_job):
+        """
+        Tests the non-ASCII text is escaped when the provider escapes it, and the roster is in code point order.
+        """
+        response = assert_same(app, client, f"/v1/job/{awkward_job.id}")
+        assert response.data.isascii() == app.json.ensure_ascii
+        body = response.get_json()
+        assert body["job_name"] == awkward_job.job_name
+        assert [member["member_name"] for member in body["members_on_job"]] == [
+            'Quote " back \\ slash', "Bobby", "Zed", "bobby", "zoë 🐉", "Émile",
+        ]
+
+    def test_job_without_members(self, app, client, sql_json, sample_jobs):
+        response = assert_same(app, client, f"/v1/job/{sample_jobs[2].id}")
+        assert response.get_json()["members_on_job"] == []
+
+    def test_after_payments(self, app, client, sql_json, job_with_members):
+        job_id = job_with_members["job_id"]
+        assert client.post(f"/v1/job/{job_id}/payments").status_code == 200
+        assert_same(app, client, f"/v1/job/{job_id}")
+
+    def test_ranks_reordered(self, app, client, sql_json, job_with_members, sample_ranks):
+        """
+        Tests members sort by their current rank, not the rank they held on the job.
+        """
+        captain, lieutenant, blagguard, runt = sample_ranks
+        order = {"ranks": [str(rank.id) for rank in [blagguard, runt, lieutenant, captain]]}
+        assert client.put("/v1/ranks/order", json=order).status_code == 200
+        response = assert_same(app, client, f"/v1/job/{job_with_members['job_id']}")
+        assert [member["member_name"] for member in response.get_json()["members_on_job"]] == ["Sue", "Charlie", "Bob"]
+
+    def test_empty(self, app, client, sql_json):
+        assert assert_same(app, client, "/v1/jobs").data == b"[]\n"
+
+    @pytest.mark.parametrize("job_id", [str(uuid.uuid4()), "not-a-uuid"])
+    def test_errors(self, app, client, sql_json, job_id):
+        response = assert_same(app, client, f"/v1/job/{job_id}")
+        assert response.status_code in (400, 404)
+
+
+class TestJobJsonFromSql:
+    def test_one_query(self, client, sql_json, job_with_members, awkward_job):
+        """
+        Tests a page of jobs with their rosters is read in a single statement.
+        """
+        with capture_queries() as queries:
+            assert client.get("/v1/jobs?limit=10").status_code == 200
+        assert len(queries) == 1
+
+        with capture_queries() as queries:
+            assert client.get(f"/v1/job/{awkward_job.id}").status_code == 200
+        assert len(queries) == 1
+
+    def test_summary_unchanged(self, app, client, sql_json, job_with_members):
+        response = client.get("/v1/jobs?view=summary")
+        assert response.status_code == 200
+        assert "members_on_job" not in response.get_json()[0]
+
+    def test_off_by_default(self, app):
+        with app.app_context():
+            assert app.config["JOB_JSON_FROM_SQL"] is False
+            assert not sql_json_enabled()
+
+    def test_off_when_indented(self, app, sql_json, monkeypatch):
+        """
+        Tests the schema is used when the provider would indent (debug mode), since the SQL can't.
+        """
+        with app.app_context():
+            assert sql_json_enabled()
+            monkeypatch.setattr(app, "debug", True)
+            assert not sql_json_enabled()
+            monkeypatch.setattr(app.json, "compact", True)
+            assert sql_json_enabled()
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,120 @@
+"""
+Tests for keyset pagination on GET /v1/jobs
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import base64
+import datetime
+import json
+
+import pytest
+
+from src.api.models import JobModel # type: ignore
+from src.api.pagination import encode_cursor
+from tests.test_helpers import capture_queries, walk_pages
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+@pytest.fixture
+def many_jobs(db, sample_jobs):
+    """
+    Adds jobs that share start dates with each other so paging has ties to break.
+    """
+    jobs = [
+        JobModel(job_name=f"Job {i}", start_date=datetime.date(2025, 6, 1 + i // 3))
+        for i in range(7)
+    ]
+    db.session.add_all(jobs)
+    db.session.commit()
+    return sample_jobs + jobs
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestJobPagination:
+    def test_pages_cover_every_job_once(self, client, many_jobs):
+        """
+        Tests that walking the pages returns every job once, in the same order as the unpaged list.
+        """
+        all_jobs = [job["id"] for job in client.get("/v1/jobs").get_json()]
+        assert len(all_jobs) == len(many_jobs)
+
+        pages = walk_pages(client, "/v1/jobs?limit=3")
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+        assert [job["id"] for page in pages for job in page] == all_jobs
+
+    def test_no_limit_returns_everything(self, client, many_jobs):
+        """
+        Tests the list without a limit is unchanged and has no next cursor.
+        """
+        response = client.get("/v1/jobs")
+        assert response.status_code == 200
+        assert len(response.get_json()) == len(many_jobs)
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_exact_last_page_has_no_cursor(self, client, sample_jobs):
+        """
+        Tests a page that ends on the last job doesn't point at an empty page.
+        """
+        response = client.get("/v1/jobs?limit=3")
+        assert len(response.get_json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_page_is_filtered_by_the_cursor_in_sql(self, client, many_jobs):
+        """
+        Tests a deep page is a keyset query (no OFFSET), so it costs the same as the first page.
+        """
+        first = client.get("/v1/jobs?limit=5")
+        with capture_queries() as queries:
+            client.get(f"/v1/jobs?limit=5&cursor={first.headers['X-Next-Cursor']}")
+
+        # the jobs, then their rosters
+        assert len(queries) == 2
+        assert "(job.start_date, job.id) <" in queries[0]
+        assert "OFFSET" not in queries[0]
+
+    def test_filter_and_paginate(self, client, many_jobs):
+        """
+        Tests the start_date filter still applies when paging.
+        """
+        filtered = client.get("/v1/jobs?start_date=2025-06-01&limit=2")
+        assert len(filtered.get_json()) == 2
+        assert {job["start_date"] for job in filtered.get_json()} == {"2025-06-01"}
+        assert "X-Next-Cursor" in filtered.headers
+
+        rest = client.get(f"/v1/jobs?start_date=2025-06-01&limit=2&cursor={filtered.headers['X-Next-Cursor']}")
+        assert [job["start_date"] for job in rest.get_json()] == ["2025-06-01"]
+        assert "X-Next-Cursor" not in rest.headers
+
+    @pytest.mark.parametrize("cursor", [
+        "not-base64!",
+        encode_cursor("2025-06-01"),
+        encode_cursor("yesterday", "not-a-uuid"),
+        base64.urlsafe_b64encode(json.dumps(["2025-01-01", 1]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps([None, None]).encode()).decode(),
+    ])
+    def test_invalid_cursor(self, client, cursor):
+        response = client.get(f"/v1/jobs?limit=2&cursor={cursor}")
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "Invalid cursor"
+
+        response = client.get(f"/v1/jobs?order=created&limit=2&cursor={cursor}")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("limit", [0, 501, "ten"])
+    def test_invalid_limit(self, client, limit):
+        response = client.get(f"/v1/jobs?limit={limit}")
+        assert response.status_code == 422
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,161 @@
+"""
+Tests the number of queries the job routes make doesn't grow with the number of jobs or members.
+
+Each test starts with an empty session (expunge_all) so nothing is served from the identity map,
+and with the rank cache filled as it would be after a worker's first request.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import pytest
+
+from src.api.loaders import eager_load
+from src.api.models import JobModel, MemberModel # type: ignore
+from src.api.schemas import JobResponseSchema
+from tests.test_helpers import count_queries
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+@pytest.fixture
+def raid_members(db, sample_ranks):
+    """
+    Twenty members to add to a job at once.
+    """
+    members = [MemberModel(name=f"Raider {i}", rank_id=sample_ranks[i % len(sample_ranks)].id) for i in range(20)]
+    db.session.add_all(members)
+    db.session.commit()
+    return members
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestEagerLoad:
+    def test_job_response_options(self):
+        """
+        Tests the options for JobResponseSchema load the roster, each member and their rank.
+        """
+        options = eager_load(JobModel, JobResponseSchema(many=True))
+        assert len(options) == 1
+        assert [str(part) for part in options[0].path.natural_path] == [
+            "Mapper[JobModel(job)]",
+            "JobModel.members_on_job",
+            "Mapper[MemberJobModel(member_job)]",
+            "MemberJobModel.member",
+            "Mapper[MemberModel(members)]",
+            "MemberModel.rank",
+            "Mapper[RankModel(ranks)]",
+        ]
+
+
+class TestJobQueryCounts:
+    def test_get_jobs(self, client, db, two_jobs_with_members):
+        """
+        Tests listing jobs is one query for the jobs and one for every roster, member and rank.
+        """
+        assert count_queries(lambda: client.get("/v1/jobs")) == 2
+
+    def test_get_jobs_page(self, client, db, two_jobs_with_members):
+        assert count_queries(lambda: client.get("/v1/jobs?limit=2")) == 2
+
+    def test_get_job_by_id(self, client, db, two_jobs_with_members):
+        job_id = two_jobs_with_members[0].id
+        assert count_queries(lambda: client.get(f"/v1/job/{job_id}")) == 2
+
+    def test_patch_job(self, client, db, two_jobs_with_members, sample_jobs):
+        """
+        Tests the PATCH response doesn't lazy load each member and rank as it's dumped.
+        """
+        job_id = two_jobs_with_members[0].id
+        without_members = count_queries(lambda: client.patch(f"/v1/job/{job_id}", json={"job_name": "Renamed"}))
+
+        job_id = sample_jobs[2].id # no members
+        assert count_queries(lambda: client.patch(f"/v1/job/{job_id}", json={"job_name": "Renamed"})) == without_members
+
+    def test_get_payments(self, client, db, two_jobs_with_members):
+        job_id = two_jobs_with_members[0].id
+        assert count_queries(lambda: client.get(f"/v1/job/{job_id}/payments")) == 2
+
+    def test_batch_payments(self, client, db, two_jobs_with_members):
+        """
+        Tests settling two jobs costs the same number of queries as settling one.
+        """
+        one = [str(two_jobs_with_members[0].id)]
+        both = one + [str(two_jobs_with_members[1].id)]
+        single = count_queries(lambda: client.post("/v1/jobs/payments", json={"job_ids": one}))
+
+        # reset the first job's payments so both jobs are written again
+        client.patch(f"/v1/job/{one[0]}", json={"total_silver": 200})
+        assert count_queries(lambda: client.post("/v1/jobs/payments", json={"job_ids": both})) == single
+
+
+class TestAddMembersQueryCounts:
+    def test_add_members_is_constant(self, client, db, sample_jobs, raid_members):
+        """
+        Tests adding twenty members costs the same number of queries as adding two.
+        """
+        two = [str(member.id) for member in raid_members[:2]]
+        twenty = [str(member.id) for member in raid_members]
+
+        small = count_queries(lambda: client.patch(f"/v1/job/{sample_jobs[1].id}", json={"add_members": two}))
+        large = count_queries(lambda: client.patch(f"/v1/job/{sample_jobs[2].id}", json={"add_members": twenty}))
+        assert large == small
+
+    def test_add_members_with_repeats(self, client, sample_jobs, raid_members):
+        """
+        Tests members already on the job, or repeated in the request, are only added once.
+        """
+        job_id = sample_jobs[1].id
+        first = [str(member.id) for member in raid_members[:3]]
+        assert client.patch(f"/v1/job/{job_id}", json={"add_members": first}).status_code == 200
+
+        again = first + [str(raid_members[3].id), str(raid_members[3].id)]
+        response = client.patch(f"/v1/job/{job_id}", json={"add_members": again})
+        assert response.status_code == 200
+        assert sorted(jm["member_id"] for jm in response.get_json()["members_on_job"]) == sorted(
+            str(member.id) for member in raid_members[:4]
+        )
+
+
+class TestRemoveMembersQueryCounts:
+    def test_remove_members_is_constant(self, client, db, sample_jobs, raid_members):
+        """
+        Tests removing twenty members costs the same number of queries as removing two.
+        """
+        ids = [str(member.id) for member in raid_members]
+        for job in sample_jobs[1:]:
+            assert client.patch(f"/v1/job/{job.id}", json={"add_members": ids}).status_code == 200
+
+        small = count_queries(lambda: client.patch(f"/v1/job/{sample_jobs[1].id}", json={"remove_members": ids[:2]}))
+        large = count_queries(lambda: client.patch(f"/v1/job/{sample_jobs[2].id}", json={"remove_members": ids}))
+        assert large == small
+
+    def test_remove_members_not_on_job(self, client, sample_jobs, raid_members):
+        """
+        Tests removing members who aren't on the job leaves the roster and its payments alone.
+        """
+        job_id = sample_jobs[1].id
+        ids = [str(member.id) for member in raid_members[:3]]
+        assert client.patch(f"/v1/job/{job_id}", json={"add_members": ids[:2]}).status_code == 200
+        assert client.post(f"/v1/job/{job_id}/payments").status_code == 200
+
+        response = client.patch(f"/v1/job/{job_id}", json={"remove_members": ids[2:]})
+        assert response.status_code == 200
+        assert response.get_json()["company_cut_amt"] == 150
+        assert len(response.get_json()["members_on_job"]) == 2
+        assert all(jm["member_pay"] is not None for jm in response.get_json()["members_on_job"])
+
+        response = client.patch(f"/v1/job/{job_id}", json={"remove_members": ids})
+        assert response.get_json()["company_cut_amt"] is None
+        assert response.get_json()["members_on_job"] == []
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
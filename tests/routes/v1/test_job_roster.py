@@ -0,0 +1,136 @@
+"""
+Tests for PUT /v1/job/<job_id>/members
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import uuid
+
+import pytest
+
+from constants import DEFAULT_RANK # type: ignore
+from src.api.models import MemberModel, PaymentRecalcQueueModel # type: ignore
+from tests.test_helpers import count_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def roster_names(response):
+    return sorted(jm["member_name"] for jm in response.get_json()["members_on_job"])
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestReplaceRoster:
+    def test_replace_roster(self, client, job_with_members, sample_members):
+        """
+        Tests members not in the roster are removed and new ones are added (Bob, Charlie, Sue -> Charlie, Alice).
+        """
+        job_id = job_with_members["job_id"]
+        roster = [str(sample_members[1].id), str(sample_members[3].id)]
+
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": roster})
+        assert response.status_code == 200
+        assert roster_names(response) == ["Alice", "Charlie"]
+        assert roster_names(client.get(f"/v1/job/{job_id}")) == ["Alice", "Charlie"]
+
+    def test_kept_members_keep_their_rank(self, client, db, job_with_members, sample_members, sample_ranks):
+        """
+        Tests members who stay on the job aren't re-added, so they keep the rank they had on it.
+        """
+        job_id = job_with_members["job_id"]
+        charlie = db.session.get(MemberModel, sample_members[1].id)
+        charlie.rank_id = sample_ranks[3].id
+        db.session.commit()
+
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": [str(charlie.id)]})
+        assert response.status_code == 200
+        assert [jm["member_rank"] for jm in response.get_json()["members_on_job"]] == ["Lieutenant"]
+
+    def test_same_roster_keeps_payments(self, client, db, job_with_members):
+        """
+        Tests sending the roster the job already has (in any order) changes nothing.
+        """
+        job_id = job_with_members["job_id"]
+        assert client.post(f"/v1/job/{job_id}/payments").status_code == 200
+        db.session.query(PaymentRecalcQueueModel).delete()
+
+        roster = [str(member.id) for member in reversed(job_with_members["members"])]
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": roster})
+        assert response.status_code == 200
+        assert response.get_json()["company_cut_amt"] == 10
+        assert [jm["member_pay"] for jm in response.get_json()["members_on_job"]] == [32, 32, 24]
+        assert db.session.query(PaymentRecalcQueueModel).count() == 0
+
+    def test_changed_roster_resets_payments(self, client, db, job_with_members, sample_members):
+        job_id = job_with_members["job_id"]
+        assert client.post(f"/v1/job/{job_id}/payments").status_code == 200
+
+        roster = [str(member.id) for member in job_with_members["members"]] + [str(sample_members[3].id)]
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": roster})
+        assert response.status_code == 200
+        assert response.get_json()["company_cut_amt"] is None
+        assert all(jm["member_pay"] is None for jm in response.get_json()["members_on_job"])
+        assert [row.job_id for row in db.session.query(PaymentRecalcQueueModel)] == [job_id]
+
+    def test_empty_roster(self, client, job_with_members):
+        job_id = job_with_members["job_id"]
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": []})
+        assert response.status_code == 200
+        assert response.get_json()["members_on_job"] == []
+
+    def test_roster_is_constant_queries(self, client, db, sample_jobs, sample_ranks):
+        """
+        Tests replacing a roster of twenty costs the same number of queries as a roster of two.
+        """
+        members = [MemberModel(name=f"Raider {i}", rank_id=sample_ranks[0].id) for i in range(20)]
+        db.session.add_all(members)
+        db.session.commit()
+        ids = [str(member.id) for member in members]
+
+        small = count_queries(lambda: client.put(f"/v1/job/{sample_jobs[1].id}/members", json={"members": ids[:2]}))
+        large = count_queries(lambda: client.put(f"/v1/job/{sample_jobs[2].id}/members", json={"members": ids}))
+        assert large == small
+
+
+class TestReplaceRosterErrors:
+    def test_member_not_found(self, client, job_with_members):
+        """
+        Tests an unknown member is a 404 and the roster is left as it was.
+        """
+        job_id = job_with_members["job_id"]
+        missing = uuid.uuid4()
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": [str(missing)]})
+        assert response.status_code == 404
+        assert response.get_json()["message"] == f"Member {missing} not found"
+        assert roster_names(client.get(f"/v1/job/{job_id}")) == ["Bob", "Charlie", "Sue"]
+
+    def test_default_rank(self, client, job_with_members, sample_members):
+        job_id = job_with_members["job_id"]
+        default_member = next(member for member in sample_members if member.rank_id == DEFAULT_RANK["id"])
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": [str(default_member.id)]})
+        assert response.status_code == 400
+        assert response.get_json()["message"] == (
+            f"At least one member {default_member.name} ({default_member.id}) has DEFAULT rank, you must update them before adding to a job"
+        )
+
+    @pytest.mark.parametrize("job_id, status", [("not-a-uuid", 400), (str(uuid.uuid4()), 404)])
+    def test_bad_job(self, client, job_id, status):
+        response = client.put(f"/v1/job/{job_id}/members", json={"members": []})
+        assert response.status_code == status
+
+    @pytest.mark.parametrize("payload", [{}, {"members": ["not-a-uuid"]}, {"members": "abc"}])
+    def test_invalid_payload(self, client, sample_jobs, payload):
+        response = client.put(f"/v1/job/{sample_jobs[0].id}/members", json=payload)
+        assert response.status_code == 422
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
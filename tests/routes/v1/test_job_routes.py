@@ -52,7 +52,7 @@ class TestPostJob:
         # fetch the actual model from the DB
         job = JobModel.query.get(data["id"])
 
-        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, end_date=datetime.date(2025, 4, 28), id=UUID('{data["id"]}'), job_description='For Stromgarde, collecting horns for bounty', job_name='Ogres in Hinterlands', remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=100)"""
+        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, created_at={job.created_at!r}, end_date=datetime.date(2025, 4, 28), id=UUID('{data["id"]}'), job_description='For Stromgarde, collecting horns for bounty', job_name='Ogres in Hinterlands', payment_fingerprint=None, remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=100)"""
 
         assert repr(job) == expected_repr
 
@@ -83,7 +83,7 @@ class TestPostJob:
         # fetch the actual model from the DB
         job = JobModel.query.get(data["id"])
 
-        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, end_date=None, id=UUID('{data["id"]}'), job_description=None, job_name='Ogres in Hinterlands', remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=None)"""
+        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, created_at={job.created_at!r}, end_date=None, id=UUID('{data["id"]}'), job_description=None, job_name='Ogres in Hinterlands', payment_fingerprint=None, remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=None)"""
 
         assert repr(job) == expected_repr
 
@@ -118,7 +118,7 @@ class TestPostJob:
         # fetch the actual model from the DB
         job = JobModel.query.get(data["id"])
 
-        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, end_date=datetime.date(2025, 4, 28), id=UUID('{data["id"]}'), job_description='For Stromgarde, collecting horns for bounty', job_name='Ogres in Hinterlands', remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=100)"""
+        expected_repr = f"""src.api.models.JobModel(company_cut_amt=None, created_at={job.created_at!r}, end_date=datetime.date(2025, 4, 28), id=UUID('{data["id"]}'), job_description='For Stromgarde, collecting horns for bounty', job_name='Ogres in Hinterlands', payment_fingerprint=None, remainder_after_payouts=None, start_date=datetime.date(2025, 4, 23), total_silver=100)"""
 
         assert repr(job) == expected_repr
 
@@ -0,0 +1,96 @@
+"""
+Tests for GET /v1/jobs?view=summary
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+from src.api.models import MemberJobModel # type: ignore
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestJobSummary:
+    def test_summary_fields(self, client, job_with_members, sample_jobs):
+        """
+        Tests the summary has the job fields and a member count, but no roster.
+        """
+        response = client.get("/v1/jobs?view=summary")
+        assert response.status_code == 200
+
+        jobs = response.get_json()
+        assert [job["id"] for job in jobs] == [str(job.id) for job in reversed(sample_jobs)]
+        assert jobs[-1] == {
+            "id": str(sample_jobs[0].id),
+            "job_name": "Ogres in Hinterlands",
+            "job_description": "For Stromgarde, collecting horns for bounty",
+            "start_date": "2025-04-23",
+            "end_date": "2025-04-28",
+            "total_silver": 100,
+            "company_cut_amt": None,
+            "remainder_after_payouts": None,
+            "member_count": 3,
+        }
+        assert [job["member_count"] for job in jobs] == [0, 0, 3]
+
+    def test_summary_matches_full_view(self, client, job_with_members):
+        """
+        Tests the summary is the full view less members_on_job.
+        """
+        full = client.get("/v1/jobs").get_json()
+        summary = client.get("/v1/jobs?view=summary").get_json()
+
+        for full_job, summary_job in zip(full, summary):
+            members = full_job.pop("members_on_job")
+            assert summary_job.pop("member_count") == len(members)
+            assert summary_job == full_job
+
+    def test_summary_doesnt_load_rosters(self, client, db, job_with_members):
+        """
+        Tests the summary is one query that never joins or loads member_job rows as objects.
+        """
+        db.session.expunge_all()
+        with capture_queries() as queries:
+            response = client.get("/v1/jobs?view=summary")
+        assert response.status_code == 200
+
+        assert len(queries) == 1
+        assert "JOIN" not in queries[0]
+        assert not any(isinstance(obj, MemberJobModel) for obj in db.session.identity_map.values())
+
+    def test_summary_pages(self, client, sample_jobs):
+        """
+        Tests limit and cursor work with the summary view.
+        """
+        first = client.get("/v1/jobs?view=summary&limit=2")
+        assert len(first.get_json()) == 2
+        assert "X-Next-Cursor" in first.headers
+
+        rest = client.get(f"/v1/jobs?view=summary&limit=2&cursor={first.headers['X-Next-Cursor']}")
+        assert [job["id"] for job in rest.get_json()] == [str(sample_jobs[0].id)]
+        assert "X-Next-Cursor" not in rest.headers
+
+    def test_invalid_view(self, client):
+        response = client.get("/v1/jobs?view=tiny")
+        assert response.status_code == 422
+
+    def test_summary_in_openapi_spec(self, client):
+        """
+        Tests the 200 response of GET /v1/jobs is documented as either view, and keeps the cursor header.
+        """
+        response = client.get("/api/openapi.json").get_json()["paths"]["/v1/jobs"]["get"]["responses"]["200"]
+        schemas = response["content"]["application/json"]["schema"]["oneOf"]
+        assert [schema["items"]["$ref"] for schema in schemas] == [
+            "#/components/schemas/JobResponse",
+            "#/components/schemas/JobSummary",
+        ]
+        assert "X-Next-Cursor" in response["headers"]
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
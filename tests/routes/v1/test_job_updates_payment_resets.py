@@ -27,8 +27,8 @@ class TestUpdateJob:
         job_id = job_with_members["job_id"]
         members = job_with_members["members"]
 
-        # First run get payments so we apply payment values
-        response = client.get(f"/v1/job/{job_id}/payments")
+        # First post payments so we store payment values
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 200
 
         # make sure company_cut, remainder_after_payouts, and member_pay amounts exist
@@ -75,8 +75,8 @@ class TestUpdateJob:
         job_id = job_with_members["job_id"]
         members = job_with_members["members"]
 
-        # First run get payments so we apply payment values
-        response = client.get(f"/v1/job/{job_id}/payments")
+        # First post payments so we store payment values
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 200
 
         # make sure company_cut, remainder_after_payouts, and member_pay amounts exist
@@ -138,8 +138,8 @@ class TestUpdateJob:
         job_id = job_with_members["job_id"]
         members = job_with_members["members"]
 
-        # First run get payments so we apply payment values
-        response = client.get(f"/v1/job/{job_id}/payments")
+        # First post payments so we store payment values
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 200
 
         # make sure company_cut, remainder_after_payouts, and member_pay amounts exist
@@ -191,8 +191,8 @@ class TestUpdateJob:
         job_id = job_with_members["job_id"]
         members = job_with_members["members"]
 
-        # First run get payments so we apply payment values
-        response = client.get(f"/v1/job/{job_id}/payments")
+        # First post payments so we store payment values
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 200
 
         # make sure company_cut, remainder_after_payouts, and member_pay amounts exist
@@ -245,8 +245,8 @@ class TestUpdateJob:
         job_id = job_with_members["job_id"]
         members = job_with_members["members"]
 
-        # First run get payments so we apply payment values
-        response = client.get(f"/v1/job/{job_id}/payments")
+        # First post payments so we store payment values
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 200
 
         # make sure company_cut, remainder_after_payouts, and member_pay amounts exist
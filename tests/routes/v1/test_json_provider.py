@@ -0,0 +1,119 @@
+"""
+Tests for the orjson JSON provider (src/json_provider.py)
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import dataclasses
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from flask.json.provider import DefaultJSONProvider
+
+from src import json_provider
+from src.json_provider import OrjsonProvider, create_json_provider
+
+pytestmark = pytest.mark.skipif(json_provider.orjson is None, reason="orjson is not installed")
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+@dataclasses.dataclass
+class Payout:
+    member: str
+    pay: int
+
+
+PAYLOAD = {
+    "total_silver": 1500,
+    "id": uuid.UUID("01a14c7c-f152-72f9-8848-221d08d257ce"),
+    "start_date": datetime.date(2025, 4, 23),
+    "updated": datetime.datetime(2025, 4, 23, 18, 30),
+    "share": decimal.Decimal("0.75"),
+    "payouts": [Payout("Bob", 7), None, True, 1.5],
+    "nested": {"b": {}, "a": []},
+}
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestOrjsonProvider:
+    @pytest.mark.parametrize("debug", [False, True])
+    def test_same_as_default(self, app, monkeypatch, debug):
+        """
+        Tests orjson writes what the default provider writes, compact or (in debug mode) indented.
+        """
+        monkeypatch.setattr(app, "debug", debug)
+        with app.app_context():
+            expected = DefaultJSONProvider(app).response(PAYLOAD)
+            response = OrjsonProvider(app).response(PAYLOAD)
+        assert response.data == expected.data
+        assert response.mimetype == "application/json"
+
+    def test_non_ascii(self, app):
+        with app.app_context():
+            assert OrjsonProvider(app).response({"name": "zoë"}).data == '{"name":"zoë"}\n'.encode()
+
+    def test_dumps_and_loads(self, app):
+        provider = OrjsonProvider(app)
+        text = provider.dumps(PAYLOAD)
+        assert provider.loads(text) == provider.loads(DefaultJSONProvider(app).dumps(PAYLOAD))
+        assert provider.loads(text)["share"] == "0.75"
+        assert provider.loads(text.encode())["nested"] == {"a": [], "b": {}}
+
+    def test_json_module_options(self, app):
+        """
+        Tests options only the json module has (e.g. indent for the OpenAPI spec) are still honoured.
+        """
+        assert OrjsonProvider(app).dumps({"b": 1, "a": 2}, indent=4) == '{\n    "a": 2,\n    "b": 1\n}'
+
+    def test_unsupported(self, app):
+        with pytest.raises(TypeError):
+            OrjsonProvider(app).dumps({"when": datetime.time(12, 0)})
+
+
+class TestCreateJsonProvider:
+    def test_default(self, app):
+        assert type(app.json) is OrjsonProvider
+        assert type(create_json_provider(app)) is OrjsonProvider
+
+    def test_json_chosen(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "JSON_PROVIDER", "json")
+        assert type(create_json_provider(app)) is DefaultJSONProvider
+
+    def test_orjson_not_installed(self, app, monkeypatch):
+        monkeypatch.setattr(json_provider, "orjson", None)
+        assert type(create_json_provider(app)) is DefaultJSONProvider
+
+
+class TestResponses:
+    def test_jobs(self, client, job_with_members):
+        response = client.get("/v1/jobs")
+        assert response.status_code == 200
+        jobs = {job["id"]: job for job in response.get_json()}
+        members = jobs[str(job_with_members["job_id"])]["members_on_job"]
+        assert [member["member_name"] for member in members] == ["Bob", "Charlie", "Sue"]
+
+    def test_errors(self, client):
+        response = client.get(f"/v1/job/{uuid.uuid4()}")
+        assert response.status_code == 404
+        assert response.data == b'{"code":404,"status":"Not Found"}\n'
+
+    def test_openapi_spec(self, client):
+        response = client.get("/api/openapi.json")
+        assert response.status_code == 200
+        assert "/v1/jobs" in response.get_json()["paths"]
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
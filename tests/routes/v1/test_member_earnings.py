@@ -0,0 +1,141 @@
+"""
+Tests for GET /v1/member/<member_id>/earnings and keeping the member_earnings aggregate up to date.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import uuid
+
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def get_earnings(client, member):
+    response = client.get(f"/v1/member/{member.id}/earnings")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestMemberEarnings:
+    def test_member_without_jobs(self, client, sample_members):
+        """
+        Tests a member who has never been on a job has earned nothing.
+        """
+        bob = sample_members[0]
+        assert get_earnings(client, bob) == {
+            "member_id": str(bob.id),
+            "total_silver": 0,
+            "job_count": 0,
+            "last_job_date": None,
+        }
+
+    def test_added_to_job_before_payment(self, client, job_with_members):
+        """
+        Tests adding a member to a job counts the job before any pay is stored.
+        """
+        bob = job_with_members["members"][0]
+        assert get_earnings(client, bob) == {
+            "member_id": str(bob.id),
+            "total_silver": 0,
+            "job_count": 1,
+            "last_job_date": "2025-04-23",
+        }
+
+    def test_totals_across_paid_jobs(self, client, job_with_members, sample_jobs):
+        """
+        Tests stored payments from several jobs are summed.
+        """
+        bob, charlie, sue = job_with_members["members"]
+        # 100 silver, 10% cut -> 90 over 2.75 shares -> 32, 32, 24
+        assert client.post(f"/v1/job/{sample_jobs[0].id}/payments").status_code == 200
+        # 1500 silver, 10% cut -> 1350 to bob alone
+        assert client.patch(f"/v1/job/{sample_jobs[1].id}", json={"add_members": [str(bob.id)]}).status_code == 200
+        assert client.post(f"/v1/job/{sample_jobs[1].id}/payments").status_code == 200
+
+        assert get_earnings(client, bob) == {
+            "member_id": str(bob.id),
+            "total_silver": 1382,
+            "job_count": 2,
+            "last_job_date": "2025-04-29",
+        }
+        assert get_earnings(client, sue)["total_silver"] == 24
+
+    def test_batch_payments_update_earnings(self, client, job_with_members, sample_jobs):
+        """
+        Tests payments stored by POST /v1/jobs/payments are counted.
+        """
+        charlie = job_with_members["members"][1]
+        response = client.post("/v1/jobs/payments", json={"job_ids": [str(sample_jobs[0].id)]})
+        assert response.status_code == 200
+        assert get_earnings(client, charlie)["total_silver"] == 32
+
+    def test_payment_reset_removes_pay(self, client, job_with_members, sample_jobs):
+        """
+        Tests that a PATCH which resets payments takes the old pay off the members' earnings.
+        """
+        bob = job_with_members["members"][0]
+        assert client.post(f"/v1/job/{sample_jobs[0].id}/payments").status_code == 200
+        assert get_earnings(client, bob)["total_silver"] == 32
+
+        assert client.patch(f"/v1/job/{sample_jobs[0].id}", json={"total_silver": 500}).status_code == 200
+        assert get_earnings(client, bob)["total_silver"] == 0
+        assert get_earnings(client, bob)["job_count"] == 1
+
+    def test_removed_member(self, client, job_with_members, sample_jobs):
+        """
+        Tests a member removed from their only job has nothing left.
+        """
+        sue = job_with_members["members"][2]
+        assert client.post(f"/v1/job/{sample_jobs[0].id}/payments").status_code == 200
+
+        response = client.patch(f"/v1/job/{sample_jobs[0].id}", json={"remove_members": [str(sue.id)]})
+        assert response.status_code == 200
+        assert get_earnings(client, sue) == {
+            "member_id": str(sue.id),
+            "total_silver": 0,
+            "job_count": 0,
+            "last_job_date": None,
+        }
+
+    def test_start_date_change(self, client, job_with_members, sample_jobs):
+        """
+        Tests moving a job's start date moves the members' last job date.
+        """
+        bob = job_with_members["members"][0]
+        response = client.patch(f"/v1/job/{sample_jobs[0].id}", json={"start_date": "2025-06-01"})
+        assert response.status_code == 200
+        assert get_earnings(client, bob)["last_job_date"] == "2025-06-01"
+
+    def test_rows_locked_in_member_order(self, client, job_with_members, sample_jobs):
+        """
+        Tests the earnings upsert takes its rows in member id order, so concurrent writers lock them in the same order.
+        """
+        with capture_queries() as queries:
+            response = client.patch(f"/v1/job/{sample_jobs[0].id}", json={"total_silver": 200})
+        assert response.status_code == 200
+        upserts = [q for q in queries if q.startswith("INSERT INTO member_earnings")]
+        assert len(upserts) == 1
+        assert "ORDER BY members.id" in upserts[0]
+
+    def test_invalid_member_id(self, client):
+        response = client.get("/v1/member/not-a-uuid/earnings")
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "Invalid member id"
+
+    def test_member_not_found(self, client):
+        response = client.get(f"/v1/member/{uuid.uuid4()}/earnings")
+        assert response.status_code == 404
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,155 @@
+"""
+Tests for POST /v1/members/import and the flask members import command
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import json
+import uuid
+
+from src.api.imports import import_members, validate_members
+from src.api.models import MemberModel # type: ignore
+from src.api.rank_cache import get_ranks
+from src.commands import members_import
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def post_ndjson(client, rows):
+    body = "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+    return client.post("/v1/members/import", data=body, content_type="application/x-ndjson")
+
+
+def member_ranks(client):
+    return {member["name"]: member["rank"]["name"] for member in client.get("/v1/members").get_json()}
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestMemberImport:
+    def test_ndjson_import(self, client, sample_ranks):
+        """
+        Tests ranks can be given by name or by id.
+        """
+        response = post_ndjson(client, [
+            {"name": "Grunt", "rank": "Runt"},
+            {"name": "Lefty", "rank": str(sample_ranks[1].id), "active": False},
+        ])
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["errors"] == []
+        assert [(member["row"], member["name"], member["rank_id"]) for member in result["created"]] == [
+            (1, "Grunt", str(sample_ranks[3].id)),
+            (2, "Lefty", str(sample_ranks[1].id)),
+        ]
+
+        lefty = client.get(f"/v1/member/{result['created'][1]['id']}").get_json()
+        assert lefty["active"] is False
+        assert lefty["rank"]["name"] == "Lieutenant"
+
+    def test_csv_import(self, client, sample_ranks):
+        body = (
+            "name,rank,active\n"
+            "Grunt,Runt,\n"
+            "\"Smith, the Elder\",Captain,false\n"
+        )
+        response = client.post("/v1/members/import", data=body, content_type="text/csv")
+        assert response.status_code == 200
+        assert len(response.get_json()["created"]) == 2
+        ranks = member_ranks(client)
+        assert ranks["Grunt"] == "Runt"
+        assert ranks["Smith, the Elder"] == "Captain"
+
+    def test_bad_rows_are_reported_and_the_rest_imported(self, client, sample_members):
+        """
+        Tests unknown ranks, taken names and names repeated in the upload are rejected by row.
+        """
+        missing = uuid.uuid4()
+        response = post_ndjson(client, [
+            {"name": "Grunt", "rank": "Runt"},
+            {"name": "Bob", "rank": "Runt"},
+            {"name": "Nobody", "rank": "General"},
+            {"name": "Nobody else", "rank": str(missing)},
+            {"name": "Grunt", "rank": "Captain"},
+            {"name": "   ", "rank": "Runt"},
+            {"rank": "Runt"},
+            "[1, 2]",
+            {"name": "Ace", "rank": "Captain"},
+        ])
+        assert response.status_code == 200
+        result = response.get_json()
+        assert [member["name"] for member in result["created"]] == ["Grunt", "Ace"]
+        assert result["errors"] == [
+            {"row": 2, "errors": {"name": ["There is already a member with name Bob."]}},
+            {"row": 3, "errors": {"rank": ["Rank General does not exist"]}},
+            {"row": 4, "errors": {"rank": [f"Rank {missing} does not exist"]}},
+            {"row": 5, "errors": {"name": ["Name Grunt is already used on row 1."]}},
+            {"row": 6, "errors": {"name": ["Name must not be empty."]}},
+            {"row": 7, "errors": {"name": ["Missing data for required field."]}},
+            {"row": 8, "errors": {"_schema": ["Each line must be a JSON object."]}},
+        ]
+        assert member_ranks(client)["Grunt"] == "Runt"
+
+    def test_statements_dont_grow_with_rows(self, client, sample_ranks):
+        """
+        Tests importing three hundred members takes as many statements as importing two.
+        """
+        get_ranks() # fill the rank cache, so only the version check is counted
+        counts = []
+        for prefix, size in (("small", 2), ("large", 300)):
+            rows = [{"name": f"{prefix} {i}", "rank": sample_ranks[i % 4].name} for i in range(size)]
+            with capture_queries() as queries:
+                assert len(post_ndjson(client, rows).get_json()["created"]) == size
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+
+    def test_name_taken_after_validation(self, db, sample_ranks):
+        """
+        Tests a name added between validating and inserting is skipped and reported, not an IntegrityError.
+        """
+        members, errors = validate_members([(1, {"name": "Grunt", "rank": "Runt"}, None), (2, {"name": "Ace", "rank": "Captain"}, None)])
+        assert errors == []
+        db.session.add(MemberModel(name="Grunt", rank_id=sample_ranks[0].id))
+        db.session.flush()
+
+        created, conflicts = import_members(members)
+        assert [member["name"] for member in created] == ["Ace"]
+        assert conflicts == [{"row": 1, "errors": {"name": ["There is already a member with name Grunt."]}}]
+
+    def test_unsupported_content_type(self, client):
+        response = client.post("/v1/members/import", json=[{"name": "Grunt", "rank": "Runt"}])
+        assert response.status_code == 415
+
+
+class TestMembersImportCommand:
+    def test_import_file(self, app, db, sample_members, tmp_path):
+        path = tmp_path / "guild.csv"
+        path.write_text("name,rank\nGrunt,Runt\nBob,Captain\n")
+
+        result = app.test_cli_runner().invoke(members_import, [str(path)])
+        assert result.exit_code == 0
+        assert result.stdout == "Imported 1 members, rejected 1 rows\n"
+        assert result.stderr == "Row 2 rejected: name: There is already a member with name Bob.\n"
+        assert db.session.query(MemberModel).filter_by(name="Grunt").one().rank.name == "Runt"
+
+    def test_format_option(self, app, db, sample_ranks, tmp_path):
+        path = tmp_path / "guild.txt"
+        path.write_text(json.dumps({"name": "Grunt", "rank": "Runt"}) + "\n")
+
+        runner = app.test_cli_runner()
+        assert runner.invoke(members_import, [str(path)]).exit_code == 2
+        result = runner.invoke(members_import, [str(path), "--format", "ndjson"])
+        assert result.exit_code == 0
+        assert db.session.query(MemberModel).filter_by(name="Grunt").count() == 1
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
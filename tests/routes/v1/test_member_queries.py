@@ -0,0 +1,46 @@
+"""
+Tests the number of queries the member read routes make doesn't grow with the number of members.
+
+Each test starts with an empty session (expunge_all) so ranks aren't served from the identity map.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+from tests.test_helpers import count_queries
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestMemberQueryCounts:
+    def test_get_members(self, client, db, sample_members):
+        """
+        Tests the members and their ranks come from the one query.
+        """
+        assert count_queries(lambda: client.get("/v1/members")) == 1
+
+    def test_get_members_by_rank(self, client, db, sample_members, sample_ranks):
+        rank_id = sample_ranks[2].id
+        assert count_queries(lambda: client.get(f"/v1/members?rank={rank_id}")) == 1
+
+    def test_get_members_nests_ranks(self, client, db, sample_members):
+        """
+        Tests the ranks filled from the join are the members' own ranks.
+        """
+        expected = {member.name: str(member.rank_id) for member in sample_members}
+        db.session.expunge_all()
+
+        members = client.get("/v1/members").get_json()
+        assert {member["name"]: member["rank"]["id"] for member in members} == expected
+
+    def test_get_member_by_id(self, client, db, sample_members):
+        member_id = sample_members[2].id
+        assert count_queries(lambda: client.get(f"/v1/member/{member_id}")) == 1
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
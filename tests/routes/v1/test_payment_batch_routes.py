@@ -0,0 +1,162 @@
+"""
+This module contains tests for the /jobs/payments endpoint from the `src.api.v1/job_routes` module.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import pytest
+
+from sqlalchemy.exc import SQLAlchemyError
+from uuid import uuid4
+
+from src.extensions import db
+
+
+###################################################################################################
+#  HAPPY PATHS
+###################################################################################################
+
+@pytest.mark.usefixtures("two_jobs_with_members")
+class TestPostJobsPayments:
+    def test_batch_matches_single_job_payments(self, client, two_jobs_with_members):
+        """
+        Tests the batch returns the same per job results as GET /v1/job/<job_id>/payments.
+        """
+        job_ids = [str(job.id) for job in two_jobs_with_members]
+
+        response = client.post("/v1/jobs/payments", json={"job_ids": job_ids})
+        assert response.status_code == 200
+        batch = response.get_json()
+
+        # newest first, the same as GET /v1/jobs
+        assert [job["id"] for job in batch] == [job_ids[1], job_ids[0]]
+
+        for job in batch:
+            single = client.get(f"/v1/job/{job['id']}/payments")
+            assert single.status_code == 200
+            assert single.get_json() == job
+
+    def test_batch_stores_payments(self, client, two_jobs_with_members):
+        """
+        Tests the calculated values are written to the db.
+        """
+        job_ids = [str(job.id) for job in two_jobs_with_members]
+        response = client.post("/v1/jobs/payments", json={"job_ids": job_ids})
+        assert response.status_code == 200
+
+        for job in response.get_json():
+            stored = client.get(f"/v1/job/{job['id']}").get_json()
+            assert stored["company_cut_amt"] == job["company_cut_amt"]
+            assert stored["remainder_after_payouts"] == job["remainder_after_payouts"]
+            assert [m["member_pay"] for m in stored["members_on_job"]] == [m["member_pay"] for m in job["members_on_job"]]
+            assert all(m["member_pay"] is not None for m in stored["members_on_job"])
+
+    def test_batch_by_date_range(self, client, two_jobs_with_members):
+        """
+        Tests a date range selects the jobs starting within it.
+        """
+        response = client.post("/v1/jobs/payments", json={"from": "2025-04-01", "to": "2025-04-28"})
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert [job["id"] for job in data] == [str(two_jobs_with_members[0].id)]
+        assert data[0]["company_cut_amt"] is not None
+
+    def test_batch_date_range_with_no_jobs(self, client, two_jobs_with_members):
+        """
+        Tests an empty range returns an empty list.
+        """
+        response = client.post("/v1/jobs/payments", json={"from": "2030-01-01"})
+        assert response.status_code == 200
+        assert response.get_json() == []
+
+
+###################################################################################################
+#  ERROR CASES
+###################################################################################################
+
+class TestPostJobsPaymentsErrors:
+    def test_batch_no_selection(self, client):
+        """
+        Tests that a request without ids or dates is rejected.
+        """
+        response = client.post("/v1/jobs/payments", json={})
+        assert response.status_code == 422
+        assert response.get_json()["errors"]["json"] == {
+            "_schema": ["Provide job_ids and/or a from/to date range."]
+        }
+
+    def test_batch_from_after_to(self, client):
+        """
+        Tests that an inverted date range is rejected.
+        """
+        response = client.post("/v1/jobs/payments", json={"from": "2025-05-01", "to": "2025-04-01"})
+        assert response.status_code == 422
+        assert response.get_json()["errors"]["json"] == {"from": ["from must be on or before to."]}
+
+    def test_batch_job_not_found(self, client, job_with_members):
+        """
+        Tests that an unknown job id is rejected.
+        """
+        missing_id = uuid4()
+        response = client.post(
+            "/v1/jobs/payments",
+            json={"job_ids": [str(job_with_members["job_id"]), str(missing_id)]}
+        )
+        assert response.status_code == 404
+        assert response.get_json() == {
+            "code": 404,
+            "message": f"Job {missing_id} not found",
+            "status": "Not Found"
+        }
+
+    def test_batch_job_without_members_stores_nothing(self, client, job_with_members, sample_jobs):
+        """
+        Tests that the whole batch is rejected if one job has no members.
+        """
+        job_id = job_with_members["job_id"]
+        empty_job_id = sample_jobs[1].id
+
+        response = client.post("/v1/jobs/payments", json={"job_ids": [str(job_id), str(empty_job_id)]})
+        assert response.status_code == 400
+        assert response.get_json() == {
+            "code": 400,
+            "message": f"Job {empty_job_id} has no members, you must PATCH some to the job before requesting payment",
+            "status": "Bad Request"
+        }
+
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored["company_cut_amt"] is None
+        assert all(m["member_pay"] is None for m in stored["members_on_job"])
+
+    def test_batch_job_without_total_silver(self, client, sample_jobs, sample_members):
+        """
+        Tests that a job with no total_silver is rejected.
+        """
+        job_id = sample_jobs[2].id
+        response = client.patch(f"/v1/job/{job_id}", json={"add_members": [str(sample_members[0].id)]})
+        assert response.status_code == 200
+
+        response = client.post("/v1/jobs/payments", json={"job_ids": [str(job_id)]})
+        assert response.status_code == 400
+        assert response.get_json()["message"] == f"Job {job_id} has no total_silver, you must PATCH it before requesting payment"
+
+    def test_batch_sqlalchemy_error(self, client, job_with_members, monkeypatch):
+        """
+        Tests that a 500 response with a message is returned if the commit raises a SQLAlchemyError.
+        """
+        def bad_commit():
+            raise SQLAlchemyError("DB error")
+
+        monkeypatch.setattr(db.session, "commit", bad_commit)
+
+        response = client.post("/v1/jobs/payments", json={"job_ids": [str(job_with_members["job_id"])]})
+        assert response.status_code == 500
+        assert "An error occurred when inserting to db" in response.get_json()["message"]
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -63,10 +63,10 @@ class TestGetPaymentMemberErrors:
 
     
 @pytest.mark.usefixtures("job_with_members")
-class TestGetPaymentDbErrors:
+class TestPostPaymentDbErrors:
     def test_update_job_sqlalchemy_error(self, client, job_with_members, monkeypatch):
         """
-        Tests that a 500 response with a message is returned if the PATCH raises a SQLAlchemyError.
+        Tests that a 500 response with a message is returned if storing the payments raises a SQLAlchemyError.
         """
         job_id = job_with_members["job_id"]
 
@@ -76,7 +76,7 @@ class TestGetPaymentDbErrors:
 
         monkeypatch.setattr(db.session, "commit", bad_commit)
 
-        response = client.get(f"/v1/job/{job_id}/payments")
+        response = client.post(f"/v1/job/{job_id}/payments")
 
         assert response.status_code == 500
         data = response.get_json()
@@ -84,7 +84,7 @@ class TestGetPaymentDbErrors:
 
     def test_update_job_generic_error(self, client, job_with_members, monkeypatch):
         """
-        Tests that a 500 response with a message is returned if the PATCH raises any other error.
+        Tests that a 500 response with a message is returned if storing the payments raises any other error.
         """
         job_id = job_with_members["job_id"]
 
@@ -93,7 +93,7 @@ class TestGetPaymentDbErrors:
 
         monkeypatch.setattr(db.session, "commit", bad_commit)
 
-        response = client.get(f"/v1/job/{job_id}/payments")
+        response = client.post(f"/v1/job/{job_id}/payments")
         assert response.status_code == 500
         data = response.get_json()
         assert "Something went wrong!" in data["message"] 
@@ -1,53 +1,89 @@
 """
-This tests the staticmethod used by /payments .
+This tests the payout engine used by /payments.
 """
 
 ###################################################################################################
 #  IMPORTS
 ###################################################################################################
 
+import pytest
 
-from src.api.v1.job_routes import JobWithPaymentsById
+from src import payout_engine
+from src.payout_engine import calculate_job_payout, calculate_payouts, cut_to_basis_points
 
 
 ###################################################################################################
-#  CLASSES
+#  FIXTURES
 ###################################################################################################
 
-
-class DummyRank:
-    def __init__(self, share):
-        self.share = share
-
-class DummyMember:
-    def __init__(self, rank=None, name=""):
-        self.rank = rank
-        self.name = name # we use the name in the logger so need it here
+# run every batch test against plain python, and NumPy when it is installed
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(payout_engine.np is None, reason="NumPy not installed")),
+]
 
 
 ###################################################################################################
 #  TESTS
 ###################################################################################################
 
-# calculate_member_pay takes (member, value_per_share)
-# it also looks for member.rank to exist as that is required for the calculation
-
-def test_returns_zero_when_no_member_or_rank():
-    assert JobWithPaymentsById.calculate_member_pay(None, 100) == 0
-    assert JobWithPaymentsById.calculate_member_pay(DummyMember(name="Alice"), 100) == 0
-
-def test_calculates_correct_value():
-    member = DummyMember(rank=DummyRank(share=3), name="Alice")
-    value_per_share = 10
-    result = JobWithPaymentsById.calculate_member_pay(member, value_per_share)
-    assert result == 30  # 3 * 10
-
-def test_rounds_down_decimal_values():
-    member = DummyMember(rank=DummyRank(share=2), name="Alice")
-    value_per_share = 10 / 3  # 6.66...
-    result = JobWithPaymentsById.calculate_member_pay(member, value_per_share)
-    # 2 * 3.333... = 6.666... -> should round down to 6
-    assert result == 6
+class TestCalculateJobPayout:
+    def test_calculates_correct_value(self):
+        # 100 silver, 10% cut -> 90 to share between 3 shares of 1 -> 30 each
+        assert calculate_job_payout(100, [1, 1, 1], 0.1) == (10, [30, 30, 30], 0)
+
+    def test_rounds_down_decimal_values(self):
+        # 90 payable over 2.75 shares -> 32.72.. per share, pay is rounded down to whole silver
+        assert calculate_job_payout(100, [1.0, 1.0, 0.75], 0.1) == (10, [32, 32, 24], 2)
+
+    def test_company_cut_is_rounded_down(self):
+        # 10% of 105 is 10.5 -> the company takes 10 and the other 95 is shared
+        assert calculate_job_payout(105, [1, 1], 0.1) == (10, [47, 47], 1)
+
+    def test_returns_zero_when_no_share(self):
+        assert calculate_job_payout(100, [1, None, 0], 0.1) == (10, [90, 0, 0], 0)
+
+    def test_no_shares_keeps_everything_in_remainder(self):
+        assert calculate_job_payout(100, [0, 0], 0.1) == (10, [0, 0], 90)
+
+    def test_company_cut_from_env_string(self):
+        # os.getenv returns a string when COMPANY_CUT is set in the .env file
+        assert cut_to_basis_points("0.1") == 1000
+        assert calculate_job_payout(200, [1], "0.25") == (50, [150], 0)
+
+
+class TestCalculatePayouts:
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_batch_of_jobs(self, use_numpy):
+        payouts = calculate_payouts(
+            totals=[100, 1500, 7],
+            shares=[1.0, 1.0, 0.75, 1.0, 0.5, 1.0],
+            job_index=[0, 0, 0, 1, 1, 2],
+            company_cut=0.1,
+            use_numpy=use_numpy,
+        )
+        assert payouts.company_cuts == [10, 150, 0]
+        assert payouts.member_pays == [32, 32, 24, 900, 450, 7]
+        assert payouts.remainders == [2, 0, 0]
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_job_without_members(self, use_numpy):
+        payouts = calculate_payouts([100], [], [], 0.1, use_numpy=use_numpy)
+        assert payouts == ([10], [], [90])
+
+    @pytest.mark.skipif(payout_engine.np is None, reason="NumPy not installed")
+    def test_numpy_matches_python(self):
+        totals = [1_000_003, 55, 0, 987_654]
+        shares = [(i % 7) * 0.25 for i in range(4000)]
+        job_index = [i % len(totals) for i in range(4000)]
+
+        python = calculate_payouts(totals, shares, job_index, 0.1, use_numpy=False)
+        numpy = calculate_payouts(totals, shares, job_index, 0.1, use_numpy=True)
+        assert python == numpy
+
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            calculate_payouts([100], [1, 1], [0], 0.1)
 
 
 ###################################################################################################
@@ -0,0 +1,220 @@
+"""
+Tests for the payment recalculation queue filled by PATCH /v1/job/<job_id> and emptied by
+the `flask payments worker` command.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import threading
+
+import pytest
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from src.api import payments
+from src.api.models import JobModel, MemberJobModel, MemberModel, PaymentRecalcQueueModel, RankModel # type: ignore
+from src.api.payments import enqueue_recalculation, process_recalc_queue
+from src.api.rank_cache import invalidate_rank_cache
+from src.extensions import db
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+@pytest.fixture
+def committed_job(app, monkeypatch):
+    """
+    A queued job with two members, committed for real so other connections can see and lock it.
+
+    db.session is swapped for one that gives each thread its own connection (the test session
+    shares one connection and never commits), everything made here is deleted afterwards.
+    """
+    monkeypatch.setattr(db, "session", scoped_session(sessionmaker(bind=db.engine, expire_on_commit=False)))
+    rank = RankModel(name="Queue race rank", position=900, share=1.0)
+    db.session.add(rank)
+    db.session.flush()
+    members = [MemberModel(name=f"Queue race {i}", rank_id=rank.id) for i in range(2)]
+    job = JobModel(job_name="Queue race", total_silver=1000)
+    db.session.add_all(members + [job])
+    db.session.flush()
+    db.session.add_all([MemberJobModel(job_id=job.id, member_id=member.id, member_rank=rank.name) for member in members])
+    enqueue_recalculation([job.id])
+    db.session.commit()
+    invalidate_rank_cache() # the cache may hold ranks from the test session's transaction
+
+    yield job.id
+
+    db.session.rollback()
+    db.session.execute(delete(MemberJobModel).where(MemberJobModel.job_id == job.id))
+    db.session.execute(delete(JobModel).where(JobModel.id == job.id)) # and its queue row
+    db.session.execute(delete(MemberModel).where(MemberModel.id.in_([member.id for member in members])))
+    db.session.execute(delete(RankModel).where(RankModel.id == rank.id))
+    db.session.commit()
+    db.session.remove()
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def queued_job_ids():
+    return [row.job_id for row in db.session.query(PaymentRecalcQueueModel).all()]
+
+
+def in_thread(app, function, results):
+    """
+    Start function in a thread with its own app context and db connection, its result goes in results.
+    """
+    def run():
+        with app.app_context():
+            try:
+                results.append(function())
+            finally:
+                db.session.remove()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestPaymentQueue:
+    def test_reset_queues_job(self, client, job_with_members):
+        """
+        Tests that a PATCH which resets payments queues the job.
+        """
+        job_id = job_with_members["job_id"]
+        # adding the members in the fixture queued it, clear that out first
+        process_recalc_queue()
+
+        response = client.patch(f"/v1/job/{job_id}", json={"total_silver": 500})
+        assert response.status_code == 200
+        assert queued_job_ids() == [job_id]
+
+    def test_repeated_resets_are_coalesced(self, client, job_with_members, sample_members):
+        """
+        Tests that resetting a job again before the worker runs doesn't queue it twice.
+        """
+        job_id = job_with_members["job_id"]
+
+        assert client.patch(f"/v1/job/{job_id}", json={"total_silver": 500}).status_code == 200
+        assert client.patch(f"/v1/job/{job_id}", json={"add_members": [str(sample_members[3].id)]}).status_code == 200
+        assert client.patch(f"/v1/job/{job_id}", json={"total_silver": 600}).status_code == 200
+
+        assert queued_job_ids() == [job_id]
+
+    def test_non_payment_change_does_not_queue(self, client, job_with_members):
+        """
+        Tests that a PATCH which doesn't reset payments doesn't queue the job.
+        """
+        job_id = job_with_members["job_id"]
+        # adding the members in the fixture queued it, clear that out first
+        process_recalc_queue()
+
+        response = client.patch(f"/v1/job/{job_id}", json={"job_name": "Renamed"})
+        assert response.status_code == 200
+        assert queued_job_ids() == []
+
+    def test_worker_recalculates_queued_jobs(self, app, client, job_with_members):
+        """
+        Tests that the worker command stores payments for queued jobs and empties the queue.
+        """
+        job_id = job_with_members["job_id"]
+        assert client.patch(f"/v1/job/{job_id}", json={"total_silver": 1000}).status_code == 200
+
+        result = app.test_cli_runner().invoke(args=["payments", "worker", "--once"])
+        assert result.exit_code == 0
+        assert "Recalculated payments for 1 jobs" in result.output
+        assert queued_job_ids() == []
+
+        # the worker writes with Core statements, so drop the stale objects the test session holds
+        db.session.expire_all()
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored["company_cut_amt"] == 100
+        assert [m["member_pay"] for m in stored["members_on_job"]] == [327, 327, 245]
+
+    def test_worker_drops_jobs_that_cannot_be_paid(self, client, sample_jobs):
+        """
+        Tests that a queued job with no members is removed from the queue without being calculated.
+        """
+        job_id = sample_jobs[1].id
+        enqueue_recalculation([job_id])
+
+        assert process_recalc_queue() == 1
+        assert queued_job_ids() == []
+        assert client.get(f"/v1/job/{job_id}").get_json()["company_cut_amt"] is None
+
+    def test_worker_empty_queue(self, sample_jobs):
+        """
+        Tests that processing an empty queue does nothing.
+        """
+        assert process_recalc_queue() == 0
+
+
+
+class TestPaymentQueueConcurrency:
+    def test_reset_while_worker_is_calculating(self, app, committed_job, monkeypatch):
+        """
+        Tests a reset made after the worker has claimed a job waits for the worker to commit and
+        then queues the job again, rather than the worker storing payouts for the old total over it.
+        """
+        claimed, release = threading.Event(), threading.Event()
+        apply_payments = payments.apply_payments
+
+        def paused_apply_payments(jobs):
+            # the worker has claimed the job and read its inputs, hold it there
+            claimed.set()
+            release.wait(10)
+            return apply_payments(jobs)
+
+        monkeypatch.setattr(payments, "apply_payments", paused_apply_payments)
+
+        processed, responses = [], []
+        worker = in_thread(app, process_recalc_queue, processed)
+        assert claimed.wait(10)
+
+        patch = in_thread(app, lambda: app.test_client().patch(f"/v1/job/{committed_job}", json={"total_silver": 2000}), responses)
+        patch.join(0.5)
+        assert patch.is_alive() # waiting for the worker's lock on the job
+
+        release.set()
+        worker.join(10)
+        patch.join(10)
+        assert processed == [1]
+        assert responses[0].status_code == 200
+
+        job = db.session.get(JobModel, committed_job, populate_existing=True)
+        assert job.total_silver == 2000
+        assert job.company_cut_amt is None
+        assert queued_job_ids() == [committed_job]
+
+        monkeypatch.setattr(payments, "apply_payments", apply_payments)
+        assert process_recalc_queue() == 1
+        assert db.session.get(JobModel, committed_job, populate_existing=True).company_cut_amt == 200
+
+    def test_worker_skips_job_being_reset(self, app, committed_job):
+        """
+        Tests the worker leaves a job alone while a reset holds it, and picks it up once it's committed.
+        """
+        db.session.execute(select(JobModel.id).where(JobModel.id == committed_job).with_for_update())
+
+        processed = []
+        in_thread(app, process_recalc_queue, processed).join(10)
+        assert processed == [0]
+
+        db.session.commit()
+        in_thread(app, process_recalc_queue, processed).join(10)
+        assert processed == [0, 1]
+        assert queued_job_ids() == []
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
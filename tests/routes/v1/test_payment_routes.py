@@ -8,11 +8,16 @@ This module contains test for /payments endpoint from the `src.api.v1/job_routes
 
 import pytest
 
+from uuid import uuid4
+
 from constants import COMPANY_CUT # type: ignore
+from src.api.payments import apply_payments, load_payment_inputs
+from src.extensions import db
+from tests.test_helpers import capture_queries
 
 
 ###################################################################################################
-#  HAPPY PATHS : note staticmethod is also tested as a pure function in test_payment_methods
+#  HAPPY PATHS : note the payout engine is also tested as pure functions in test_payment_methods
 ###################################################################################################
 
 @pytest.mark.usefixtures("job_with_members")
@@ -80,6 +85,158 @@ class TestGetPayments:
         assert response.status_code == 200
         assert response.get_json() == expected_response
 
+
+@pytest.mark.usefixtures("job_with_members")
+class TestPaymentsWrites:
+    def test_member_pays_stored_in_one_statement(self, client, job_with_members):
+        """
+        Tests that storing a job's payments sends one UPDATE for all of its members.
+        """
+        job_id = job_with_members["job_id"]
+
+        with capture_queries() as queries:
+            response = client.post(f"/v1/job/{job_id}/payments")
+        assert response.status_code == 200
+
+        member_updates = [q for q in queries if q.startswith("UPDATE member_job")]
+        job_updates = [q for q in queries if q.startswith("UPDATE job")]
+        assert len(member_updates) == 1
+        assert len(job_updates) == 1
+
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored == response.get_json()
+        assert [m["member_pay"] for m in stored["members_on_job"]] == [32, 32, 24]
+
+
+@pytest.mark.usefixtures("job_with_members")
+class TestGetPaymentsReadOnly:
+    def test_get_does_not_write(self, client, job_with_members, monkeypatch):
+        """
+        Tests that GET returns the calculated payments without a flush or commit.
+        """
+        job_id = job_with_members["job_id"]
+
+        def no_write(*args, **kwargs):
+            raise AssertionError("the session should not be written to")
+
+        monkeypatch.setattr(db.session, "commit", no_write)
+        monkeypatch.setattr(db.session, "flush", no_write)
+
+        with capture_queries() as queries:
+            response = client.get(f"/v1/job/{job_id}/payments")
+        assert response.status_code == 200
+        assert all(q.startswith("SELECT") for q in queries)
+
+        data = response.get_json()
+        assert data["company_cut_amt"] == 10
+        assert data["remainder_after_payouts"] == 2
+        assert [m["member_pay"] for m in data["members_on_job"]] == [32, 32, 24]
+
+        monkeypatch.undo()
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored["company_cut_amt"] is None
+        assert all(m["member_pay"] is None for m in stored["members_on_job"])
+
+    def test_get_matches_stored_payments(self, client, job_with_members):
+        """
+        Tests the calculated payments have the same shape and values as the stored payments.
+        """
+        job_id = job_with_members["job_id"]
+
+        calculated = client.get(f"/v1/job/{job_id}/payments")
+        stored = client.post(f"/v1/job/{job_id}/payments")
+
+        assert stored.status_code == 200
+        assert calculated.get_json() == stored.get_json()
+        assert client.get(f"/v1/job/{job_id}/payments").get_json() == stored.get_json()
+
+    def test_post_stores_payments(self, client, job_with_members):
+        """
+        Tests that POST calculates and stores the payments.
+        """
+        job_id = job_with_members["job_id"]
+
+        response = client.post(f"/v1/job/{job_id}/payments")
+        assert response.status_code == 200
+
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored == response.get_json()
+
+    def test_post_unknown_job(self, client):
+        """
+        Tests that POST errors the same way as GET for a job that doesn't exist.
+        """
+        response = client.post(f"/v1/job/{uuid4()}/payments")
+        assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("job_with_members")
+class TestGetPaymentsFingerprint:
+    def test_unchanged_job_is_not_recalculated(self, client, job_with_members, monkeypatch):
+        """
+        Tests that a GET after the payments are stored returns them without calculating them again.
+        """
+        job_id = job_with_members["job_id"]
+
+        first = client.post(f"/v1/job/{job_id}/payments")
+        assert first.status_code == 200
+
+        def no_calculation(*args, **kwargs):
+            raise AssertionError("the payments should not be calculated")
+
+        monkeypatch.setattr("src.api.v1.job_routes.calculate_job_payout", no_calculation)
+
+        second = client.get(f"/v1/job/{job_id}/payments")
+        assert second.status_code == 200
+        assert second.get_json() == first.get_json()
+
+    def test_rank_share_change_recalculates(self, client, job_with_members):
+        """
+        Tests that changing the share of a rank on the job recalculates the payments, without storing them.
+        """
+        job_id = job_with_members["job_id"]
+        members = job_with_members["members"]
+
+        first = client.post(f"/v1/job/{job_id}/payments").get_json()
+
+        response = client.patch(f"/v1/rank/{members[2].rank.id}", json={"share": 0.5})
+        assert response.status_code == 200
+
+        second = client.get(f"/v1/job/{job_id}/payments").get_json()
+        assert second["members_on_job"] != first["members_on_job"]
+        # 90 payable over 2.5 shares
+        assert [m["member_pay"] for m in second["members_on_job"]] == [36, 36, 18]
+
+        stored = client.get(f"/v1/job/{job_id}").get_json()
+        assert stored["members_on_job"] == first["members_on_job"]
+
+    def test_total_silver_round_trip_recalculates(self, client, job_with_members):
+        """
+        Tests that resetting payments clears the fingerprint, even if the total ends up where it started.
+        """
+        job_id = job_with_members["job_id"]
+        first = client.post(f"/v1/job/{job_id}/payments").get_json()
+
+        assert client.patch(f"/v1/job/{job_id}", json={"total_silver": 200}).status_code == 200
+        assert client.patch(f"/v1/job/{job_id}", json={"total_silver": 100}).status_code == 200
+        assert client.get(f"/v1/job/{job_id}").get_json()["company_cut_amt"] is None
+
+        second = client.get(f"/v1/job/{job_id}/payments").get_json()
+        assert second == first
+
+    def test_batch_skips_unchanged_jobs(self, client, job_with_members):
+        """
+        Tests the batch path does not rewrite a job whose payments are up to date.
+        """
+        job_id = job_with_members["job_id"]
+
+        jobs = load_payment_inputs([job_id])
+        assert apply_payments(jobs) == [job_id]
+
+        jobs = load_payment_inputs([job_id])
+        assert apply_payments(jobs) == []
+
+
 ###################################################################################################
 #  End of file.
 ###################################################################################################
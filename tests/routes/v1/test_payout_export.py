@@ -0,0 +1,110 @@
+"""
+Tests for GET /v1/payouts/export
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import csv
+import io
+import json
+
+import pytest
+
+from src.api import exports
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+@pytest.fixture
+def paid_jobs(client, job_with_members, sample_jobs):
+    """
+    Pays the first job (Bob, Charlie and Sue) and the second job (Bob only), the third is left unpaid.
+    """
+    bob = job_with_members["members"][0]
+    assert client.post(f"/v1/job/{sample_jobs[0].id}/payments").status_code == 200
+    assert client.patch(f"/v1/job/{sample_jobs[1].id}", json={"add_members": [str(bob.id)]}).status_code == 200
+    assert client.post(f"/v1/job/{sample_jobs[1].id}/payments").status_code == 200
+    return sample_jobs
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestPayoutExport:
+    def test_csv_export(self, client, paid_jobs):
+        """
+        Tests every payout is exported as CSV, in date then member name order.
+        """
+        response = client.get("/v1/payouts/export")
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert response.headers["Content-Disposition"] == "attachment; filename=payouts.csv"
+
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0] == exports.EXPORT_COLUMNS
+        assert [(row[1], row[2], row[4], row[5], row[6]) for row in rows[1:]] == [
+            ("Ogres in Hinterlands", "2025-04-23", "Bob", "Captain", "32"),
+            ("Ogres in Hinterlands", "2025-04-23", "Charlie", "Lieutenant", "32"),
+            ("Ogres in Hinterlands", "2025-04-23", "Sue", "Blagguard", "24"),
+            ("Grace artifact", "2025-04-29", "Bob", "Captain", "1350"),
+        ]
+        assert rows[1][0] == str(paid_jobs[0].id)
+
+    def test_ndjson_export_in_range(self, client, paid_jobs):
+        """
+        Tests from/to limit the export to jobs starting in the range and ndjson gives one object per line.
+        """
+        response = client.get("/v1/payouts/export?from=2025-04-24&to=2025-04-30&format=ndjson")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == [{
+            "job_id": str(paid_jobs[1].id),
+            "job_name": "Grace artifact",
+            "start_date": "2025-04-29",
+            "member_id": json.loads(lines[0])["member_id"],
+            "member_name": "Bob",
+            "member_rank": "Captain",
+            "member_pay": 1350,
+        }]
+
+    def test_unpaid_members_are_left_out(self, client, job_with_members):
+        """
+        Tests members without a calculated pay aren't exported, leaving only the header.
+        """
+        response = client.get("/v1/payouts/export")
+        assert response.status_code == 200
+        assert response.get_data(as_text=True).splitlines() == [",".join(exports.EXPORT_COLUMNS)]
+
+    def test_streams_in_batches(self, client, paid_jobs, monkeypatch):
+        """
+        Tests the rows are sent a batch at a time rather than as one body.
+        """
+        monkeypatch.setattr(exports, "YIELD_PER", 2)
+        response = client.get("/v1/payouts/export?format=ndjson", buffered=False)
+        assert response.is_streamed
+
+        chunks = list(response.response)
+        response.close()
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2]
+
+    @pytest.mark.parametrize("query, field", [
+        ("format=xml", "format"),
+        ("from=2025-05-01&to=2025-04-01", "from"),
+        ("from=not-a-date", "from"),
+    ])
+    def test_invalid_args(self, client, query, field):
+        response = client.get(f"/v1/payouts/export?{query}")
+        assert response.status_code == 422
+        assert field in response.get_json()["errors"]["query"]
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,213 @@
+"""
+Query plan regression tests.
+
+Each test records the SQL a route sends, then runs EXPLAIN on every statement against a seeded
+db with sequential scans disabled (enable_seqscan = off). The planner then only falls back to a
+Seq Scan when no index can serve the statement, so a Seq Scan in a plan means a missing index.
+Where a route relies on a particular index the test also checks it's the one used.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import datetime
+import json
+
+import pytest
+
+from sqlalchemy import insert, text
+
+from src.api.models import JobModel, MemberJobModel, MemberModel # type: ignore
+from src.extensions import db as _db
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  FIXTURES
+###################################################################################################
+
+# read whole on purpose by the rank cache: the one version row, and every rank when it reloads
+WHOLE_TABLE_READS = {"rank_cache_version", "ranks"}
+
+MEMBERS = 400
+JOBS = 100
+ROSTER = 12
+
+
+@pytest.fixture
+def seeded(db, sample_ranks):
+    """
+    Enough members, jobs and rosters that the planner's estimates aren't all for empty tables.
+    """
+    members = [
+        {"name": f"Seeded {i}", "rank_id": sample_ranks[i % len(sample_ranks)].id}
+        for i in range(MEMBERS)
+    ]
+    member_ids = list(db.session.scalars(insert(MemberModel).returning(MemberModel.id), members))
+    jobs = [
+        {"job_name": f"Job {i}", "start_date": datetime.date(2025, 1, 1) + datetime.timedelta(days=i), "total_silver": 1000}
+        for i in range(JOBS)
+    ]
+    job_ids = list(db.session.scalars(insert(JobModel).returning(JobModel.id), jobs))
+    db.session.execute(insert(MemberJobModel), [
+        {"job_id": job_id, "member_id": member_ids[(i * ROSTER + j) % MEMBERS], "member_rank": "Captain"}
+        for i, job_id in enumerate(job_ids)
+        for j in range(ROSTER)
+    ])
+    db.session.commit()
+    db.session.execute(text("ANALYZE members, job, member_job, ranks"))
+    return {"ranks": sample_ranks, "member_ids": member_ids, "job_ids": job_ids}
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(statements):
+    """
+    EXPLAIN each statement with sequential scans disabled and return every node of every plan.
+    """
+    connection = _db.session.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    nodes = []
+    for statement, parameters in statements:
+        result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        plan = result if isinstance(result, list) else json.loads(result)
+        nodes.extend((statement, node) for node in plan_nodes(plan[0]["Plan"]))
+    return nodes
+
+
+def route_plan(request):
+    """
+    Run a request and return the plan nodes of every statement it sent.
+    """
+    with capture_queries(with_parameters=True) as queries:
+        response = request()
+    assert response.status_code < 400, response.get_json()
+    # the queries that can be explained, an executemany has a list of parameters
+    statements = [
+        (statement, parameters)
+        for statement, parameters in queries
+        if not isinstance(parameters, list) and statement.split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+    ]
+    assert statements
+    return explain(statements)
+
+
+def assert_no_seq_scans(nodes):
+    seq_scans = [
+        (node["Relation Name"], statement)
+        for statement, node in nodes
+        if node["Node Type"] == "Seq Scan" and not (node["Relation Name"] in WHOLE_TABLE_READS and "Filter" not in node)
+    ]
+    assert seq_scans == []
+
+
+def indexes_used(nodes):
+    return {node["Index Name"] for _, node in nodes if "Index Name" in node}
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestIndexedFilters:
+    def test_members_by_rank(self, client, seeded):
+        rank_id = seeded["ranks"][1].id
+        nodes = route_plan(lambda: client.get(f"/v1/members?rank={rank_id}"))
+        assert_no_seq_scans(nodes)
+        assert "ix_members_rank_id" in indexes_used(nodes)
+
+    def test_delete_rank_moves_members(self, client, seeded):
+        """
+        Tests moving a deleted rank's members to the default rank finds them by index.
+        """
+        rank_id = seeded["ranks"][3].id
+        nodes = route_plan(lambda: client.delete(f"/v1/rank/{rank_id}"))
+        assert_no_seq_scans(nodes)
+        assert "ix_members_rank_id" in indexes_used(nodes)
+
+    def test_jobs_by_start_date(self, client, seeded):
+        nodes = route_plan(lambda: client.get("/v1/jobs?start_date=2025-02-01"))
+        assert_no_seq_scans(nodes)
+        assert {"ix_job_start_date_id", "ix_member_job_job_id"} <= indexes_used(nodes)
+
+    def test_jobs_by_created(self, client, seeded):
+        first = client.get("/v1/jobs?order=created&limit=10")
+        cursor = first.headers["X-Next-Cursor"]
+        nodes = route_plan(lambda: client.get(f"/v1/jobs?order=created&limit=10&cursor={cursor}"))
+        assert_no_seq_scans(nodes)
+        assert "ix_job_created_at_id" in indexes_used(nodes)
+
+    @pytest.mark.parametrize("query", ["from=2025-02-01&to=2025-02-28", "ends_before=2025-01-10"])
+    def test_jobs_by_period(self, client, seeded, query):
+        """
+        Tests the period filters are answered by the job_days range index.
+        """
+        nodes = route_plan(lambda: client.get(f"/v1/jobs?{query}"))
+        assert_no_seq_scans(nodes)
+        assert "ix_job_days" in indexes_used(nodes)
+
+    def test_jobs_rendered_in_sql(self, app, client, seeded, monkeypatch):
+        """
+        Tests each job's roster in the JSON built by the db is read through the job_id index.
+        """
+        monkeypatch.setitem(app.config, "JOB_JSON_FROM_SQL", True)
+        nodes = route_plan(lambda: client.get("/v1/jobs?limit=20"))
+        assert_no_seq_scans(nodes)
+        assert "ix_member_job_job_id" in indexes_used(nodes)
+
+    def test_job_roster(self, client, seeded):
+        job_id = seeded["job_ids"][10]
+        nodes = route_plan(lambda: client.get(f"/v1/job/{job_id}"))
+        assert_no_seq_scans(nodes)
+        assert "ix_member_job_job_id" in indexes_used(nodes)
+
+    def test_member_history(self, client, seeded):
+        """
+        Tests refreshing members' earnings reads their jobs through the member_job primary key.
+        """
+        job_id = seeded["job_ids"][0]
+        member_id = seeded["member_ids"][-1]
+        nodes = route_plan(lambda: client.patch(f"/v1/job/{job_id}", json={"add_members": [str(member_id)]}))
+        assert_no_seq_scans(nodes)
+        assert "member_job_pkey" in indexes_used(nodes)
+
+
+class TestNoSequentialScans:
+    @pytest.mark.parametrize("url", [
+        "/v1/members",
+        "/v1/ranks",
+        "/v1/jobs",
+        "/v1/jobs?view=summary",
+        "/v1/jobs?limit=20",
+        "/v1/payouts/export?format=ndjson",
+    ])
+    def test_listings(self, client, seeded, url):
+        assert_no_seq_scans(route_plan(lambda: client.get(url)))
+
+    def test_job_payments(self, client, seeded):
+        job_id = seeded["job_ids"][5]
+        assert_no_seq_scans(route_plan(lambda: client.get(f"/v1/job/{job_id}/payments")))
+        assert_no_seq_scans(route_plan(lambda: client.post("/v1/jobs/payments", json={"job_ids": [str(job_id)]})))
+
+    def test_replace_roster(self, client, seeded):
+        job_id = seeded["job_ids"][5]
+        roster = [str(member_id) for member_id in seeded["member_ids"][:5]]
+        assert_no_seq_scans(route_plan(lambda: client.put(f"/v1/job/{job_id}/members", json={"members": roster})))
+
+    def test_member_earnings(self, client, seeded):
+        member_id = seeded["member_ids"][0]
+        assert_no_seq_scans(route_plan(lambda: client.get(f"/v1/member/{member_id}/earnings")))
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,145 @@
+"""
+Tests for the process-local rank cache (src/api/rank_cache.py)
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import pytest
+
+from sqlalchemy import update
+
+from src.api.models import RankCacheVersionModel, RankModel # type: ignore
+from src.api.rank_cache import bump_rank_version, get_ranks
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def change_share_elsewhere(db, rank, share, bump=True):
+    """
+    Change a rank as another worker would: in the db, without touching this process's cache.
+    """
+    db.session.execute(update(RankModel).where(RankModel.id == rank.id).values(share=share))
+    if bump:
+        db.session.execute(update(RankCacheVersionModel).values(version=RankCacheVersionModel.version + 1))
+    db.session.commit()
+
+
+def request_ranks(app):
+    """
+    get_ranks as a new request would see them.
+    Calls in a test body all share the one request context pytest-flask pushes for the test.
+    """
+    with app.test_request_context():
+        return get_ranks()
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestRankCache:
+    def test_snapshot(self, sample_ranks):
+        """
+        Tests every rank can be looked up by id, name and position.
+        """
+        ranks = get_ranks()
+        captain = sample_ranks[0]
+        assert ranks.by_id[captain.id].name == "Captain"
+        assert ranks.by_name["Runt"].share == 0.5
+        assert ranks.by_position[3].name == "Blagguard"
+
+    def test_snapshot_is_read_only(self, sample_ranks):
+        ranks = get_ranks()
+        with pytest.raises(TypeError):
+            ranks.by_name["Runt"] = ranks.by_name["Captain"]
+        with pytest.raises(AttributeError):
+            ranks.by_name["Runt"].share = 10
+
+    def test_reused_while_version_unchanged(self, app, sample_ranks):
+        """
+        Tests the ranks are only loaded once, after that each request only checks the version.
+        """
+        first = request_ranks(app)
+        with capture_queries() as queries:
+            assert request_ranks(app) is first
+        assert len(queries) == 1
+
+    def test_checked_once_per_request(self, app, sample_ranks):
+        request_ranks(app)
+        with app.test_request_context():
+            with capture_queries() as queries:
+                get_ranks()
+                get_ranks()
+        assert len(queries) == 1
+
+    def test_reloads_when_another_worker_changes_ranks(self, app, db, sample_ranks):
+        """
+        Tests a change committed elsewhere is picked up once the version has moved on, and only then.
+        """
+        runt = sample_ranks[3]
+        assert request_ranks(app).by_id[runt.id].share == 0.5
+
+        change_share_elsewhere(db, runt, 0.6, bump=False)
+        assert request_ranks(app).by_id[runt.id].share == 0.5
+
+        change_share_elsewhere(db, runt, 0.7)
+        assert request_ranks(app).by_id[runt.id].share == 0.7
+
+    def test_bump_rank_version(self, app, db, sample_ranks):
+        before = request_ranks(app).version
+        bump_rank_version()
+        db.session.commit()
+        assert request_ranks(app).version == before + 1
+
+
+class TestRankRoutesInvalidate:
+    def test_post_rank(self, app, client, sample_ranks):
+        request_ranks(app)
+        response = client.post("/v1/rank", json={"name": "Recruit", "position": 5, "share": 0.25})
+        assert response.status_code == 201
+        assert request_ranks(app).by_name["Recruit"].position == 5
+
+    def test_patch_rank(self, app, client, sample_ranks):
+        runt = sample_ranks[3]
+        request_ranks(app)
+        assert client.patch(f"/v1/rank/{runt.id}", json={"share": 0.6}).status_code == 200
+        assert request_ranks(app).by_id[runt.id].share == 0.6
+
+    def test_delete_rank(self, app, client, sample_ranks):
+        runt = sample_ranks[3]
+        request_ranks(app)
+        assert client.delete(f"/v1/rank/{runt.id}").status_code == 200
+        assert runt.id not in request_ranks(app).by_id
+
+    def test_new_rank_can_be_given_to_a_member(self, app, client, sample_ranks):
+        """
+        Tests a member can be given a rank created after the cache was filled.
+        """
+        request_ranks(app)
+        rank_id = client.post("/v1/rank", json={"name": "Recruit", "position": 5, "share": 0.25}).get_json()["id"]
+        response = client.post("/v1/member", json={"name": "Newbie", "rank_id": rank_id})
+        assert response.status_code == 201
+
+    def test_payments_use_new_share(self, app, client, job_with_members, sample_ranks):
+        """
+        Tests payments calculated after a share changes use the new share (Sue is a Blagguard).
+        """
+        job_id = job_with_members["job_id"]
+        request_ranks(app)
+        blagguard = sample_ranks[2]
+        assert client.patch(f"/v1/rank/{blagguard.id}", json={"share": 1.0}).status_code == 200
+
+        response = client.post("/v1/jobs/payments", json={"job_ids": [str(job_id)]})
+        assert response.status_code == 200
+        pays = client.get(f"/v1/job/{job_id}").get_json()["members_on_job"]
+        assert [jm["member_pay"] for jm in pays] == [30, 30, 30]
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
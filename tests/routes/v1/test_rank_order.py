@@ -0,0 +1,127 @@
+"""
+Tests for PUT /v1/ranks/order
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import uuid
+
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from constants import DEFAULT_RANK # type: ignore
+from src.api.models import RankModel # type: ignore
+from src.api.rank_cache import get_ranks
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def put_order(client, ranks):
+    return client.put("/v1/ranks/order", json={"ranks": [str(rank.id) if hasattr(rank, "id") else str(rank) for rank in ranks]})
+
+
+def ladder(response):
+    return [(rank["name"], rank["position"]) for rank in response.get_json()]
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestRankOrder:
+    def test_reorder(self, client, sample_ranks):
+        """
+        Tests the ranks get positions 1, 2, 3... in the order given and the default rank stays last.
+        """
+        captain, lieutenant, blagguard, runt = sample_ranks
+        response = put_order(client, [runt, captain, blagguard, lieutenant])
+        assert response.status_code == 200
+        expected = [("Runt", 1), ("Captain", 2), ("Blagguard", 3), ("Lieutenant", 4), ("default", DEFAULT_RANK["position"])]
+        assert ladder(response) == expected
+        assert ladder(client.get("/v1/ranks")) == expected
+
+    def test_insert_in_the_middle(self, client, sample_ranks):
+        """
+        Tests a new rank can be put in the middle of the ladder with one call, where PATCH would need temporary positions.
+        """
+        captain, lieutenant, blagguard, runt = sample_ranks
+        sergeant = client.post("/v1/rank", json={"name": "Sergeant", "position": 5, "share": 0.9}).get_json()["id"]
+
+        response = put_order(client, [captain, lieutenant, sergeant, blagguard, runt])
+        assert response.status_code == 200
+        assert [name for name, _ in ladder(response)] == ["Captain", "Lieutenant", "Sergeant", "Blagguard", "Runt", "default"]
+
+    def test_member_listing_follows_new_order(self, client, sample_members, sample_ranks):
+        captain, lieutenant, blagguard, runt = sample_ranks
+        assert put_order(client, [blagguard, lieutenant, captain, runt]).status_code == 200
+        names = [member["name"] for member in client.get("/v1/members").get_json()]
+        assert names == ["Alice", "Sue", "Charlie", "Bob", "JoeDefault"]
+
+    def test_cache_invalidated(self, app, client, sample_ranks):
+        captain, lieutenant, blagguard, runt = sample_ranks
+        with app.test_request_context():
+            assert get_ranks().by_position[1].name == "Captain"
+
+        assert put_order(client, [runt, blagguard, lieutenant, captain]).status_code == 200
+        with app.test_request_context():
+            assert get_ranks().by_position[1].name == "Runt"
+
+    def test_one_update(self, client, sample_ranks):
+        """
+        Tests every position is written by the one statement.
+        """
+        with capture_queries() as queries:
+            assert put_order(client, list(reversed(sample_ranks))).status_code == 200
+        assert len([query for query in queries if query.lstrip().upper().startswith("UPDATE RANKS")]) == 1
+
+    def test_position_still_unique(self, db, sample_ranks):
+        """
+        Tests the deferrable constraint is still checked at the end of each statement.
+        """
+        with pytest.raises(IntegrityError):
+            with db.session.begin_nested():
+                db.session.execute(text("UPDATE ranks SET position = 1 WHERE name = 'Runt'"))
+
+
+class TestRankOrderErrors:
+    def test_missing_rank(self, client, sample_ranks):
+        response = put_order(client, sample_ranks[:3])
+        assert response.status_code == 400
+        assert response.get_json()["message"] == f"Every rank must be in the order, missing: {sample_ranks[3].id}"
+
+    def test_unknown_rank(self, client, sample_ranks):
+        missing = uuid.uuid4()
+        response = put_order(client, sample_ranks + [missing])
+        assert response.status_code == 404
+        assert response.get_json()["message"] == f"Rank {missing} not found"
+
+    def test_repeated_rank(self, client, sample_ranks):
+        response = put_order(client, sample_ranks + [sample_ranks[0]])
+        assert response.status_code == 400
+        assert response.get_json()["message"] == f"Rank {sample_ranks[0].id} is listed more than once"
+
+    def test_default_rank(self, client, sample_ranks):
+        response = put_order(client, sample_ranks + [DEFAULT_RANK["id"]])
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "The default rank always comes last, leave it out of the order"
+
+    def test_positions_unchanged_after_error(self, client, db, sample_ranks):
+        assert put_order(client, sample_ranks[1:]).status_code == 400
+        assert [rank.position for rank in db.session.query(RankModel).order_by(RankModel.position)] == [1, 2, 3, 4, 99]
+
+    @pytest.mark.parametrize("payload", [{}, {"ranks": ["not-a-uuid"]}, {"ranks": "abc"}])
+    def test_invalid_payload(self, client, payload):
+        response = client.put("/v1/ranks/order", json=payload)
+        assert response.status_code == 422
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
@@ -0,0 +1,105 @@
+"""
+Tests the rank and member schemas check a payload against the db in one query.
+"""
+
+###################################################################################################
+#  IMPORTS
+###################################################################################################
+
+import uuid
+
+import pytest
+
+from marshmallow import ValidationError # type: ignore
+
+from src.api.schemas import MemberSchema, RankSchema
+from tests.test_helpers import capture_queries
+
+
+###################################################################################################
+#  HELPERS
+###################################################################################################
+
+def validation_errors(client, method, url, payload):
+    response = getattr(client, method)(url, json=payload)
+    assert response.status_code == 422
+    return response.get_json()["errors"]["json"]
+
+
+###################################################################################################
+#  TESTS
+###################################################################################################
+
+class TestValidationQueryCounts:
+    @pytest.mark.parametrize("schema, payload", [
+        (RankSchema(), {"name": "Recruit", "position": 9, "share": 0.25}),
+        (RankSchema(partial=True), {"position": 9}),
+        (MemberSchema(partial=True), {"name": "Newbie", "active": False}),
+    ])
+    def test_one_query(self, schema, payload):
+        with capture_queries() as queries:
+            schema.load(payload)
+        assert len(queries) == 1
+
+    def test_member_one_query(self, sample_ranks):
+        """
+        Tests the name and the rank are checked in the same query.
+        """
+        with capture_queries() as queries:
+            MemberSchema().load({"name": "Newbie", "rank_id": str(sample_ranks[0].id)})
+        assert len(queries) == 1
+
+    def test_no_query_without_db_fields(self):
+        with capture_queries() as queries:
+            RankSchema(partial=True).load({"share": 0.5})
+        assert queries == []
+
+    def test_no_query_when_fields_invalid(self):
+        """
+        Tests fields that fail their own validators aren't looked up.
+        """
+        with capture_queries() as queries:
+            with pytest.raises(ValidationError):
+                RankSchema().load({"name": " ", "position": 0, "share": 0.5})
+        assert queries == []
+
+
+class TestValidationErrors:
+    def test_rank_name_and_position_taken(self, client, sample_ranks):
+        """
+        Tests both conflicts are reported together, as they were when each field had its own query.
+        """
+        errors = validation_errors(client, "post", "/v1/rank", {"name": "Captain", "position": 2, "share": 1.0})
+        assert errors == {
+            "name": ["There is already a rank with name Captain."],
+            "position": ["There is already a rank at position 2."],
+        }
+
+    def test_rank_empty_name_and_position_taken(self, client, sample_ranks):
+        errors = validation_errors(client, "post", "/v1/rank", {"name": "  ", "position": 2, "share": 1.0})
+        assert errors == {
+            "name": ["Name must not be empty."],
+            "position": ["There is already a rank at position 2."],
+        }
+
+    def test_patch_rank_position_taken(self, client, sample_ranks):
+        errors = validation_errors(client, "patch", f"/v1/rank/{sample_ranks[0].id}", {"position": 3})
+        assert errors == {"position": ["There is already a rank at position 3."]}
+
+    def test_member_name_taken_and_rank_missing(self, client, sample_members):
+        rank_id = uuid.uuid4()
+        errors = validation_errors(client, "post", "/v1/member", {"name": "Bob", "rank_id": str(rank_id)})
+        assert errors == {
+            "name": ["There is already a member with name Bob."],
+            "rank_id": [f"Rank {rank_id} does not exist"],
+        }
+
+    def test_patch_member_rank_missing(self, client, sample_members):
+        rank_id = uuid.uuid4()
+        errors = validation_errors(client, "patch", f"/v1/member/{sample_members[0].id}", {"rank_id": str(rank_id)})
+        assert errors == {"rank_id": [f"Rank {rank_id} does not exist"]}
+
+
+###################################################################################################
+#  End of file.
+###################################################################################################
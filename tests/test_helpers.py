@@ -10,7 +10,12 @@ This contains helper functions that can be used across the test files.
 ###################################################################################################
 
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
 from src import db
+from src.api.rank_cache import get_ranks
 
 
 ###################################################################################################
@@ -36,6 +41,69 @@ def assert_job_update(client, expected_response, job_id, updated_job, expected_s
     assert update_response.get_json() == expected_response
 
 
+def job_names(response):
+    """
+    Return the names of the jobs in a successful GET /v1/jobs response, in the order they were listed.
+    """
+    assert response.status_code == 200
+    return [job["job_name"] for job in response.get_json()]
+
+
+def walk_pages(client, url):
+    """
+    Follow X-Next-Cursor from the first page of url (which has a limit) to the last, returning the jobs on each page.
+    """
+    pages = []
+    page_url = url
+    while page_url:
+        response = client.get(page_url)
+        assert response.status_code == 200
+        pages.append(response.get_json())
+        cursor = response.headers.get("X-Next-Cursor")
+        page_url = f"{url}&cursor={cursor}" if cursor else None
+    return pages
+
+
+@contextmanager
+def capture_queries(with_parameters=False):
+    """
+    Record the SQL statements sent to the db inside the with block.
+
+    Yields a list that is filled with each statement as it is executed, e.g.
+        with capture_queries() as queries:
+            client.get("/v1/jobs")
+        assert len(queries) == 2
+    With with_parameters each entry is (statement, parameters) instead, the parameters are a list
+    of them for an executemany.
+    """
+    queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield queries
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def count_queries(request):
+    """
+    Return the number of SQL statements a request sends, asserting it succeeds.
+
+    The session is emptied first so nothing is served from the identity map, and the rank cache
+    is filled as it would be after a worker's first request, so only its version check is counted.
+        assert count_queries(lambda: client.get("/v1/jobs")) == 2
+    """
+    db.session.expunge_all()
+    get_ranks()
+    with capture_queries() as queries:
+        response = request()
+    assert response.status_code == 200
+    return len(queries)
+
+
 ###################################################################################################
 #  END OF FILE
 ###################################################################################################